@@ -7,5 +7,6 @@ from .sentiment import CryptoSentimentAnalyzer
 from .filters import TweetFilter
 from .influence import InfluenceCalculator
 from .topics import TopicAnalyzer
+from .pool import AnalyzerPool
 
-__all__ = ['CryptoSentimentAnalyzer', 'TweetFilter', 'InfluenceCalculator', 'TopicAnalyzer']
\ No newline at end of file
+__all__ = ['CryptoSentimentAnalyzer', 'TweetFilter', 'InfluenceCalculator', 'TopicAnalyzer', 'AnalyzerPool']
\ No newline at end of file
@@ -0,0 +1,158 @@
+# analysis/clustering.py
+"""
+Streaming topic clustering: hashed TF-IDF vectors with online k-means
+"""
+
+import hashlib
+import math
+import re
+
+TOKEN_PATTERN = re.compile(r'https?://\S+|[a-z0-9$#_]{2,}|[一-鿿]+')
+
+STOPWORDS = {
+    'the', 'and', 'for', 'you', 'this', 'that', 'with', 'are', 'was', 'but', 'not', 'have', 'has',
+    'just', 'from', 'will', 'all', 'its', 'it', 'is', 'to', 'of', 'in', 'on', 'at', 'be', 'my',
+    'we', 'me', 'so', 'an', 'or', 'if', 'do', 'no', 'up', 'rt', 'amp', 'https', 'http'
+}
+
+
+def tokenize(text):
+    """Lowercased word tokens plus CJK bigrams (Chinese has no spaces to split on)"""
+    tokens = []
+    for token in TOKEN_PATTERN.findall((text or '').lower()):
+        if token.startswith('http'):
+            continue
+        if '一' <= token[0] <= '鿿':
+            if len(token) == 1:
+                tokens.append(token)
+            else:
+                tokens.extend(token[i:i + 2] for i in range(len(token) - 1))
+        elif token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+class StreamingTopicClusterer:
+    """Assigns tweets to topic clusters one at a time with bounded memory
+
+    Tokens are hashed into a fixed number of features, weighted by an IDF
+    estimated online, and each vector joins the closest centroid (cosine)
+    or opens a new cluster when nothing is similar enough. Centroids are
+    running means kept as sparse sums, so an update only touches the
+    tweet's own features.
+    """
+
+    def __init__(self, n_features=2 ** 14, max_clusters=8, similarity_threshold=0.25,
+                 exemplar_pool_size=20):
+        self.n_features = n_features
+        self.max_clusters = max_clusters
+        self.similarity_threshold = similarity_threshold
+        self.exemplar_pool_size = exemplar_pool_size
+
+        self.document_count = 0
+        self.document_frequency = [0] * n_features
+        self.clusters = []
+        self.assignments = []
+
+    def _hash(self, token):
+        return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=4).digest(), 'little') % self.n_features
+
+    def vectorize(self, text, update_idf=True):
+        """L2-normalized hashed TF-IDF vector as {feature: weight}"""
+        term_counts = {}
+        for token in tokenize(text):
+            feature = self._hash(token)
+            term_counts[feature] = term_counts.get(feature, 0) + 1
+
+        if update_idf:
+            self.document_count += 1
+            for feature in term_counts:
+                self.document_frequency[feature] += 1
+
+        vector = {}
+        for feature, count in term_counts.items():
+            idf = math.log((1 + self.document_count) / (1 + self.document_frequency[feature])) + 1
+            vector[feature] = (1 + math.log(count)) * idf
+
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        if norm:
+            vector = {feature: weight / norm for feature, weight in vector.items()}
+        return vector
+
+    @staticmethod
+    def _similarity(vector, cluster):
+        """Cosine similarity between a unit vector and a cluster centroid"""
+        if not cluster['sum_norm_sq']:
+            return 0.0
+        centroid_sum = cluster['sum']
+        dot = sum(weight * centroid_sum.get(feature, 0.0) for feature, weight in vector.items())
+        return dot / math.sqrt(cluster['sum_norm_sq'])
+
+    def add(self, text, index=None):
+        """Assign one tweet to a cluster, returns the cluster id (-1 for empty text)"""
+        index = len(self.assignments) if index is None else index
+        vector = self.vectorize(text)
+        if not vector:
+            self.assignments.append(-1)
+            return -1
+
+        best_id, best_similarity = -1, -1.0
+        for cluster_id, cluster in enumerate(self.clusters):
+            similarity = self._similarity(vector, cluster)
+            if similarity > best_similarity:
+                best_id, best_similarity = cluster_id, similarity
+
+        if best_id < 0 or (best_similarity < self.similarity_threshold and len(self.clusters) < self.max_clusters):
+            self.clusters.append({'sum': {}, 'sum_norm_sq': 0.0, 'size': 0, 'members': [], 'pool': []})
+            best_id = len(self.clusters) - 1
+
+        cluster = self.clusters[best_id]
+        centroid_sum = cluster['sum']
+        for feature, weight in vector.items():
+            old = centroid_sum.get(feature, 0.0)
+            centroid_sum[feature] = old + weight
+            cluster['sum_norm_sq'] += (old + weight) ** 2 - old ** 2
+        cluster['size'] += 1
+        cluster['members'].append(index)
+
+        # Bounded exemplar candidates: keep the most recent members' vectors
+        cluster['pool'].append((index, text, vector))
+        if len(cluster['pool']) > self.exemplar_pool_size:
+            cluster['pool'].pop(0)
+
+        self.assignments.append(best_id)
+        return best_id
+
+    def add_many(self, texts):
+        for text in texts:
+            self.add(text)
+        return self.assignments
+
+    def get_exemplars(self, cluster_id, count=3):
+        """Pool members closest to the final centroid as [(index, text)]"""
+        cluster = self.clusters[cluster_id]
+        ranked = sorted(cluster['pool'], key=lambda item: self._similarity(item[2], cluster), reverse=True)
+
+        exemplars, seen_texts = [], set()
+        for index, text, _ in ranked:
+            if text in seen_texts:
+                continue
+            seen_texts.add(text)
+            exemplars.append((index, text))
+            if len(exemplars) >= count:
+                break
+        return exemplars
+
+    def get_clusters(self, min_size=1, exemplars_per_cluster=3):
+        """Clusters sorted by size with members and exemplars"""
+        clusters = []
+        for cluster_id, cluster in enumerate(self.clusters):
+            if cluster['size'] < min_size:
+                continue
+            clusters.append({
+                'cluster_id': cluster_id,
+                'size': cluster['size'],
+                'members': list(cluster['members']),
+                'exemplars': self.get_exemplars(cluster_id, exemplars_per_cluster)
+            })
+        return sorted(clusters, key=lambda cluster: cluster['size'], reverse=True)
@@ -4,46 +4,129 @@ Enhanced tweet filtering with silent team filtering mode
 """
 
 import re
+import time
 try:
     from openai import OpenAI
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
 
-from config import NEWS_ACCOUNTS, SPAM_PATTERNS, TEAM_FILTER_CONFIG
+from config import (NEWS_ACCOUNTS, SPAM_PATTERNS, TEAM_FILTER_CONFIG, AUTHOR_REPUTATION_CONFIG,
+                    ANALYSIS_CONFIG, FILTER_STAGE_CONFIG, ACCOUNT_REGISTRY_CONFIG)
 from data.team_filter import TeamFilter
+from data.account_registry import AccountRegistry
+from data.author_reputation import AuthorReputationStore
+from utils.concurrency import service_slot
+from .rules import SpamRuleEngine
+
+# Deterministic filter stages, in their default order (the AI filter always runs last)
+RULE_STAGES = ('news_accounts', 'team_accounts', 'spam_basic')
+
+BATCH_VERDICT_PATTERN = re.compile(
+    r'^\[?(\d+)\]?[.):]?\s*SPAM:\s*\[?(YES|NO)\]?\s*\|\s*INFORMATIVE:\s*\[?(YES|NO)\]?\s*\|\s*REASON:\s*(.*)$',
+    re.IGNORECASE
+)
 
 
 class TweetFilter:
-    def __init__(self, openai_api_key=None, silent_mode=False):
+    def __init__(self, openai_api_key=None, silent_mode=False, team_filter=None, reputation_store=None):
         self.news_accounts = NEWS_ACCOUNTS
+        self.silent_mode = silent_mode
+        self.account_registry = self._load_account_registry()
+        self.blocked_category_counts = {}
         self.spam_patterns = SPAM_PATTERNS
+        self.spam_rules = SpamRuleEngine(SPAM_PATTERNS)
         self.openai_client = OpenAI(api_key=openai_api_key) if openai_api_key and OPENAI_AVAILABLE else None
-        self.silent_mode = silent_mode
         
-        # 🆕 Initialize team filter with silent mode
-        self.team_filter = None
-        if TEAM_FILTER_CONFIG['enable_team_filtering']:
+        # 🆕 Initialize team filter with silent mode (a shared instance can be passed in for multi-token runs)
+        self.team_filter = team_filter
+        if self.team_filter is None and TEAM_FILTER_CONFIG['enable_team_filtering']:
             self.team_filter = TeamFilter(
                 TEAM_FILTER_CONFIG['excel_file_path'], 
-                silent_mode=silent_mode
+                silent_mode=silent_mode,
+                snapshot_path=TEAM_FILTER_CONFIG['snapshot_path'] if TEAM_FILTER_CONFIG['enable_snapshot'] else None
+            )
+            if TEAM_FILTER_CONFIG['auto_reload']:
+                self.team_filter.start_auto_reload(TEAM_FILTER_CONFIG['reload_interval_seconds'])
+        
+        # Author reputation lets conclusive authors skip the AI filter call (shareable like the team filter)
+        self.reputation_store = reputation_store
+        if self.reputation_store is None and AUTHOR_REPUTATION_CONFIG['enable_reputation']:
+            self.reputation_store = AuthorReputationStore(
+                AUTHOR_REPUTATION_CONFIG['store_path'],
+                min_verdicts=AUTHOR_REPUTATION_CONFIG['min_verdicts'],
+                conclusive_ratio=AUTHOR_REPUTATION_CONFIG['conclusive_ratio'],
+                half_life_days=AUTHOR_REPUTATION_CONFIG['half_life_days'],
+                ttl_days=AUTHOR_REPUTATION_CONFIG['ttl_days'],
+                influence_ttl_hours=AUTHOR_REPUTATION_CONFIG['influence_ttl_hours']
             )
+        # This run's lookups; the store's own stats are process totals across pooled analyzers
+        self.reputation_run_stats = {'verdict_hits': 0, 'verdict_misses': 0}
         
         self.total_tokens_used = 0
         self.filtered_counts = {
             'news_accounts': 0,
+            'blocked_accounts': 0,
             'spam_basic': 0,
             'team_accounts': 0,
+            'cross_team_accounts': 0,
             'spam_ai': 0,
             'informative_ai': 0,
             'total_filtered': 0
         }
+        
+        # Per-stage instrumentation; lifetime totals drive adaptive ordering
+        self.adaptive_stage_order = FILTER_STAGE_CONFIG['adaptive_stage_order']
+        self.stage_stats = {stage: {'calls': 0, 'rejects': 0, 'time_seconds': 0.0}
+                            for stage in RULE_STAGES + ('ai_filter',)}
+        self._stage_totals = {stage: dict(stats) for stage, stats in self.stage_stats.items()}
+        
+        # Authors kept for analysis who are team members of other listed projects: username -> tickers
+        self.exclude_cross_project_team = TEAM_FILTER_CONFIG['exclude_cross_project_team']
+        self.cross_team_flags = {}
+    
+    def reset_run_state(self):
+        """Clear per-run counters so a long-lived filter can be reused for the next analysis"""
+        self.total_tokens_used = 0
+        self.filtered_counts = {key: 0 for key in self.filtered_counts}
+        self.blocked_category_counts = {}
+        self.cross_team_flags = {}
+        self.reputation_run_stats = {key: 0 for key in self.reputation_run_stats}
+        # Lifetime totals (_stage_totals) are kept, they drive adaptive stage ordering
+        self.stage_stats = {stage: {'calls': 0, 'rejects': 0, 'time_seconds': 0.0} for stage in self.stage_stats}
+    
+    def _load_account_registry(self):
+        """Build the news/blocked account registry from NEWS_ACCOUNTS and configured lists"""
+        registry = AccountRegistry(ACCOUNT_REGISTRY_CONFIG['false_positive_rate'])
+        if ACCOUNT_REGISTRY_CONFIG['include_builtin_news_accounts']:
+            registry.add_accounts(self.news_accounts, 'news')
+        
+        for source in ACCOUNT_REGISTRY_CONFIG['sources']:
+            try:
+                registry.load_file(source['path'], source.get('category'))
+            except (OSError, ValueError, ImportError) as e:
+                if not self.silent_mode:
+                    print(f"⚠️ 无法加载账户列表 {source['path']}: {e}")
+        
+        return registry.build()
+    
+    def get_account_category(self, username):
+        """Registry category ('news', 'bot', ...) for username, or None"""
+        return self.account_registry.get_category(username)
     
     def is_news_account(self, username):
         """Check if username belongs to news/informative accounts"""
-        if not username or username == 'N/A':
-            return False
-        return username.lower().replace('@', '') in self.news_accounts
+        return self.account_registry.contains(username, 'news')
+    
+    def _account_category_reason(self, username, category):
+        """Exclusion reason for a registry hit and update filtered_counts"""
+        if category == 'news':
+            self.filtered_counts['news_accounts'] += 1
+            return f"News account: @{username}"
+        
+        self.filtered_counts['blocked_accounts'] += 1
+        self.blocked_category_counts[category] = self.blocked_category_counts.get(category, 0) + 1
+        return f"Blocked account: @{username} [{category}]"
     
     def is_team_account(self, username, token_symbol):
         """Check if username belongs to the project team"""
@@ -51,42 +134,30 @@ class TweetFilter:
             return False
         return self.team_filter.is_team_account(username, token_symbol)
     
-    def detect_basic_spam(self, text, user_data):
-        """Basic spam detection using patterns and keywords"""
-        if not text or len(text.strip()) < 5:
-            return True, "Too short"
-        
-        text_lower = text.lower()
-        
-        # Check giveaway keywords
-        giveaway_matches = sum(1 for keyword in self.spam_patterns['giveaway_keywords'] 
-                              if keyword in text_lower)
-        if giveaway_matches >= 2:
-            return True, "Giveaway spam"
+    def _team_stage_reason(self, username, tickers, token_symbol):
+        """Exclusion reason for a team account hit (None if the author is only flagged)"""
+        if not tickers:
+            return None
         
-        # Check meaningless patterns
-        for pattern in self.spam_patterns['meaningless_patterns']:
-            if re.match(pattern, text.strip(), re.IGNORECASE):
-                return True, "Meaningless content"
-        
-        # Check token spam (too many token symbols)
-        if re.search(self.spam_patterns['token_spam_pattern'], text):
-            return True, "Token list spam"
-        
-        # Check excessive emojis
-        if re.search(self.spam_patterns['excessive_emojis'], text):
-            return True, "Excessive emojis"
-        
-        # Check repeated characters
-        if re.search(self.spam_patterns['repeated_chars'], text):
-            return True, "Repeated characters"
+        if token_symbol.upper().strip() in tickers:
+            self.filtered_counts['team_accounts'] += 1
+            return f"Team account: @{username}"
         
-        # Check very low effort tweets
-        words = text.split()
-        if len(words) <= 2 and not any(word.startswith('$') for word in words):
-            return True, "Too few words"
+        if self.exclude_cross_project_team:
+            self.filtered_counts['team_accounts'] += 1
+            self.filtered_counts['cross_team_accounts'] += 1
+            return f"Team account: @{username} ({', '.join(sorted(tickers))})"
         
-        return False, "Clean"
+        self.cross_team_flags[username] = sorted(tickers)
+        return None
+    
+    def detect_basic_spam(self, text, user_data):
+        """Basic spam detection using patterns and keywords"""
+        return self.spam_rules.check(text)
+    
+    def detect_basic_spam_batch(self, texts):
+        """Basic spam detection over a list of texts, returns [(is_spam, reason), ...]"""
+        return self.spam_rules.check_batch(texts)
     
     def ai_content_filter(self, text, username):
         """Use AI to detect spam and informative content with shorter reasons"""
@@ -129,12 +200,13 @@ class TweetFilter:
             REASON: [Very brief explanation, max 20 chars]
             """
             
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=50,
-                temperature=0.1
-            )
+            with service_slot('openai'):
+                response = self.openai_client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=50,
+                    temperature=0.1
+                )
             
             content = response.choices[0].message.content.strip()
             
@@ -162,7 +234,8 @@ class TweetFilter:
             return {
                 'is_spam': is_spam,
                 'is_informative': is_informative,
-                'reason': reason
+                'reason': reason,
+                'analyzed': True
             }
             
         except Exception as e:
@@ -170,29 +243,252 @@ class TweetFilter:
                 print(f"AI content filter error: {e}")
             return {'is_spam': False, 'is_informative': False, 'reason': f'AI error'}
     
+    def ai_content_filter_batch(self, items):
+        """Classify several (text, username) pairs in one request
+        
+        Items missing from a partial or misaligned reply fall back to
+        ai_content_filter one by one.
+        """
+        if not items:
+            return []
+        if not self.openai_client:
+            return [{'is_spam': False, 'is_informative': False, 'reason': 'OpenAI not available'} for _ in items]
+        if len(items) == 1:
+            return [self.ai_content_filter(*items[0])]
+        
+        parsed = {}
+        try:
+            tweets_text = "\n".join(
+                f'{i + 1}. @{username}: "{" ".join(str(text).split())}"' for i, (text, username) in enumerate(items)
+            )
+            prompt = f"""
+            Analyze each of these {len(items)} tweets to determine if it should be EXCLUDED from sentiment analysis.
+            
+            Tweets:
+            {tweets_text}
+            
+            EXCLUDE if the tweet is:
+            
+            1. SPAM/GIVEAWAY content:
+            - Asks for retweets, likes, follows for rewards
+            - Asks users to "drop wallet", "tag friends", etc.
+            - Promotes giveaways, airdrops, presales
+            - Very low quality with minimal meaning
+            - Just lists many token symbols without context
+            
+            2. PURELY INFORMATIVE content (no sentiment):
+            - News reports without opinion/emotion
+            - Data/price updates without sentiment
+            - Technical analysis without clear bullish/bearish stance
+            - Factual announcements from official accounts
+            - Pure market data or statistics
+            
+            INCLUDE if the tweet has:
+            - Personal opinions, emotions, or reactions
+            - Bullish/bearish sentiment about projects
+            - Community discussion with sentiment
+            - Investment advice or speculation
+            - Excitement, fear, or other emotional responses
+            
+            Respond with EXACTLY one line per tweet, in order, in this format:
+            [number]. SPAM: [YES/NO] | INFORMATIVE: [YES/NO] | REASON: [Very brief explanation, max 20 chars]
+            """
+            
+            with service_slot('openai'):
+                response = self.openai_client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=30 * len(items) + 20,
+                    temperature=0.1
+                )
+            
+            content = response.choices[0].message.content.strip()
+            
+            for line in content.split('\n'):
+                match = BATCH_VERDICT_PATTERN.match(line.strip())
+                if not match:
+                    continue
+                index = int(match.group(1)) - 1
+                if 0 <= index < len(items) and index not in parsed:
+                    reason = match.group(4).strip()
+                    # Ensure reason is short
+                    if len(reason) > 20:
+                        reason = reason[:17] + "..."
+                    parsed[index] = {
+                        'is_spam': match.group(2).upper() == 'YES',
+                        'is_informative': match.group(3).upper() == 'YES',
+                        'reason': reason or "Unknown",
+                        'analyzed': True
+                    }
+            
+            # Track token usage
+            if hasattr(response, 'usage'):
+                self.total_tokens_used += response.usage.total_tokens
+                
+        except Exception as e:
+            if not self.silent_mode:
+                print(f"AI batch content filter error: {e}")
+        
+        return [parsed[i] if i in parsed else self.ai_content_filter(*items[i]) for i in range(len(items))]
+    
     def should_exclude_tweet(self, parsed_tweet, token_symbol):
         """Enhanced comprehensive tweet filtering logic with team filtering"""
         text = parsed_tweet['text']
         username = parsed_tweet['user']['username']
         
-        # 1. Filter news/informative accounts
-        if self.is_news_account(username):
-            self.filtered_counts['news_accounts'] += 1
-            return True, f"News account: @{username}"
+        # 1-3. News accounts, team accounts and basic spam (order may be adaptive)
+        for stage in self.get_stage_order():
+            start = time.perf_counter()
+            should_exclude, reason = self._run_rule_stage(stage, parsed_tweet, token_symbol)
+            self._record_stage(stage, 1, int(should_exclude), time.perf_counter() - start)
+            if should_exclude:
+                return True, reason
         
-        # 2. Filter project team accounts
-        if self.is_team_account(username, token_symbol):
-            self.filtered_counts['team_accounts'] += 1
-            return True, f"Team account: @{username}"
+        # 4. AI-powered content filtering
+        start = time.perf_counter()
+        should_exclude, reason = self.apply_ai_filter(text, username)
+        self._record_stage('ai_filter', 1, int(should_exclude), time.perf_counter() - start)
+        return should_exclude, reason
+    
+    def _run_rule_stage(self, stage, parsed_tweet, token_symbol):
+        """Run one deterministic filter stage for a single tweet"""
+        username = parsed_tweet['user']['username']
         
-        # 3. Basic spam detection
-        is_basic_spam, basic_reason = self.detect_basic_spam(text, parsed_tweet['user'])
-        if is_basic_spam:
-            self.filtered_counts['spam_basic'] += 1
-            return True, f"Basic spam: {basic_reason}"
+        if stage == 'news_accounts':
+            category = self.get_account_category(username)
+            if category:
+                return True, self._account_category_reason(username, category)
+        elif stage == 'team_accounts':
+            tickers = self.team_filter.get_tickers_for_username(username) if self.team_filter else None
+            reason = self._team_stage_reason(username, tickers, token_symbol)
+            if reason:
+                return True, reason
+        elif stage == 'spam_basic':
+            is_basic_spam, basic_reason = self.detect_basic_spam(parsed_tweet['text'], parsed_tweet['user'])
+            if is_basic_spam:
+                self.filtered_counts['spam_basic'] += 1
+                return True, f"Basic spam: {basic_reason}"
         
-        # 4. AI-powered content filtering
-        ai_filter = self.ai_content_filter(text, username)
+        return False, None
+    
+    def get_stage_order(self):
+        """Order of the deterministic stages, cheapest cost-per-reject first in adaptive mode"""
+        if not self.adaptive_stage_order:
+            return list(RULE_STAGES)
+        
+        min_calls = FILTER_STAGE_CONFIG['min_calls_before_reorder']
+        if any(self._stage_totals[stage]['calls'] < min_calls for stage in RULE_STAGES):
+            return list(RULE_STAGES)
+        
+        # Stable sort keeps the default order for ties and for stages that never reject
+        return sorted(RULE_STAGES, key=lambda stage: self._cost_per_reject(self._stage_totals[stage]))
+    
+    @staticmethod
+    def _cost_per_reject(stats):
+        if not stats['rejects']:
+            return float('inf')
+        return stats['time_seconds'] / stats['rejects']
+    
+    def _snapshot_counters(self):
+        """Copy of the filter counters and stage statistics, for rolling back a failed batch pass"""
+        return {
+            'filtered_counts': dict(self.filtered_counts),
+            'blocked_category_counts': dict(self.blocked_category_counts),
+            'cross_team_flags': dict(self.cross_team_flags),
+            'stage_stats': {stage: dict(stats) for stage, stats in self.stage_stats.items()},
+            '_stage_totals': {stage: dict(stats) for stage, stats in self._stage_totals.items()}
+        }
+    
+    def _restore_counters(self, snapshot):
+        for name, value in snapshot.items():
+            setattr(self, name, value)
+    
+    def _record_stage(self, stage, calls, rejects, elapsed):
+        for stats in (self.stage_stats[stage], self._stage_totals[stage]):
+            stats['calls'] += calls
+            stats['rejects'] += rejects
+            stats['time_seconds'] += elapsed
+    
+    def get_stage_stats(self):
+        """Per-stage calls, rejects and timing for the filter runs so far"""
+        stages = {}
+        for stage, stats in self.stage_stats.items():
+            cost_per_reject = self._cost_per_reject(stats)
+            stages[stage] = {
+                'calls': stats['calls'],
+                'rejects': stats['rejects'],
+                'time_seconds': round(stats['time_seconds'], 6),
+                'reject_rate': round(stats['rejects'] / stats['calls'], 4) if stats['calls'] else 0,
+                'avg_time_ms': round(stats['time_seconds'] / stats['calls'] * 1000, 4) if stats['calls'] else 0,
+                'cost_per_reject_ms': round(cost_per_reject * 1000, 4) if stats['rejects'] else None
+            }
+        
+        return {
+            'adaptive': self.adaptive_stage_order,
+            'order': self.get_stage_order() + ['ai_filter'],
+            'stages': stages
+        }
+    
+    def apply_ai_filter(self, text, username):
+        """Run the AI content filter stage and update filtered_counts"""
+        cached_result = self._reputation_result(username)
+        if cached_result:
+            return cached_result
+        
+        return self._apply_ai_verdict(username, self.ai_content_filter(text, username))
+    
+    def apply_ai_filter_batch(self, items):
+        """Batched AI content filter stage over [(text, username), ...]
+        
+        Returns [(should_exclude, reason), ...] in input order. Verdicts for
+        every chunk are collected before any count is recorded, and token
+        usage is rolled back if a chunk raises, so the caller's per-tweet
+        fallback does not double-count.
+        """
+        tokens_before = self.total_tokens_used
+        try:
+            verdicts = [self._reputation_verdict(username) for _, username in items]
+            pending = [i for i, verdict in enumerate(verdicts) if verdict is None]
+            
+            ai_filters = {}
+            batch_size = max(1, ANALYSIS_CONFIG.get('ai_filter_batch_size', 10))
+            for start in range(0, len(pending), batch_size):
+                chunk = pending[start:start + batch_size]
+                ai_filters.update(zip(chunk, self.ai_content_filter_batch([items[i] for i in chunk])))
+        except Exception:
+            self.total_tokens_used = tokens_before
+            raise
+        
+        return [self._apply_reputation_verdict(verdicts[i]) if verdicts[i] is not None
+                else self._apply_ai_verdict(items[i][1], ai_filters[i]) for i in range(len(items))]
+    
+    def _reputation_verdict(self, username):
+        """Conclusive author history verdict ('spam', 'informative', 'clean') or None"""
+        if not self.reputation_store:
+            return None
+        verdict = self.reputation_store.get_verdict(username)
+        self.reputation_run_stats['verdict_hits' if verdict else 'verdict_misses'] += 1
+        return verdict
+    
+    def _apply_reputation_verdict(self, verdict):
+        """Record an author history verdict and convert it to a stage result"""
+        if verdict == 'spam':
+            self.filtered_counts['spam_ai'] += 1
+            return True, "AI spam: Author history"
+        if verdict == 'informative':
+            self.filtered_counts['informative_ai'] += 1
+            return True, "AI informative: Author history"
+        return False, "Include for analysis"
+    
+    def _reputation_result(self, username):
+        """Stage result from a conclusive author history, or None if the AI filter is needed"""
+        verdict = self._reputation_verdict(username)
+        return self._apply_reputation_verdict(verdict) if verdict is not None else None
+    
+    def _apply_ai_verdict(self, username, ai_filter):
+        """Record an AI filter verdict and convert it to a stage result"""
+        if self.reputation_store and ai_filter.get('analyzed'):
+            self.reputation_store.record_verdict(username, ai_filter['is_spam'], ai_filter['is_informative'])
         
         if ai_filter['is_spam']:
             self.filtered_counts['spam_ai'] += 1
@@ -204,6 +500,76 @@ class TweetFilter:
         
         return False, "Include for analysis"
     
+    def rule_filter_batch(self, usernames, texts, token_symbol):
+        """Vectorized news/team/basic-spam checks over whole columns
+        
+        Returns one entry per row: the exclusion reason (same strings as
+        should_exclude_tweet) or None if the row passes the rule stage.
+        """
+        # pandas/numpy are only needed for batch filtering, keep them off the import path
+        import numpy as np
+        import pandas as pd
+        
+        usernames = list(usernames)
+        texts = list(texts)
+        reasons = [None] * len(usernames)
+        if not usernames:
+            return reasons
+        
+        users = pd.Series(usernames, dtype=object).fillna('').astype(str)
+        valid_user = ((users != '') & (users != 'N/A')).to_numpy()
+        
+        excluded = np.zeros(len(usernames), dtype=bool)
+        for stage in self.get_stage_order():
+            start = time.perf_counter()
+            # Later stages only see rows earlier stages kept, so the adaptive order saves work here too
+            pending = np.flatnonzero(~excluded)
+            stage_reasons = {}
+            
+            if stage == 'news_accounts':
+                # One registry lookup per distinct username
+                pending_users = users.iloc[pending[valid_user[pending]]]
+                category_by_user = {user: self.account_registry.get_category(user) for user in pending_users.unique()}
+                categories = pending_users.map(category_by_user)
+                for i, category in zip(pending_users.index, categories):
+                    if pd.notna(category):
+                        stage_reasons[i] = self._account_category_reason(usernames[i], category)
+            elif stage == 'team_accounts':
+                # Reverse index lookup covers current-token and cross-project team accounts in one pass
+                if self.team_filter:
+                    team_rows = pending[valid_user[pending]]
+                    tickers = self.team_filter.get_tickers_for_usernames([usernames[i] for i in team_rows])
+                    for i, row_tickers in zip(team_rows, tickers):
+                        reason = self._team_stage_reason(usernames[i], row_tickers, token_symbol)
+                        if reason:
+                            stage_reasons[i] = reason
+            else:
+                spam_reasons = self.spam_rules.check_series([texts[i] for i in pending])
+                for i, spam_reason in zip(pending, spam_reasons):
+                    if spam_reason != "Clean":
+                        stage_reasons[i] = f"Basic spam: {spam_reason}"
+                self.filtered_counts['spam_basic'] += len(stage_reasons)
+            
+            for i, reason in stage_reasons.items():
+                reasons[i] = reason
+                excluded[i] = True
+            # Same calls/rejects as the per-tweet path: every pending row reaches the stage
+            self._record_stage(stage, len(pending), len(stage_reasons), time.perf_counter() - start)
+        
+        return reasons
+    
+    def _build_exclusion_entry(self, index, parsed_tweet, reason):
+        """Build the exclusion_reasons entry for a filtered tweet"""
+        return {
+            'tweet_num': index + 1,
+            'user': parsed_tweet['user']['username'],
+            'reason': reason,
+            'detailed_reason': self.get_detailed_filter_reason(reason),
+            'text_preview': parsed_tweet['text'][:100] + '...' if len(parsed_tweet['text']) > 100 else parsed_tweet['text'],
+            'full_text': parsed_tweet['text'],
+            'followers': parsed_tweet['user']['followers_count']
+        }
+    
     def get_detailed_filter_reason(self, reason):
         """Extract and format detailed filtering reason"""
         if "AI spam:" in reason:
@@ -214,6 +580,8 @@ class TweetFilter:
             return reason.split("Basic spam:", 1)[1].strip()
         elif "News account:" in reason:
             return reason.split("News account:", 1)[1].strip()
+        elif "Blocked account:" in reason:
+            return reason.split("Blocked account:", 1)[1].strip()
         elif "Team account:" in reason:
             return reason.split("Team account:", 1)[1].strip()
         else:
@@ -240,15 +608,7 @@ class TweetFilter:
                 
                 if should_exclude:
                     # Store more detailed information for the table
-                    exclusion_reasons.append({
-                        'tweet_num': i + 1,
-                        'user': parsed_tweet['user']['username'],
-                        'reason': reason,
-                        'detailed_reason': self.get_detailed_filter_reason(reason),
-                        'text_preview': parsed_tweet['text'][:100] + '...' if len(parsed_tweet['text']) > 100 else parsed_tweet['text'],
-                        'full_text': parsed_tweet['text'],
-                        'followers': parsed_tweet['user']['followers_count']
-                    })
+                    exclusion_reasons.append(self._build_exclusion_entry(i, parsed_tweet, reason))
                     self.filtered_counts['total_filtered'] += 1
                 else:
                     filtered_tweets.append(tweet)
@@ -263,14 +623,19 @@ class TweetFilter:
         if not self.silent_mode:
             print(f"📊 过滤结果:")
             print(f"   🗞️  新闻账户过滤: {self.filtered_counts['news_accounts']} 条")
+            if self.filtered_counts['blocked_accounts']:
+                print(f"   ⛔ 屏蔽账户过滤: {self.filtered_counts['blocked_accounts']} 条 {self.blocked_category_counts}")
             if self.team_filter and self.team_filter.is_loaded:
                 print(f"   👥 团队账户过滤: {self.filtered_counts['team_accounts']} 条")
+                if self.cross_team_flags:
+                    print(f"   🔗 其他项目团队账户 (仅标记): {len(self.cross_team_flags)} 个")
             print(f"   🚫 基础垃圾过滤: {self.filtered_counts['spam_basic']} 条")
             print(f"   🤖 AI垃圾过滤: {self.filtered_counts['spam_ai']} 条")
             print(f"   📰 AI信息过滤: {self.filtered_counts['informative_ai']} 条")
             print(f"   📉 总过滤数量: {self.filtered_counts['total_filtered']} 条")
             print(f"   ✅ 保留分析: {len(filtered_tweets)} 条")
         
+        self.save_reputation()
         return filtered_tweets, exclusion_reasons
     
     def get_team_filter_stats(self):
@@ -281,11 +646,30 @@ class TweetFilter:
         stats = self.team_filter.get_filtering_stats()
         stats['enabled'] = True
         stats['filtered_count'] = self.filtered_counts['team_accounts']
+        stats['cross_project_filtered'] = self.filtered_counts['cross_team_accounts']
+        stats['cross_project_flagged'] = dict(self.cross_team_flags)
         
         return stats
     
+    def save_reputation(self):
+        """Persist the author reputation store (errors are non-fatal)"""
+        if not self.reputation_store:
+            return
+        try:
+            self.reputation_store.save()
+        except OSError as e:
+            if not self.silent_mode:
+                print(f"⚠️ 保存作者信誉数据失败: {e}")
+    
+    def get_reputation_stats(self):
+        """Author reputation verdict hits/misses for the current run"""
+        if not self.reputation_store:
+            return {'enabled': False}
+        
+        return dict(self.reputation_run_stats, enabled=True, authors=len(self.reputation_store.store))
+    
     def filter_tweets_silent(self, tweets, parse_tweet_func, token_symbol):
-        """Silent version of filter_tweets"""
+        """Silent version of filter_tweets (rule stage runs vectorized over the batch)"""
         filtered_tweets = []
         exclusion_reasons = []
         
@@ -293,21 +677,64 @@ class TweetFilter:
         if self.team_filter:
             self.team_filter.validate_token_coverage_silent(token_symbol)
         
+        parsed_tweets = []
+        for tweet in tweets:
+            try:
+                parsed_tweets.append(parse_tweet_func(tweet))
+            except Exception:
+                parsed_tweets.append(None)
+        
+        rows = [i for i, parsed in enumerate(parsed_tweets) if parsed is not None]
+        counters = self._snapshot_counters()
+        try:
+            rule_reasons = self.rule_filter_batch(
+                [parsed_tweets[i]['user']['username'] for i in rows],
+                [parsed_tweets[i]['text'] for i in rows],
+                token_symbol
+            )
+        except Exception:
+            # Fall back to per-tweet rules if the batch pass fails, without counting its partial progress twice
+            self._restore_counters(counters)
+            rule_reasons = None
+        
+        reason_by_row = dict(zip(rows, rule_reasons)) if rule_reasons is not None else {}
+        
+        # Batch the AI stage for every row that survived the rules
+        if rule_reasons is not None and self.openai_client:
+            ai_rows = [i for i in rows if reason_by_row[i] is None]
+            try:
+                start = time.perf_counter()
+                ai_results = self.apply_ai_filter_batch(
+                    [(parsed_tweets[i]['text'], parsed_tweets[i]['user']['username']) for i in ai_rows]
+                )
+                self._record_stage('ai_filter', len(ai_rows), sum(1 for excluded, _ in ai_results if excluded),
+                                   time.perf_counter() - start)
+                ai_result_by_row = dict(zip(ai_rows, ai_results))
+            except Exception:
+                ai_result_by_row = {}
+        else:
+            ai_result_by_row = {}
+        
         for i, tweet in enumerate(tweets):
+            parsed_tweet = parsed_tweets[i]
+            if parsed_tweet is None:
+                filtered_tweets.append(tweet)
+                continue
+            
             try:
-                parsed_tweet = parse_tweet_func(tweet)
-                should_exclude, reason = self.should_exclude_tweet(parsed_tweet, token_symbol)
+                if rule_reasons is None:
+                    should_exclude, reason = self.should_exclude_tweet(parsed_tweet, token_symbol)
+                elif reason_by_row[i] is not None:
+                    should_exclude, reason = True, reason_by_row[i]
+                elif i in ai_result_by_row:
+                    should_exclude, reason = ai_result_by_row[i]
+                else:
+                    should_exclude, reason = self.apply_ai_filter(
+                        parsed_tweet['text'], parsed_tweet['user']['username']
+                    )
                 
                 if should_exclude:
-                    exclusion_reasons.append({
-                        'tweet_num': i + 1,
-                        'user': parsed_tweet['user']['username'],
-                        'reason': reason,
-                        'detailed_reason': self.get_detailed_filter_reason(reason),
-                        'text_preview': parsed_tweet['text'][:100] + '...' if len(parsed_tweet['text']) > 100 else parsed_tweet['text'],
-                        'full_text': parsed_tweet['text'],
-                        'followers': parsed_tweet['user']['followers_count']
-                    })
+                    exclusion_reasons.append(self._build_exclusion_entry(i, parsed_tweet, reason))
                     self.filtered_counts['total_filtered'] += 1
                 else:
                     filtered_tweets.append(tweet)
@@ -315,6 +742,7 @@ class TweetFilter:
             except Exception:
                 filtered_tweets.append(tweet)
         
+        self.save_reputation()
         return filtered_tweets, exclusion_reasons
     
     def validate_token_coverage_silent(self, token_symbol):
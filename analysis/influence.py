@@ -8,12 +8,30 @@ from config import INFLUENCE_TIERS, VERIFICATION_BONUS
 
 
 class InfluenceCalculator:
-    def __init__(self):
+    def __init__(self, reputation_store=None):
         self.influence_tiers = INFLUENCE_TIERS
         self.verification_bonus = VERIFICATION_BONUS
+        self.reputation_store = reputation_store
+        self.cache_stats = {'influence_hits': 0, 'influence_misses': 0}
+    
+    def reset_cache_stats(self):
+        """Start per-run influence cache counts (the reputation store keeps process totals)"""
+        self.cache_stats = {key: 0 for key in self.cache_stats}
+    
+    def _cached_influence(self, user_data):
+        """Influence data cached in the reputation store for an unchanged author, or None"""
+        if not self.reputation_store:
+            return None
+        cached = self.reputation_store.get_influence(user_data)
+        self.cache_stats['influence_hits' if cached else 'influence_misses'] += 1
+        return cached
     
     def calculate_influence_score(self, user_data):
         """Calculate user influence score based on followers and verification"""
+        cached = self._cached_influence(user_data)
+        if cached:
+            return cached
+        
         followers = user_data.get('followers_count', 0)
         is_verified = user_data.get('verified', False)
         is_blue_verified = user_data.get('blue_verified', False)
@@ -32,12 +50,17 @@ class InfluenceCalculator:
         
         influence_score = base_weight * multiplier
         
-        return {
+        influence_data = {
             'influence_score': round(influence_score, 2),
             'base_weight': base_weight,
             'verification_multiplier': round(multiplier, 2),
             'followers_tier': self._get_followers_tier(followers)
         }
+        
+        if self.reputation_store:
+            self.reputation_store.set_influence(user_data, influence_data)
+        
+        return influence_data
 
     def _get_followers_tier(self, followers):
         """Get readable follower tier description"""
@@ -50,20 +73,24 @@ class InfluenceCalculator:
         else:
             return f"Tier 4 (<1K): {followers:,}"
 
+    @staticmethod
+    def _parse_views(views):
+        """Normalize the views metric ('1,234', 'N/A', int) to a number"""
+        if isinstance(views, str) and views != 'N/A':
+            try:
+                return int(views.replace(',', ''))
+            except ValueError:
+                return 0
+        elif views == 'N/A' or views is None:
+            return 0
+        return views
+    
     def calculate_viral_index(self, metrics):
         """Calculate viral/propagation index using engagement metrics"""
         retweets = metrics.get('retweets', 0)
         likes = metrics.get('likes', 0)
         replies = metrics.get('replies', 0)
-        views = metrics.get('views', 0)
-        
-        if isinstance(views, str) and views != 'N/A':
-            try:
-                views = int(views.replace(',', ''))
-            except:
-                views = 0
-        elif views == 'N/A':
-            views = 0
+        views = self._parse_views(metrics.get('views', 0))
         
         viral_index = (
             math.log(retweets + 1) * 0.4 +
@@ -106,4 +133,149 @@ class InfluenceCalculator:
                 'viral_multiplier': round(1 + viral_index/10, 2),
                 'confidence_multiplier': round(1 + confidence/5, 2)
             }
-        }
\ No newline at end of file
+        }
+    
+    def _tier_lookup_table(self):
+        """Tier thresholds sorted ascending with their weights, for searchsorted"""
+        tiers = sorted(self.influence_tiers.values(), key=lambda tier: tier['min_followers'])
+        return [tier['min_followers'] for tier in tiers], [tier['weight'] for tier in tiers]
+    
+    def calculate_influence_scores_batch(self, followers, verified, blue_verified):
+        """Vectorized calculate_influence_score over arrays, returns dict of arrays"""
+        # numpy is only needed for batch scoring, keep it off the import path
+        import numpy as np
+        
+        followers = np.asarray(followers, dtype=np.float64)
+        thresholds, weights = self._tier_lookup_table()
+        
+        # Highest threshold <= followers; below every tier falls back to 0.5 like the scalar path
+        positions = np.searchsorted(np.asarray(thresholds, dtype=np.float64), followers, side='right') - 1
+        base_weight = np.where(positions >= 0, np.asarray(weights + [0.5])[positions], 0.5)
+        
+        multiplier = np.ones(len(followers))
+        multiplier = np.where(np.asarray(verified, dtype=bool),
+                              multiplier * self.verification_bonus['legacy_verified'], multiplier)
+        multiplier = np.where(np.asarray(blue_verified, dtype=bool),
+                              multiplier * self.verification_bonus['blue_verified'], multiplier)
+        
+        return {
+            'influence_score': np.round(base_weight * multiplier, 2),
+            'base_weight': base_weight,
+            'verification_multiplier': np.round(multiplier, 2)
+        }
+    
+    def calculate_viral_indices_batch(self, retweets, likes, replies, views):
+        """Vectorized calculate_viral_index over arrays, returns dict of arrays"""
+        import numpy as np
+        
+        # log(x + 1) rather than log1p so results match the scalar math.log path
+        retweets_score = np.log(np.asarray(retweets, dtype=np.float64) + 1) * 0.4
+        likes_score = np.log(np.asarray(likes, dtype=np.float64) + 1) * 0.3
+        replies_score = np.log(np.asarray(replies, dtype=np.float64) + 1) * 0.3
+        
+        views = np.asarray([self._parse_views(value) for value in views], dtype=np.float64)
+        has_views = views > 0
+        views_bonus = np.where(has_views, np.log(np.where(has_views, views, 0) + 1) * 0.1, 0.0)
+        
+        return {
+            'viral_index': np.round(retweets_score + likes_score + replies_score + views_bonus, 2),
+            'retweets_score': np.round(retweets_score, 2),
+            'likes_score': np.round(likes_score, 2),
+            'replies_score': np.round(replies_score, 2),
+            'views_bonus': np.round(views_bonus, 2),
+            'views': views
+        }
+    
+    def calculate_weighted_impacts_batch(self, sentiment_scores, confidences, influence_scores, viral_indices):
+        """Vectorized calculate_weighted_sentiment_impact, returns the weighted_impact array"""
+        import numpy as np
+        
+        sentiment_scores = np.asarray(sentiment_scores, dtype=np.float64)
+        confidences = np.asarray(confidences, dtype=np.float64)
+        influence_scores = np.asarray(influence_scores, dtype=np.float64)
+        viral_indices = np.asarray(viral_indices, dtype=np.float64)
+        
+        return np.round(sentiment_scores * influence_scores * (1 + viral_indices / 10) * (1 + confidences / 5), 2)
+    
+    def _batch_arrays(self, users, metrics):
+        """(influence, viral) array dicts for parallel lists of user/metrics dicts"""
+        influence = self.calculate_influence_scores_batch(
+            [user.get('followers_count', 0) for user in users],
+            [user.get('verified', False) for user in users],
+            [user.get('blue_verified', False) for user in users]
+        )
+        viral = self.calculate_viral_indices_batch(
+            [metric.get('retweets', 0) for metric in metrics],
+            [metric.get('likes', 0) for metric in metrics],
+            [metric.get('replies', 0) for metric in metrics],
+            [metric.get('views', 0) for metric in metrics]
+        )
+        return influence, viral
+    
+    def calculate_scores_batch(self, users, metrics, sentiment_results=None):
+        """Influence, viral and (optionally) impact scores for parallel lists of user/metrics dicts"""
+        influence, viral = self._batch_arrays(users, metrics)
+        
+        scores = {
+            'influence_score': influence['influence_score'],
+            'viral_index': viral['viral_index']
+        }
+        if sentiment_results is not None:
+            # Rounded influence/viral values feed the impact, as in the per-tweet path
+            scores['weighted_impact'] = self.calculate_weighted_impacts_batch(
+                [result['sentiment_score'] for result in sentiment_results],
+                [result['confidence'] for result in sentiment_results],
+                influence['influence_score'],
+                viral['viral_index']
+            )
+        return scores
+    
+    def calculate_score_dicts_batch(self, users, metrics):
+        """[(influence_data, viral_data)] shaped like the scalar methods, from one vectorized pass
+
+        Used by comprehensive_analysis_silent for all filtered tweets at once;
+        falls back to the scalar methods when numpy is not installed. Authors
+        with influence data in the reputation store reuse it, the rest are
+        scored here and written back, as in calculate_influence_score.
+        """
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            return [(self.calculate_influence_score(user), self.calculate_viral_index(metric))
+                    for user, metric in zip(users, metrics)]
+        
+        if not users:
+            return []
+        
+        influence, viral = self._batch_arrays(users, metrics)
+        
+        results = []
+        for i, (user, metric) in enumerate(zip(users, metrics)):
+            views = int(viral['views'][i])
+            influence_data = self._cached_influence(user)
+            if not influence_data:
+                influence_data = {
+                    'influence_score': float(influence['influence_score'][i]),
+                    'base_weight': float(influence['base_weight'][i]),
+                    'verification_multiplier': float(influence['verification_multiplier'][i]),
+                    'followers_tier': self._get_followers_tier(user.get('followers_count', 0))
+                }
+                if self.reputation_store:
+                    self.reputation_store.set_influence(user, influence_data)
+            viral_data = {
+                'viral_index': float(viral['viral_index'][i]),
+                'engagement_breakdown': {
+                    'retweets_score': float(viral['retweets_score'][i]),
+                    'likes_score': float(viral['likes_score'][i]),
+                    'replies_score': float(viral['replies_score'][i]),
+                    'views_bonus': float(viral['views_bonus'][i])
+                },
+                'raw_engagement': {
+                    'retweets': metric.get('retweets', 0),
+                    'likes': metric.get('likes', 0),
+                    'replies': metric.get('replies', 0),
+                    'views': views
+                }
+            }
+            results.append((influence_data, viral_data))
+        return results
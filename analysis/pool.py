@@ -0,0 +1,184 @@
+# analysis/pool.py
+"""
+Pool of warm analyzers for long-lived processes (Streamlit, server, batch runs)
+"""
+
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from api.twitter_api import TwitterAPI
+from config import TEAM_FILTER_CONFIG, AUTHOR_REPUTATION_CONFIG, ANALYSIS_CONFIG, SINGLEFLIGHT_CONFIG
+from data.team_filter import TeamFilter
+from data.author_reputation import AuthorReputationStore
+from utils.singleflight import SingleFlight
+from .sentiment import CryptoSentimentAnalyzer
+
+
+class AnalyzerPool:
+    """Long-lived analyzers handed out one run at a time
+
+    Read-mostly components are built once and shared by every analyzer:
+    the team filter (immutable index, hot-reloaded), the author reputation
+    store and the Twitter API client. Each checkout gets an analyzer with
+    its run-scoped state reset; at most `size` analyses run concurrently.
+    analyze_token() coalesces concurrent requests for the same token and
+    stores results in the optional ResultCache.
+    """
+
+    def __init__(self, openai_api_key=None, size=2, silent_mode=True, result_cache=None):
+        self.openai_api_key = openai_api_key
+        self.size = size
+        self.silent_mode = silent_mode
+        self.result_cache = result_cache
+        self.flight = SingleFlight(
+            lock_dir=SINGLEFLIGHT_CONFIG['lock_dir'] if SINGLEFLIGHT_CONFIG['enable_cross_process'] else None,
+            lock_timeout_seconds=SINGLEFLIGHT_CONFIG['lock_timeout_seconds']
+        )
+
+        self.team_filter = None
+        if TEAM_FILTER_CONFIG['enable_team_filtering']:
+            self.team_filter = TeamFilter(
+                TEAM_FILTER_CONFIG['excel_file_path'],
+                silent_mode=silent_mode,
+                snapshot_path=TEAM_FILTER_CONFIG['snapshot_path'] if TEAM_FILTER_CONFIG['enable_snapshot'] else None
+            )
+            # Shared across runs for the life of the process, so always pick up sheet edits
+            self.team_filter.start_auto_reload(TEAM_FILTER_CONFIG['reload_interval_seconds'])
+
+        self.reputation_store = None
+        if AUTHOR_REPUTATION_CONFIG['enable_reputation']:
+            self.reputation_store = AuthorReputationStore(
+                AUTHOR_REPUTATION_CONFIG['store_path'],
+                min_verdicts=AUTHOR_REPUTATION_CONFIG['min_verdicts'],
+                conclusive_ratio=AUTHOR_REPUTATION_CONFIG['conclusive_ratio'],
+                half_life_days=AUTHOR_REPUTATION_CONFIG['half_life_days'],
+                ttl_days=AUTHOR_REPUTATION_CONFIG['ttl_days'],
+                influence_ttl_hours=AUTHOR_REPUTATION_CONFIG['influence_ttl_hours']
+            )
+
+        self.twitter_api = TwitterAPI()
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _create_analyzer(self):
+        return CryptoSentimentAnalyzer(
+            openai_api_key=self.openai_api_key,
+            silent_mode=self.silent_mode,
+            team_filter=self.team_filter,
+            reputation_store=self.reputation_store
+        )
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+
+        if create:
+            try:
+                return self._create_analyzer()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        # Pool exhausted: wait for a running analysis to hand its analyzer back
+        return self._idle.get()
+
+    @contextmanager
+    def checkout(self):
+        """Yield (analyzer, twitter_api) with the analyzer's run state cleared"""
+        analyzer = self._acquire()
+        try:
+            analyzer.reset_run_state()
+            yield analyzer, self.twitter_api
+        finally:
+            self._idle.put(analyzer)
+
+    def _run_analysis(self, token_symbol, target_days, max_pages_per_call, print_report, progress_callback):
+        run_info = {'token': token_symbol, 'target_days': target_days, 'total_tweets': 0, 'error': None,
+                    'source': 'fresh'}
+        with self.checkout() as (analyzer, twitter_api):
+            if progress_callback:
+                progress_callback('fetching', {'token': token_symbol, 'target_days': target_days})
+
+            base_querystring = twitter_api.create_smart_querystring_silent(token_symbol, additional_filters={})
+            all_tweets = twitter_api.get_tweets_multi_timeframe_silent(
+                base_querystring,
+                total_days=target_days,
+                max_pages_per_call=max_pages_per_call
+            )
+            run_info['total_tweets'] = len(all_tweets) if all_tweets else 0
+            if progress_callback:
+                progress_callback('fetched', {'total_tweets': run_info['total_tweets']})
+
+            analysis_result = None
+            if all_tweets:
+                analysis_result = analyzer.comprehensive_analysis_silent(
+                    all_tweets, token_symbol, target_days, print_report=print_report,
+                    progress_callback=progress_callback
+                )
+
+        # Empty results ("no tweets yet") are transient, so they are not cached for the full TTL
+        if self.result_cache is not None and analysis_result is not None:
+            try:
+                self.result_cache.set(token_symbol, target_days,
+                                      {'analysis_result': analysis_result, 'run_info': run_info})
+            except OSError:
+                pass
+        return analysis_result, run_info
+
+    def _cached(self, token_symbol, target_days, not_before=None):
+        if self.result_cache is None:
+            return None
+        entry = self.result_cache.get(token_symbol, target_days)
+        if not entry or (not_before is not None and entry['updated_at'] < not_before):
+            return None
+        return entry['value']['analysis_result'], dict(entry['value']['run_info'], source='cache')
+
+    def analyze_token(self, token_symbol, target_days=None, max_pages_per_call=None, use_cache=True,
+                      print_report=False, progress_callback=None):
+        """Fetch and analyze one token, returns (analysis_result, run_info)
+
+        Concurrent calls for the same token/days share one run (run_info
+        'source' is then 'shared'); only the leader's progress_callback
+        receives updates. With use_cache=False a cached result is only
+        reused if it was produced after this call started.
+        """
+        target_days = target_days or ANALYSIS_CONFIG['target_days']
+        max_pages_per_call = max_pages_per_call or ANALYSIS_CONFIG['max_pages_per_call']
+
+        if use_cache:
+            cached = self._cached(token_symbol, target_days)
+            if cached:
+                return cached
+
+        requested_at = time.time()
+        (analysis_result, run_info), shared = self.flight.do(
+            (token_symbol.upper(), target_days),
+            self._run_analysis, token_symbol, target_days, max_pages_per_call, print_report, progress_callback,
+            recheck=lambda: self._cached(token_symbol, target_days, None if use_cache else requested_at)
+        )
+        if shared and run_info['source'] == 'fresh':
+            run_info = dict(run_info, source='shared')
+        return analysis_result, run_info
+
+    def get_stats(self):
+        return {
+            'size': self.size,
+            'created': self._created,
+            'idle': self._idle.qsize(),
+            'singleflight': dict(self.flight.stats),
+            'team_data_reloads': self.team_filter.reload_count if self.team_filter else 0,
+            'reputation': self.reputation_store.get_stats() if self.reputation_store else None
+        }
@@ -0,0 +1,191 @@
+# analysis/rules.py
+"""
+Precompiled rule engine for basic spam detection
+"""
+
+import re
+import warnings
+from collections import deque
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton for multi-keyword substring matching"""
+
+    def __init__(self, keywords, lowercase=True):
+        self.lowercase = lowercase
+        self.keywords = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+
+        keyword_ids = {}
+        for keyword in keywords:
+            if not keyword:
+                continue
+            if lowercase:
+                keyword = keyword.lower()
+            if keyword not in keyword_ids:
+                keyword_ids[keyword] = len(self.keywords)
+                self.keywords.append(keyword)
+                self._add(keyword, keyword_ids[keyword])
+
+        self._build_failure_links()
+
+    def _add(self, keyword, keyword_id):
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        self._output[state] = self._output[state] + (keyword_id,)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                # Merge outputs so every suffix match is reported without walking fail links
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text):
+        """Yield (end_index, keyword_id) for every keyword occurrence, overlaps included"""
+        if not text:
+            return
+        if self.lowercase:
+            text = text.lower()
+
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword_id in output[state]:
+                yield index, keyword_id
+
+    def find_ids(self, text, limit=None):
+        """Return the set of distinct keyword ids found in text (stops early at limit)"""
+        found = set()
+        for _, keyword_id in self.iter_matches(text):
+            found.add(keyword_id)
+            if limit is not None and len(found) >= limit:
+                break
+        return found
+
+    def find_all(self, text):
+        """Return the distinct keywords found in text"""
+        return {self.keywords[keyword_id] for keyword_id in self.find_ids(text)}
+
+
+class SpamRuleEngine:
+    """SPAM_PATTERNS compiled once into an automaton and precompiled regexes"""
+
+    def __init__(self, spam_patterns):
+        keywords = spam_patterns.get('giveaway_keywords', [])
+        self.giveaway_matcher = KeywordMatcher(keywords)
+
+        # Duplicated keywords counted twice in the original sum(), keep that weighting
+        self.giveaway_weights = [0] * len(self.giveaway_matcher.keywords)
+        keyword_index = {keyword: i for i, keyword in enumerate(self.giveaway_matcher.keywords)}
+        for keyword in keywords:
+            if keyword:
+                self.giveaway_weights[keyword_index[keyword.lower()]] += 1
+
+        meaningless = spam_patterns.get('meaningless_patterns', [])
+        self.meaningless_regex = None
+        if meaningless:
+            self.meaningless_regex = re.compile(
+                '|'.join(f'(?:{pattern})' for pattern in meaningless), re.IGNORECASE
+            )
+
+        self.search_rules = []
+        for key, label in [('token_spam_pattern', 'Token list spam'),
+                           ('excessive_emojis', 'Excessive emojis'),
+                           ('repeated_chars', 'Repeated characters')]:
+            if spam_patterns.get(key):
+                self.search_rules.append((re.compile(spam_patterns[key]), label))
+
+    def count_giveaway_keywords(self, text, limit=None):
+        """Count matched giveaway keywords in text (same semantics as the substring loop)"""
+        count = 0
+        for keyword_id in self.giveaway_matcher.find_ids(text):
+            count += self.giveaway_weights[keyword_id]
+            if limit is not None and count >= limit:
+                break
+        return count
+
+    def check(self, text):
+        """Return (is_spam, reason) using the same rule order as TweetFilter.detect_basic_spam"""
+        if not text:
+            return True, "Too short"
+
+        stripped = text.strip()
+        if len(stripped) < 5:
+            return True, "Too short"
+
+        if self.count_giveaway_keywords(text, limit=2) >= 2:
+            return True, "Giveaway spam"
+
+        if self.meaningless_regex and self.meaningless_regex.match(stripped):
+            return True, "Meaningless content"
+
+        for regex, label in self.search_rules:
+            if regex.search(text):
+                return True, label
+
+        words = text.split()
+        if len(words) <= 2 and not any(word.startswith('$') for word in words):
+            return True, "Too few words"
+
+        return False, "Clean"
+
+    def check_batch(self, texts):
+        """Run check() over a list of texts"""
+        check = self.check
+        return [check(text) for text in texts]
+
+    def check_series(self, texts):
+        """Vectorized check() over a column of texts, returns an array of reasons ('Clean' if kept)"""
+        # pandas/numpy are only needed for batch filtering, keep them off the import path
+        import numpy as np
+        import pandas as pd
+
+        texts = pd.Series(list(texts), dtype=object).fillna('').astype(str)
+        if texts.empty:
+            return np.array([], dtype=object)
+
+        stripped = texts.str.strip()
+        conditions = [
+            (stripped.str.len() < 5).to_numpy(),
+            (texts.map(lambda text: self.count_giveaway_keywords(text, limit=2)) >= 2).to_numpy(),
+        ]
+        labels = ["Too short", "Giveaway spam"]
+
+        if self.meaningless_regex is not None:
+            conditions.append(stripped.str.match(self.meaningless_regex.pattern,
+                                                 flags=self.meaningless_regex.flags).to_numpy())
+            labels.append("Meaningless content")
+
+        with warnings.catch_warnings():
+            # Capture groups (e.g. backreferences) are intentional in SPAM_PATTERNS
+            warnings.simplefilter('ignore', UserWarning)
+            for regex, label in self.search_rules:
+                conditions.append(texts.str.contains(regex.pattern, flags=regex.flags, regex=True).to_numpy())
+                labels.append(label)
+            has_dollar_word = texts.str.contains(r'(?:^|\s)\$', regex=True).to_numpy()
+
+        word_counts = texts.str.split().str.len().to_numpy()
+        conditions.append((word_counts <= 2) & ~has_dollar_word)
+        labels.append("Too few words")
+
+        return np.select(conditions, np.array(labels, dtype=object), default="Clean")
@@ -0,0 +1,111 @@
+# analysis/sampling.py
+"""
+Representative tweet sampling for summary and topic prompts
+"""
+
+import math
+import re
+from datetime import datetime
+
+from config import INFLUENCE_TIERS
+from .clustering import StreamingTopicClusterer
+
+NORMALIZE_PATTERN = re.compile(r'https?://\S+|@\w+|[^\w$]+')
+
+
+def normalize_text(text):
+    """Text key for near-duplicate detection (links, mentions, punctuation and case ignored)"""
+    return NORMALIZE_PATTERN.sub(' ', (text or '').lower()).strip()[:100]
+
+
+def parse_created_at(created_at):
+    """Twitter created_at ('Wed Oct 10 20:19:24 +0000 2018') to a timestamp, None if unknown"""
+    if not created_at or created_at == 'N/A':
+        return None
+    try:
+        return datetime.strptime(created_at, '%a %b %d %H:%M:%S %z %Y').timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class RepresentativeSampler:
+    """Picks a diverse, high-signal sample instead of the first N tweets
+
+    Near-duplicates are dropped, the rest are stratified by topic cluster,
+    time bucket and influence tier, and strata are visited round-robin
+    (largest first), each contributing its highest-signal tweet per round.
+    """
+
+    def __init__(self, time_buckets=4, use_clusters=True, max_clusters=6):
+        self.time_buckets = time_buckets
+        self.use_clusters = use_clusters
+        self.max_clusters = max_clusters
+        self.tier_thresholds = sorted(((tier['min_followers'], tier['weight']) for tier in INFLUENCE_TIERS.values()),
+                                      reverse=True)
+
+    def _influence_tier(self, followers):
+        for tier_index, (min_followers, weight) in enumerate(self.tier_thresholds):
+            if followers >= min_followers:
+                return tier_index, weight
+        return len(self.tier_thresholds), 0.5
+
+    def _time_buckets(self, tweets):
+        timestamps = [parse_created_at(tweet.get('created_at')) for tweet in tweets]
+        known = [timestamp for timestamp in timestamps if timestamp is not None]
+        if not known or max(known) == min(known):
+            return [0] * len(tweets)
+
+        start, span = min(known), max(known) - min(known)
+        return [min(self.time_buckets - 1, int((timestamp - start) / span * self.time_buckets))
+                if timestamp is not None else -1 for timestamp in timestamps]
+
+    def _clusters(self, tweets):
+        if not self.use_clusters:
+            return [0] * len(tweets)
+        clusterer = StreamingTopicClusterer(max_clusters=self.max_clusters)
+        return clusterer.add_many(tweet.get('text', '') for tweet in tweets)
+
+    def sample_indices(self, tweets, size):
+        """Indices of the selected tweets, in original order"""
+        seen, unique = set(), []
+        for i, tweet in enumerate(tweets):
+            key = normalize_text(tweet.get('text', ''))
+            if key and key not in seen:
+                seen.add(key)
+                unique.append(i)
+
+        if len(unique) <= size:
+            return unique
+
+        candidates = [tweets[i] for i in unique]
+        time_buckets = self._time_buckets(candidates)
+        clusters = self._clusters(candidates)
+
+        strata = {}
+        for position, tweet in enumerate(candidates):
+            tier, weight = self._influence_tier(tweet.get('followers_count', 0) or 0)
+            signal = weight * (1 + math.log1p(max(0, tweet.get('engagement', 0) or 0)))
+            key = (clusters[position], time_buckets[position], tier)
+            strata.setdefault(key, []).append((signal, unique[position]))
+
+        queues = sorted(strata.values(), key=len, reverse=True)
+        for queue in queues:
+            queue.sort(key=lambda item: (-item[0], item[1]))
+
+        selected, round_index = [], 0
+        while len(selected) < size:
+            picked = False
+            for queue in queues:
+                if round_index < len(queue):
+                    selected.append(queue[round_index][1])
+                    picked = True
+                    if len(selected) >= size:
+                        break
+            if not picked:
+                break
+            round_index += 1
+
+        return sorted(selected)
+
+    def sample(self, tweets, size):
+        return [tweets[i] for i in self.sample_indices(tweets, size)]
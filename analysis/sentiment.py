@@ -3,6 +3,10 @@
 Enhanced sentiment analysis with silent mode for clean output
 """
 
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 try:
     from openai import OpenAI
     OPENAI_AVAILABLE = True
@@ -12,27 +16,59 @@ except ImportError:
 from .filters import TweetFilter
 from .influence import InfluenceCalculator
 from .topics import TopicAnalyzer
+from .sampling import parse_created_at
 from api.coinex_api import CoinExAPI
+from utils.cache_store import JsonFileStore
+from utils.concurrency import service_slot
 from utils.tweet_parser import TweetParser
 from utils.formatters import ReportFormatter
-from config import ANALYSIS_CONFIG
+from config import ANALYSIS_CONFIG, SUMMARY_CONFIG
 
 
 class CryptoSentimentAnalyzer:
-    def __init__(self, openai_api_key=None, silent_mode=False):
+    def __init__(self, openai_api_key=None, silent_mode=False, team_filter=None, reputation_store=None):
         self.openai_client = OpenAI(api_key=openai_api_key) if openai_api_key and OPENAI_AVAILABLE else None
         self.total_tokens_used = 0
+        self._usage_lock = threading.Lock()
         self.price_context = None
         self.silent_mode = silent_mode
         
+        # Chunk/reduce summaries keyed by prompt hash, so unchanged chunks are not re-summarized
+        self.summary_cache = None
+        if SUMMARY_CONFIG['enable_summary_cache']:
+            self.summary_cache = JsonFileStore(SUMMARY_CONFIG['cache_path'],
+                                               ttl_seconds=SUMMARY_CONFIG['cache_ttl_hours'] * 3600)
+        
         # Initialize components
-        self.tweet_filter = TweetFilter(openai_api_key, silent_mode=silent_mode)
-        self.influence_calculator = InfluenceCalculator()
-        self.topic_analyzer = TopicAnalyzer(openai_api_key)
+        self.tweet_filter = TweetFilter(openai_api_key, silent_mode=silent_mode, team_filter=team_filter,
+                                        reputation_store=reputation_store)
+        self.influence_calculator = InfluenceCalculator(reputation_store=self.tweet_filter.reputation_store)
+        self.topic_analyzer = TopicAnalyzer(openai_api_key, silent_mode=silent_mode)
         self.coinex_api = CoinExAPI()
         self.tweet_parser = TweetParser()
         self.report_formatter = ReportFormatter()
     
+    def reset_run_state(self):
+        """Clear run-scoped state (token counts, price context, topics, filter counters) between analyses"""
+        self.total_tokens_used = 0
+        self.price_context = None
+        self.tweet_filter.reset_run_state()
+        self.topic_analyzer.reset_run_state()
+        self.influence_calculator.reset_cache_stats()
+    
+    def _reputation_stats(self):
+        """Author reputation verdict and influence cache hits/misses for this run"""
+        stats = self.tweet_filter.get_reputation_stats()
+        if stats['enabled']:
+            stats.update(self.influence_calculator.cache_stats)
+        return stats
+    
+    def _track_usage(self, response):
+        """Add a response's token usage (thread-safe, summaries run concurrently)"""
+        if hasattr(response, 'usage'):
+            with self._usage_lock:
+                self.total_tokens_used += response.usage.total_tokens
+    
     def analyze_sentiment_and_topic_combined(self, text):
         """Combined sentiment and topic analysis with price context awareness"""
         if not self.openai_client:
@@ -112,12 +148,13 @@ IMPORTANT - 价格感知情感分析指引:
             REASON: [One sentence explanation including price context influence if applicable]
             """
             
-            response = self.openai_client.chat.completions.create(
-                model=ANALYSIS_CONFIG['openai_model'],
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=120,
-                temperature=0.1
-            )
+            with service_slot('openai'):
+                response = self.openai_client.chat.completions.create(
+                    model=ANALYSIS_CONFIG['openai_model'],
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=120,
+                    temperature=0.1
+                )
             
             content = response.choices[0].message.content.strip()
             
@@ -158,8 +195,7 @@ IMPORTANT - 价格感知情感分析指引:
                     sentiment = 'NEUTRAL'
             
             # Track token usage
-            if hasattr(response, 'usage'):
-                self.total_tokens_used += response.usage.total_tokens
+            self._track_usage(response)
             
             return {
                 'sentiment': sentiment,
@@ -211,21 +247,20 @@ IMPORTANT - 价格感知情感分析指引:
         if not self.openai_client:
             return "OpenAI不可用，无法生成智能摘要"
         
+        if SUMMARY_CONFIG['enable_hierarchical'] and len(tweets_sample) > SUMMARY_CONFIG['hierarchical_min_tweets']:
+            return self.generate_hierarchical_summary(tweets_sample, token_symbol)
+        
         try:
             max_tweets = ANALYSIS_CONFIG['max_tweets_for_summary']
-            sample_tweets = tweets_sample[:max_tweets] if len(tweets_sample) > max_tweets else tweets_sample
+            if self.topic_analyzer.sampler:
+                sample_tweets = self.topic_analyzer.sampler.sample(tweets_sample, max_tweets)
+            else:
+                sample_tweets = tweets_sample[:max_tweets] if len(tweets_sample) > max_tweets else tweets_sample
             tweets_text = "\n".join([f"- {tweet['text'][:120]}..." if len(tweet['text']) > 120 else f"- {tweet['text']}" 
                                    for tweet in sample_tweets])
             
             # Add price context to summary if available
-            price_context_str = ""
-            if self.price_context:
-                price_change = self.price_context['change_rate']
-                price_usd = self.price_context['price_usd']
-                price_context_str = f"""
-当前市场状况: {token_symbol} 价格 ${price_usd:.6f} (24H: {price_change:+.2%})
-请在分析中考虑价格波动对社区情绪的影响。
-"""
+            price_context_str = self._price_context_prompt(token_symbol)
             
             prompt = f"""
             请分析这{len(tweets_sample)}条关于{token_symbol}的推文，并提供综合摘要。请用简体中文回复。
@@ -244,21 +279,147 @@ IMPORTANT - 价格感知情感分析指引:
             请务必用简体中文回复。
             """
             
+            with service_slot('openai'):
+                response = self.openai_client.chat.completions.create(
+                    model=ANALYSIS_CONFIG['openai_model'],
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=300,
+                    temperature=0.3
+                )
+            
+            # Track token usage
+            self._track_usage(response)
+            
+            return response.choices[0].message.content.strip()
+            
+        except Exception as e:
+            return f"OpenAI摘要生成失败: {e}"
+    
+    def _price_context_prompt(self, token_symbol):
+        if not self.price_context:
+            return ""
+        
+        price_change = self.price_context['change_rate']
+        price_usd = self.price_context['price_usd']
+        return f"""
+当前市场状况: {token_symbol} 价格 ${price_usd:.6f} (24H: {price_change:+.2%})
+请在分析中考虑价格波动对社区情绪的影响。
+"""
+    
+    def _summary_chunks(self, tweets_sample):
+        """Split tweets into fixed time-window chunks (stable across refreshes, so chunk caches hit)"""
+        window_seconds = SUMMARY_CONFIG['chunk_hours'] * 3600
+        buckets = {}
+        for tweet in tweets_sample:
+            timestamp = parse_created_at(tweet.get('created_at'))
+            bucket = int(timestamp // window_seconds) if timestamp is not None else -1
+            buckets.setdefault(bucket, []).append(tweet)
+        
+        chunk_size = SUMMARY_CONFIG['max_tweets_per_chunk']
+        chunks = []
+        for bucket in sorted(buckets):
+            bucket_tweets = sorted(buckets[bucket], key=lambda tweet: str(tweet.get('tweet_id', '')))
+            for start in range(0, len(bucket_tweets), chunk_size):
+                chunks.append(bucket_tweets[start:start + chunk_size])
+        return chunks
+    
+    def _cached_completion(self, prompt, max_tokens):
+        """Chat completion with the summary cache in front (keyed by model + prompt)"""
+        cache_key = hashlib.sha256(f"{ANALYSIS_CONFIG['openai_model']}\n{prompt}".encode('utf-8')).hexdigest()
+        if self.summary_cache is not None:
+            cached = self.summary_cache.get(cache_key)
+            if cached:
+                return cached
+        
+        with service_slot('openai'):
             response = self.openai_client.chat.completions.create(
                 model=ANALYSIS_CONFIG['openai_model'],
                 messages=[{"role": "user", "content": prompt}],
-                max_tokens=300,
+                max_tokens=max_tokens,
                 temperature=0.3
             )
+        self._track_usage(response)
+        
+        content = response.choices[0].message.content.strip()
+        if self.summary_cache is not None and content:
+            self.summary_cache.set(cache_key, content)
+        return content
+    
+    def _summarize_chunk(self, chunk, token_symbol):
+        """Map step: short summary of one chunk of tweets (None on failure)"""
+        tweets_text = "\n".join([f"- {tweet['text'][:120]}..." if len(tweet['text']) > 120 else f"- {tweet['text']}"
+                                 for tweet in chunk])
+        prompt = f"""
+            请用简体中文总结以下{len(chunk)}条关于{token_symbol}的推文（同一时间段），2-3句话，包含情绪倾向、主要话题和提及的风险。
             
-            # Track token usage
-            if hasattr(response, 'usage'):
-                self.total_tokens_used += response.usage.total_tokens
+            推文:
+            {tweets_text}
+            """
+        try:
+            return self._cached_completion(prompt, max_tokens=150)
+        except Exception:
+            return None
+    
+    def _reduce_summaries(self, summaries, token_symbol, total_tweets, final=False):
+        """Reduce step: merge summaries, the final level uses the standard summary format"""
+        summaries_text = "\n".join(f"{i+1}. {summary}" for i, summary in enumerate(summaries))
+        
+        if not final:
+            prompt = f"""
+            请将以下关于{token_symbol}的分段摘要合并为一段简体中文摘要（3-4句话），保留情绪、主要话题和风险信息。
             
-            return response.choices[0].message.content.strip()
+            分段摘要:
+            {summaries_text}
+            """
+            return self._cached_completion(prompt, max_tokens=200)
+        
+        prompt = f"""
+            以下是对{total_tweets}条关于{token_symbol}的推文按时间段分段总结的结果。请据此提供综合摘要。请用简体中文回复。
+            
+            {self._price_context_prompt(token_symbol)}
+            
+            分段摘要:
+            {summaries_text}
+            
+            请提供包含以下内容的摘要(以下面的point form形式显示):
+            1. 整体情绪和社区氛围 包含讨论的主要话题和热点）
+            2. 主要担忧或兴奋点（包含讨论的主要话题和热点）
+            3. 提及的风险因素（包含技术、市场、监管等具体风险类型）
+            
+            请保持简洁但有深度的分析(最多3-4句话)。重点关注对投资者有用的见解。
+            请务必用简体中文回复。
+            """
+        return self._cached_completion(prompt, max_tokens=300)
+    
+    def generate_hierarchical_summary(self, tweets_sample, token_symbol):
+        """Map-reduce summary covering every tweet: chunk summaries in parallel, then merged level by level"""
+        try:
+            chunks = self._summary_chunks(tweets_sample)
+            fanout = SUMMARY_CONFIG['reduce_fanout']
+            
+            with ThreadPoolExecutor(max_workers=SUMMARY_CONFIG['max_workers']) as executor:
+                summaries = [summary for summary in
+                             executor.map(lambda chunk: self._summarize_chunk(chunk, token_symbol), chunks)
+                             if summary]
+                if not summaries:
+                    return "OpenAI摘要生成失败: 分段摘要全部失败"
+                
+                while len(summaries) > fanout:
+                    groups = [summaries[i:i + fanout] for i in range(0, len(summaries), fanout)]
+                    summaries = list(executor.map(
+                        lambda group: self._reduce_summaries(group, token_symbol, len(tweets_sample)), groups
+                    ))
+            
+            return self._reduce_summaries(summaries, token_symbol, len(tweets_sample), final=True)
             
         except Exception as e:
             return f"OpenAI摘要生成失败: {e}"
+        finally:
+            if self.summary_cache is not None:
+                try:
+                    self.summary_cache.save()
+                except OSError:
+                    pass
     
     def comprehensive_analysis(self, tweets, token_symbol):
         """Perform comprehensive price-aware sentiment analysis with enhanced filtering"""
@@ -290,7 +451,13 @@ IMPORTANT - 价格感知情感分析指引:
         tweets_for_topic_analysis = []
         for tweet in filtered_tweets:
             parsed = self.tweet_parser.parse_tweet_data(tweet)
-            tweets_for_topic_analysis.append({'text': parsed['text']})
+            tweets_for_topic_analysis.append({
+                'text': parsed['text'],
+                'tweet_id': parsed['tweet_id'],
+                'created_at': parsed.get('created_at'),
+                'followers_count': parsed['user']['followers_count'],
+                'engagement': parsed['metrics']['likes'] + parsed['metrics']['retweets'] + parsed['metrics']['replies']
+            })
         
         self.topic_analyzer.generate_bulk_topic_analysis_with_sentiment(tweets_for_topic_analysis, token_symbol)
         
@@ -326,12 +493,15 @@ IMPORTANT - 价格感知情感分析指引:
                 # Get topic with sentiment from the combined analysis
                 tweet_topic = self.topic_analyzer.get_tweet_topic_with_sentiment(
                     parsed_tweet['text'], 
-                    sentiment_result.get('openai_analysis')
+                    sentiment_result.get('openai_analysis'),
+                    tweet_id=parsed_tweet['tweet_id']
                 )
                 
                 tweet_analysis = {
                     'tweet_num': i + 1,
                     'tweet_id': parsed_tweet['tweet_id'],
+                    'tweet_link': self.tweet_parser.create_tweet_link(parsed_tweet['tweet_id']),
+                    'created_at': parsed_tweet.get('created_at'),
                     'user': parsed_tweet['user']['username'],
                     'text_preview': parsed_tweet['text'][:150] + '...' if len(parsed_tweet['text']) > 150 else parsed_tweet['text'],
                     'sentiment': sentiment_result,
@@ -354,6 +524,9 @@ IMPORTANT - 价格感知情感分析指引:
                 print(f"Error analyzing tweet {i+1}: {e}")
                 continue
         
+        # Persist cached influence data
+        self.tweet_filter.save_reputation()
+        
         # Analyze topic sentiment distribution
         topic_sentiment_analysis = self.topic_analyzer.analyze_topic_sentiment_distribution(tweet_analyses)
         
@@ -366,13 +539,19 @@ IMPORTANT - 价格感知情感分析指引:
         
         # Create enhanced result with team filtering info
         result = {
+            'token': token_symbol,
+            'total_tweets': len(tweets),
+            'effective_tweets': len(filtered_tweets),
             'tweet_analyses': tweet_analyses,
             'sentiment_summary': sentiment_summary,
             'total_weighted_impact': total_weighted_impact,
             'high_influence_tweets': high_influence_tweets,
             'viral_tweets': viral_tweets,
             'filtering_stats': self.tweet_filter.filtered_counts,
+            'filter_stage_stats': self.tweet_filter.get_stage_stats(),
+            'blocked_category_counts': dict(self.tweet_filter.blocked_category_counts),
             'team_filter_stats': team_filter_stats,
+            'reputation_stats': self._reputation_stats(),
             'price_aware_stats': {
                 'price_data_available': price_success,
                 'price_influenced_count': price_influenced_count,
@@ -394,28 +573,100 @@ IMPORTANT - 价格感知情感分析指引:
         
         return result
 
-    def comprehensive_analysis_silent(self, tweets, token_symbol, target_days):
-        """🆕 Silent version of comprehensive analysis with clean output"""
-        # Step 1: Get price data (silent)
-        self.price_context = self.coinex_api.get_price_context_silent(token_symbol)
-        price_success = self.price_context is not None
+    def analyze_single_tweet(self, parsed_tweet, tweet_num, scores=None):
+        """Sentiment, influence, virality and weighted impact for one filtered tweet (topic left unset)
+        
+        scores: precomputed (influence_data, viral_data), e.g. from calculate_score_dicts_batch
+        """
+        sentiment_result = self.analyze_tweet_sentiment(parsed_tweet['text'])
+        if scores is not None:
+            influence_data, viral_data = scores
+        else:
+            influence_data = self.influence_calculator.calculate_influence_score(parsed_tweet['user'])
+            viral_data = self.influence_calculator.calculate_viral_index(parsed_tweet['metrics'])
+        
+        impact_data = self.influence_calculator.calculate_weighted_sentiment_impact(
+            sentiment_result, 
+            influence_data['influence_score'], 
+            viral_data['viral_index']
+        )
+        
+        return {
+            'tweet_num': tweet_num,
+            'tweet_id': parsed_tweet['tweet_id'],
+            'tweet_link': self.tweet_parser.create_tweet_link(parsed_tweet['tweet_id']),
+            'created_at': parsed_tweet.get('created_at'),
+            'user': parsed_tweet['user']['username'],
+            'text_preview': parsed_tweet['text'][:150] + '...' if len(parsed_tweet['text']) > 150 else parsed_tweet['text'],
+            'sentiment': sentiment_result,
+            'topic': None,  # Assigned once the bulk topics are available
+            'influence': influence_data,
+            'viral': viral_data,
+            'weighted_impact': impact_data,
+            'engagement': parsed_tweet['metrics']
+        }
+    
+    def comprehensive_analysis_silent(self, tweets, token_symbol, target_days, print_report=True,
+                                      progress_callback=None):
+        """🆕 Silent version of comprehensive analysis with clean output
+        
+        The price fetch overlaps tweet filtering, and the AI summary and bulk
+        topics run alongside per-tweet classification; the report only
+        assembles finished results. Callers rendering the result dict
+        themselves pass print_report=False. progress_callback(stage, data)
+        receives partial aggregates as each stage completes.
+        """
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            return self._comprehensive_analysis_silent(executor, tweets, token_symbol, target_days, print_report,
+                                                       progress_callback)
+    
+    @staticmethod
+    def _report_progress(progress_callback, stage, **data):
+        """Forward a progress update, a failing callback never breaks the analysis"""
+        if progress_callback is None:
+            return
+        try:
+            progress_callback(stage, data)
+        except Exception:
+            pass
+    
+    def _comprehensive_analysis_silent(self, executor, tweets, token_symbol, target_days, print_report,
+                                       progress_callback=None):
+        # Step 1: Get price data (silent), in the background while tweets are filtered
+        price_future = executor.submit(self.coinex_api.get_price_context_silent, token_symbol)
         
         # Step 2: Filter tweets (silent) - Use the existing silent TweetFilter
         filtered_tweets, exclusion_reasons = self.tweet_filter.filter_tweets_silent(
             tweets, self.tweet_parser.parse_tweet_data, token_symbol
         )
         
+        # Price-aware classification and the summary prompt both need the price context
+        self.price_context = price_future.result()
+        price_success = self.price_context is not None
+        self._report_progress(progress_callback, 'filtered', total_tweets=len(tweets),
+                              effective_tweets=len(filtered_tweets), price_context=self.price_context)
+        
         if not filtered_tweets:
             # 🆕 Handle case where no tweets remain after filtering
             return None
         
-        # Step 3: Topic analysis (silent)
+        # Step 3: Summary and topic analysis (silent), concurrently with classification
+        parsed_tweets = [self.tweet_parser.parse_tweet_data(tweet) for tweet in filtered_tweets]
         tweets_for_topic_analysis = []
-        for tweet in filtered_tweets:
-            parsed = self.tweet_parser.parse_tweet_data(tweet)
-            tweets_for_topic_analysis.append({'text': parsed['text']})
+        for parsed in parsed_tweets:
+            tweets_for_topic_analysis.append({
+                'text': parsed['text'],
+                'tweet_id': parsed['tweet_id'],
+                'created_at': parsed.get('created_at'),
+                'followers_count': parsed['user']['followers_count'],
+                'engagement': parsed['metrics']['likes'] + parsed['metrics']['retweets'] + parsed['metrics']['replies']
+            })
         
-        self.topic_analyzer.generate_bulk_topic_analysis_with_sentiment(tweets_for_topic_analysis, token_symbol)
+        summary_future = executor.submit(self.generate_openai_summary, tweets_for_topic_analysis, token_symbol)
+        topics_future = executor.submit(
+            self.topic_analyzer.generate_bulk_topic_analysis_with_sentiment, tweets_for_topic_analysis, token_symbol,
+            target_days
+        )
         
         # Step 4: Analyze tweets (silent)
         tweet_analyses = []
@@ -424,57 +675,57 @@ IMPORTANT - 价格感知情感分析指引:
         high_influence_tweets = []
         viral_tweets = []
         price_influenced_count = 0
+        pending_topics = []
+        progress_every = max(1, len(filtered_tweets) // 20)
         
-        for i, tweet in enumerate(filtered_tweets):
+        # Influence and viral scores don't depend on the AI verdicts, score all tweets in one vectorized pass
+        try:
+            batch_scores = self.influence_calculator.calculate_score_dicts_batch(
+                [parsed['user'] for parsed in parsed_tweets], [parsed['metrics'] for parsed in parsed_tweets]
+            )
+        except Exception:
+            batch_scores = [None] * len(parsed_tweets)
+        
+        for i, parsed_tweet in enumerate(parsed_tweets):
             try:
-                parsed_tweet = self.tweet_parser.parse_tweet_data(tweet)
-                
-                sentiment_result = self.analyze_tweet_sentiment(parsed_tweet['text'])
-                influence_data = self.influence_calculator.calculate_influence_score(parsed_tweet['user'])
-                viral_data = self.influence_calculator.calculate_viral_index(parsed_tweet['metrics'])
-                
-                impact_data = self.influence_calculator.calculate_weighted_sentiment_impact(
-                    sentiment_result, 
-                    influence_data['influence_score'], 
-                    viral_data['viral_index']
-                )
+                tweet_analysis = self.analyze_single_tweet(parsed_tweet, i + 1, batch_scores[i])
+                sentiment_result = tweet_analysis['sentiment']
                 
                 sentiment_summary[sentiment_result['sentiment']] += 1
-                total_weighted_impact += impact_data['weighted_impact']
+                total_weighted_impact += tweet_analysis['weighted_impact']['weighted_impact']
                 
                 if sentiment_result.get('price_influenced', False):
                     price_influenced_count += 1
                 
-                tweet_topic = self.topic_analyzer.get_tweet_topic_with_sentiment(
-                    parsed_tweet['text'], 
-                    sentiment_result.get('openai_analysis')
-                )
-                
-                tweet_analysis = {
-                    'tweet_num': i + 1,
-                    'tweet_id': parsed_tweet['tweet_id'],
-                    'user': parsed_tweet['user']['username'],
-                    'text_preview': parsed_tweet['text'][:150] + '...' if len(parsed_tweet['text']) > 150 else parsed_tweet['text'],
-                    'sentiment': sentiment_result,
-                    'topic': tweet_topic,
-                    'influence': influence_data,
-                    'viral': viral_data,
-                    'weighted_impact': impact_data,
-                    'engagement': parsed_tweet['metrics']
-                }
-                
                 tweet_analyses.append(tweet_analysis)
+                pending_topics.append((tweet_analysis, parsed_tweet['tweet_id'], parsed_tweet['text'],
+                                       sentiment_result.get('openai_analysis')))
                 
-                if influence_data['influence_score'] >= 1.0:
+                if tweet_analysis['influence']['influence_score'] >= 1.0:
                     high_influence_tweets.append(tweet_analysis)
                 
-                if viral_data['viral_index'] >= 5.0:
+                if tweet_analysis['viral']['viral_index'] >= 5.0:
                     viral_tweets.append(tweet_analysis)
                     
             except Exception:
                 continue
+            finally:
+                if (i + 1) % progress_every == 0 or i + 1 == len(filtered_tweets):
+                    self._report_progress(progress_callback, 'classifying', done=i + 1, total=len(filtered_tweets),
+                                          sentiment_summary=dict(sentiment_summary),
+                                          viral_tweets=list(viral_tweets[:5]))
+        
+        # Topic fallback matching needs the bulk topics, so assign after the join
+        topics_future.result()
+        for tweet_analysis, tweet_id, text, openai_analysis in pending_topics:
+            tweet_analysis['topic'] = self.topic_analyzer.get_tweet_topic_with_sentiment(text, openai_analysis,
+                                                                                         tweet_id=tweet_id)
+        self._report_progress(progress_callback, 'topics', bulk_topics=list(self.topic_analyzer.bulk_topics))
+        ai_summary = summary_future.result()
+        self._report_progress(progress_callback, 'summary', ai_summary=ai_summary)
         
         # Consolidate stats
+        self.tweet_filter.save_reputation()
         topic_sentiment_analysis = self.topic_analyzer.analyze_topic_sentiment_distribution(tweet_analyses)
         self.total_tokens_used += self.tweet_filter.total_tokens_used
         self.total_tokens_used += self.topic_analyzer.total_tokens_used
@@ -482,13 +733,20 @@ IMPORTANT - 价格感知情感分析指引:
         
         # Create result
         result = {
+            'token': token_symbol,
+            'target_days': target_days,
+            'total_tweets': len(tweets),
+            'effective_tweets': len(filtered_tweets),
             'tweet_analyses': tweet_analyses,
             'sentiment_summary': sentiment_summary,
             'total_weighted_impact': total_weighted_impact,
             'high_influence_tweets': high_influence_tweets,
             'viral_tweets': viral_tweets,
             'filtering_stats': self.tweet_filter.filtered_counts,
+            'filter_stage_stats': self.tweet_filter.get_stage_stats(),
+            'blocked_category_counts': dict(self.tweet_filter.blocked_category_counts),
             'team_filter_stats': team_filter_stats,
+            'reputation_stats': self._reputation_stats(),
             'price_aware_stats': {
                 'price_data_available': price_success,
                 'price_influenced_count': price_influenced_count,
@@ -498,14 +756,16 @@ IMPORTANT - 价格感知情感分析指引:
             'exclusion_reasons': exclusion_reasons,
             'bulk_topics': self.topic_analyzer.bulk_topics,
             'topic_sentiment_analysis': topic_sentiment_analysis,
+            'ai_summary': ai_summary,
             'total_tokens_used': self.total_tokens_used
         }
         
         # 🆕 Generate clean, simplified report
-        self.report_formatter.print_clean_report(
-            token_symbol, len(tweets), len(filtered_tweets), sentiment_summary, 
-            high_influence_tweets, viral_tweets, tweet_analyses, tweets, result,
-            self.generate_openai_summary, tweets_for_topic_analysis, target_days
-        )
+        if print_report:
+            self.report_formatter.print_clean_report(
+                token_symbol, len(tweets), len(filtered_tweets), sentiment_summary, 
+                high_influence_tweets, viral_tweets, tweet_analyses, tweets, result,
+                self.generate_openai_summary, tweets_for_topic_analysis, target_days
+            )
         
         return result
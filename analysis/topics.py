@@ -9,32 +9,247 @@ try:
 except ImportError:
     OPENAI_AVAILABLE = False
 
-from config import ANALYSIS_CONFIG
+import hashlib
+
+from config import (ANALYSIS_CONFIG, TOPIC_KEYWORDS, SPECIFIC_TOPIC_KEYWORDS, TOPIC_CACHE_CONFIG,
+                    TOPIC_CLUSTER_CONFIG, SAMPLING_CONFIG)
 from collections import defaultdict
+from utils.cache_store import JsonFileStore
+from utils.concurrency import service_slot
+from .clustering import StreamingTopicClusterer
+from .rules import KeywordMatcher
+from .sampling import RepresentativeSampler
+
+# Topic lists (LLM, cluster and keyword fallback paths) are capped to the same length
+MAX_BULK_TOPICS = 6
+
+# Sentiment-aware fallback topics, matched before the generic TOPIC_KEYWORDS vocabularies
+FALLBACK_TOPIC_KEYWORDS = {
+    '价格看涨': ['moon', 'pump', 'bullish', '看涨', '上涨', '突破', '牛市', '目标价', 'target'],
+    '价格看跌': ['dump', 'bearish', '看跌', '下跌', '崩盘', '熊市', '抛售', 'crash'],
+    '交易分享-看涨': ['买入', 'buy', 'long', '加仓', '建仓', '持有', 'hold'],
+    '交易分享-看跌': ['卖出', 'sell', 'short', '减仓', '止损', '出货'],
+    '利好消息': ['上币', '上所', '合作', '更新', '发布', 'listing', 'partnership'],
+    '利空消息': ['下架', '暂停', 'delist', '风险', '警告', 'risk'],
+    '社区乐观': ['看好', '潜力', '机会', '推荐', 'gem', 'alpha'],
+    '社区担忧': ['担心', '风险', '小心', '谨慎', 'risky', 'caution'],
+    '技术分析': ['技术', '图表', '分析', 'TA', 'chart', '支撑', '阻力'],
+    '空投福利': ['空投', 'airdrop', '免费', '福利', '赠送']
+}
+
+
+class KeywordTopicEngine:
+    """One keyword automaton over all topic vocabularies, single scan per tweet"""
+    
+    def __init__(self, *vocabularies):
+        vocabularies = vocabularies or (FALLBACK_TOPIC_KEYWORDS, TOPIC_KEYWORDS, SPECIFIC_TOPIC_KEYWORDS)
+        
+        # Same topic name in several vocabularies shares one keyword list
+        self.topic_names = []
+        topic_keywords = {}
+        for vocabulary in vocabularies:
+            for topic, keywords in vocabulary.items():
+                if topic not in topic_keywords:
+                    self.topic_names.append(topic)
+                    topic_keywords[topic] = []
+                topic_keywords[topic].extend(keywords)
+        
+        all_keywords = [keyword for topic in self.topic_names for keyword in topic_keywords[topic]]
+        self.matcher = KeywordMatcher(all_keywords)
+        
+        # keyword id -> topic ids (one keyword, e.g. '风险', can belong to several topics)
+        keyword_index = {keyword: i for i, keyword in enumerate(self.matcher.keywords)}
+        self.keyword_topics = [set() for _ in self.matcher.keywords]
+        for topic_id, topic in enumerate(self.topic_names):
+            for keyword in topic_keywords[topic]:
+                if keyword:
+                    self.keyword_topics[keyword_index[keyword.lower()]].add(topic_id)
+    
+    def topics_for_text(self, text):
+        """Topic names matched by text, in vocabulary order"""
+        topic_ids = set()
+        for keyword_id in self.matcher.find_ids(text):
+            topic_ids |= self.keyword_topics[keyword_id]
+        return [self.topic_names[topic_id] for topic_id in sorted(topic_ids)]
+    
+    def analyze(self, texts):
+        """Per-topic matching tweet indices (0-based) over all texts"""
+        topic_indices = {}
+        for i, text in enumerate(texts):
+            for topic in self.topics_for_text(text or ''):
+                topic_indices.setdefault(topic, []).append(i)
+        return topic_indices
+    
+    def extract_topics(self, texts, max_topics=None, max_tweet_numbers=10):
+        """Topic list in the bulk_topics format, sorted by count"""
+        topic_indices = self.analyze(texts)
+        order = {topic: i for i, topic in enumerate(self.topic_names)}
+        topics = sorted(topic_indices.items(), key=lambda item: (-len(item[1]), order[item[0]]))
+        if max_topics:
+            topics = topics[:max_topics]
+        
+        return [{
+            'name': topic,
+            'count': len(indices),
+            'tweet_numbers': ','.join(str(i + 1) for i in indices[:max_tweet_numbers]),
+            'tweet_indices': indices
+        } for topic, indices in topics]
 
 
 class TopicAnalyzer:
-    def __init__(self, openai_api_key=None):
+    def __init__(self, openai_api_key=None, silent_mode=False):
+        self.silent_mode = silent_mode
         self.openai_client = OpenAI(api_key=openai_api_key) if openai_api_key and OPENAI_AVAILABLE else None
         self.bulk_topics = []
+        self.bulk_topics_token = None
+        self.bulk_topics_from_cache = False
         self.topic_cache = {}
         self.total_tokens_used = 0
         self.topic_sentiment_map = {}  # Store topic-sentiment mapping
+        self.topic_assignments = {}  # tweet_id -> topic name from cluster membership
+        self.keyword_engine = KeywordTopicEngine()
+        self.sampler = RepresentativeSampler(
+            time_buckets=SAMPLING_CONFIG['time_buckets'],
+            use_clusters=SAMPLING_CONFIG['use_clusters'],
+            max_clusters=SAMPLING_CONFIG['max_clusters']
+        ) if SAMPLING_CONFIG['enable_representative_sampling'] else None
+        
+        self.topic_result_cache = None
+        if TOPIC_CACHE_CONFIG['enable_topic_cache']:
+            self.topic_result_cache = JsonFileStore(TOPIC_CACHE_CONFIG['cache_path'],
+                                                    ttl_seconds=TOPIC_CACHE_CONFIG['ttl_hours'] * 3600)
+    
+    def reset_run_state(self):
+        """Clear per-run topic results so a long-lived analyzer can serve the next analysis"""
+        self.bulk_topics = []
+        self.bulk_topics_token = None
+        self.bulk_topics_from_cache = False
+        self.topic_sentiment_map = {}
+        self.topic_assignments = {}
+        self.total_tokens_used = 0
+    
+    @staticmethod
+    def _sample_tweet_ids(sample_tweets):
+        return sorted({str(tweet['tweet_id']) for tweet in sample_tweets
+                       if tweet.get('tweet_id') not in (None, 'N/A', 'ERROR')})
+    
+    @staticmethod
+    def _topic_cache_key(token_symbol, target_days=None, mode=None):
+        # Topics over a 1-day and a 7-day window differ even when the sampled tweets overlap
+        key = f"{token_symbol.upper()}:{target_days or ANALYSIS_CONFIG['target_days']}d"
+        return f"{key}:{mode}" if mode else key
+    
+    @staticmethod
+    def _valid_tweet_id(tweet):
+        tweet_id = tweet.get('tweet_id')
+        return None if tweet_id in (None, 'N/A', 'ERROR') else str(tweet_id)
+    
+    def _topics_to_cache(self, topics, tweets):
+        """Topics with tweet positions replaced by tweet ids, which stay valid across re-fetched samples"""
+        cached_topics = []
+        for topic in topics:
+            cached_topic = {key: value for key, value in topic.items() if key not in ('tweet_numbers', 'tweet_indices')}
+            cached_topic['tweet_ids'] = [tweet_id for tweet_id in (self._valid_tweet_id(tweets[i])
+                                                                   for i in topic.get('tweet_indices', []))
+                                         if tweet_id]
+            cached_topics.append(cached_topic)
+        return cached_topics
+    
+    def _topics_from_cache(self, cached_topics, tweets):
+        """Cached topics with tweet_indices/tweet_numbers mapped onto the current tweets"""
+        positions = {}
+        for i, tweet in enumerate(tweets):
+            tweet_id = self._valid_tweet_id(tweet)
+            if tweet_id:
+                positions.setdefault(tweet_id, i)
+        
+        topics = []
+        for cached_topic in cached_topics:
+            indices = sorted(positions[tweet_id] for tweet_id in cached_topic['tweet_ids'] if tweet_id in positions)
+            topic = {key: value for key, value in cached_topic.items() if key != 'tweet_ids'}
+            topic['tweet_numbers'] = ','.join(str(i + 1) for i in indices[:10])
+            topic['tweet_indices'] = indices
+            topics.append(topic)
+        return topics
+    
+    def _get_cached_topics(self, token_symbol, tweet_ids, tweets, target_days=None, mode=None):
+        """Cached topic entry for the token if enough of the sampled tweets are unchanged
+        
+        The entry's topics are mapped onto positions in tweets (the analysis' tweet list).
+        """
+        if self.topic_result_cache is None or not tweet_ids:
+            return None
+        
+        entry = self.topic_result_cache.get(self._topic_cache_key(token_symbol, target_days, mode))
+        # Entries from before topics were stored by tweet id cannot be mapped onto this sample
+        if not entry or not all('tweet_ids' in topic for topic in entry['topics']):
+            return None
+        
+        fingerprint = hashlib.sha256(','.join(tweet_ids).encode('utf-8')).hexdigest()
+        overlap = len(set(tweet_ids) & set(entry['tweet_ids'])) / len(tweet_ids)
+        if entry['fingerprint'] != fingerprint and overlap < TOPIC_CACHE_CONFIG['min_overlap_ratio']:
+            return None
+        return dict(entry, topics=self._topics_from_cache(entry['topics'], tweets))
+    
+    def _store_cached_topics(self, token_symbol, tweet_ids, topics, tweets, target_days=None, mode=None,
+                             assignments=None):
+        if self.topic_result_cache is None or not tweet_ids:
+            return
+        
+        self.topic_result_cache.set(self._topic_cache_key(token_symbol, target_days, mode), {
+            'fingerprint': hashlib.sha256(','.join(tweet_ids).encode('utf-8')).hexdigest(),
+            'tweet_ids': tweet_ids,
+            'topics': self._topics_to_cache(topics, tweets),
+            'assignments': assignments or {}
+        })
+        try:
+            self.topic_result_cache.save()
+        except OSError as e:
+            if not self.silent_mode:
+                print(f"⚠️ 无法保存话题缓存: {e}")
     
-    def generate_bulk_topic_analysis_with_sentiment(self, tweets_sample, token_symbol):
+    def generate_bulk_topic_analysis_with_sentiment(self, tweets_sample, token_symbol, target_days=None):
         """Generate bulk topic analysis with sentiment - enhanced categorization"""
-        if self.bulk_topics:  # Skip if already done
+        if self.bulk_topics and self.bulk_topics_token == token_symbol:  # Skip if already done for this token
             return self.bulk_topics
         
+        self.bulk_topics_token = token_symbol
+        self.bulk_topics_from_cache = False
+        self.topic_assignments = {}
+        
+        if ANALYSIS_CONFIG['fast_topic_mode']:
+            self.bulk_topics = self._extract_fallback_topics_with_sentiment(tweets_sample)
+            return self.bulk_topics
+        
+        if TOPIC_CLUSTER_CONFIG['enable_clustering']:
+            self.bulk_topics, self.topic_assignments = self.generate_cluster_topics(tweets_sample, token_symbol,
+                                                                                    target_days)
+            if self.bulk_topics:
+                return self.bulk_topics
+        
         if not self.openai_client:
-            print("   💡 OpenAI不可用，使用关键词匹配获取具体话题...")
+            if not self.silent_mode:
+                print("   💡 OpenAI不可用，使用关键词匹配获取具体话题...")
             self.bulk_topics = self._extract_fallback_topics_with_sentiment(tweets_sample)
             return self.bulk_topics
         
         try:
             # Limit to avoid token limits
             max_tweets = ANALYSIS_CONFIG['max_tweets_for_topic_analysis']
-            sample_tweets = tweets_sample[:max_tweets] if len(tweets_sample) > max_tweets else tweets_sample
+            if self.sampler:
+                sample_indices = self.sampler.sample_indices(tweets_sample, max_tweets)
+            else:
+                sample_indices = list(range(min(len(tweets_sample), max_tweets)))
+            sample_tweets = [tweets_sample[i] for i in sample_indices]
+            
+            # Refresh runs over a mostly unchanged sample reuse the previous topics
+            tweet_ids = self._sample_tweet_ids(sample_tweets)
+            cached = self._get_cached_topics(token_symbol, tweet_ids, tweets_sample, target_days)
+            if cached:
+                self.bulk_topics = cached['topics']
+                self.bulk_topics_from_cache = True
+                return self.bulk_topics
+            
             tweets_text = "\n".join([f"{i+1}. {tweet['text'][:150]}..." if len(tweet['text']) > 150 else f"{i+1}. {tweet['text']}" 
                                    for i, tweet in enumerate(sample_tweets)])
             
@@ -86,12 +301,13 @@ class TopicAnalyzer:
             话题3: 利好消息 - 8,9
             """
             
-            response = self.openai_client.chat.completions.create(
-                model=ANALYSIS_CONFIG['openai_model'],
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=300,
-                temperature=0.2
-            )
+            with service_slot('openai'):
+                response = self.openai_client.chat.completions.create(
+                    model=ANALYSIS_CONFIG['openai_model'],
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=300,
+                    temperature=0.2
+                )
             
             # Track token usage
             if hasattr(response, 'usage'):
@@ -125,17 +341,23 @@ class TopicAnalyzer:
                                 tweet_count = len([x.strip() for x in tweet_numbers_str.split(',') if x.strip()])
                                 
                                 if tweet_count >= 1:  # At least 1 tweet
+                                    # Prompt numbers refer to the sample, map them to positions in tweets_sample
+                                    tweet_indices = sorted({sample_indices[int(x) - 1] for x in tweet_numbers_str.split(',')
+                                                            if x.strip().isdigit()
+                                                            and 1 <= int(x) <= len(sample_indices)})
                                     topics.append({
                                         'name': topic_name,
                                         'count': tweet_count,
-                                        'tweet_numbers': tweet_numbers_str
+                                        'tweet_numbers': ','.join(str(i + 1) for i in tweet_indices),
+                                        'tweet_indices': tweet_indices
                                     })
                     except:
                         continue
             
             # If we still don't have enough topics, add fallback
             if len(topics) < 3:
-                print("   💡 AI返回话题不足，使用关键词匹配补充...")
+                if not self.silent_mode:
+                    print("   💡 AI返回话题不足，使用关键词匹配补充...")
                 fallback_topics = self._extract_fallback_topics_with_sentiment(tweets_sample)
                 existing_names = {t['name'] for t in topics}
                 for fallback_topic in fallback_topics:
@@ -143,52 +365,143 @@ class TopicAnalyzer:
                         topics.append(fallback_topic)
             
             # Sort by count and return top topics
-            self.bulk_topics = sorted(topics, key=lambda x: x['count'], reverse=True)[:6]
+            self.bulk_topics = sorted(topics, key=lambda x: x['count'], reverse=True)[:MAX_BULK_TOPICS]
+            self._store_cached_topics(token_symbol, tweet_ids, self.bulk_topics, tweets_sample, target_days)
             return self.bulk_topics
             
         except Exception as e:
-            print(f"OpenAI话题分析错误: {e}")
+            if not self.silent_mode:
+                print(f"OpenAI话题分析错误: {e}")
             self.bulk_topics = self._extract_fallback_topics_with_sentiment(tweets_sample)
             return self.bulk_topics
     
-    def _extract_fallback_topics_with_sentiment(self, tweets_sample):
-        """Extract topics with sentiment using keyword matching as fallback"""
-        topic_keywords = {
-            '价格看涨': ['moon', 'pump', 'bullish', '看涨', '上涨', '突破', '牛市', '目标价', 'target'],
-            '价格看跌': ['dump', 'bearish', '看跌', '下跌', '崩盘', '熊市', '抛售', 'crash'],
-            '交易分享-看涨': ['买入', 'buy', 'long', '加仓', '建仓', '持有', 'hold'],
-            '交易分享-看跌': ['卖出', 'sell', 'short', '减仓', '止损', '出货'],
-            '利好消息': ['上币', '上所', '合作', '更新', '发布', 'listing', 'partnership'],
-            '利空消息': ['下架', '暂停', 'delist', '风险', '警告', 'risk'],
-            '社区乐观': ['看好', '潜力', '机会', '推荐', 'gem', 'alpha'],
-            '社区担忧': ['担心', '风险', '小心', '谨慎', 'risky', 'caution'],
-            '技术分析': ['技术', '图表', '分析', 'TA', 'chart', '支撑', '阻力'],
-            '空投福利': ['空投', 'airdrop', '免费', '福利', '赠送']
-        }
+    def generate_cluster_topics(self, tweets_sample, token_symbol, target_days=None):
+        """Cluster every tweet locally and only send cluster exemplars to the LLM for naming
+        
+        Returns (topics, assignments), assignments mapping each clustered tweet_id to its topic name.
+        """
+        tweet_ids = self._sample_tweet_ids(tweets_sample)
+        cached = self._get_cached_topics(token_symbol, tweet_ids, tweets_sample, target_days, mode='clusters')
+        if cached:
+            self.bulk_topics_from_cache = True
+            return cached['topics'], cached.get('assignments', {})
         
-        fallback_topics = []
+        clusterer = StreamingTopicClusterer(
+            n_features=TOPIC_CLUSTER_CONFIG['n_features'],
+            max_clusters=TOPIC_CLUSTER_CONFIG['max_clusters'],
+            similarity_threshold=TOPIC_CLUSTER_CONFIG['similarity_threshold'],
+            exemplar_pool_size=TOPIC_CLUSTER_CONFIG['exemplar_pool_size']
+        )
+        clusterer.add_many(tweet.get('text', '') for tweet in tweets_sample)
+        clusters = clusterer.get_clusters(min_size=TOPIC_CLUSTER_CONFIG['min_cluster_size'],
+                                          exemplars_per_cluster=TOPIC_CLUSTER_CONFIG['exemplars_per_cluster'])[:MAX_BULK_TOPICS]
+        if not clusters:
+            return [], {}
+        
+        names = self._name_clusters(clusters, token_symbol)
+        topics = []
+        for cluster, name in zip(clusters, names):
+            topics.append({
+                'name': name,
+                'count': cluster['size'],
+                'tweet_numbers': ','.join(str(i + 1) for i in cluster['members'][:10]),
+                'tweet_indices': cluster['members']
+            })
+        
+        # Clusters given the same name by the LLM are merged
+        merged = {}
+        for topic in topics:
+            if topic['name'] in merged:
+                existing = merged[topic['name']]
+                existing['count'] += topic['count']
+                existing['tweet_indices'] = sorted(existing['tweet_indices'] + topic['tweet_indices'])
+                existing['tweet_numbers'] = ','.join(str(i + 1) for i in existing['tweet_indices'][:10])
+            else:
+                merged[topic['name']] = topic
+        topics = sorted(merged.values(), key=lambda x: x['count'], reverse=True)
+        
+        assignments = {}
+        for topic in topics:
+            for index in topic['tweet_indices']:
+                tweet_id = tweets_sample[index].get('tweet_id')
+                if tweet_id not in (None, 'N/A', 'ERROR'):
+                    assignments[str(tweet_id)] = topic['name']
+        
+        self._store_cached_topics(token_symbol, tweet_ids, topics, tweets_sample, target_days, mode='clusters',
+                                  assignments=assignments)
+        return topics, assignments
+    
+    def _keyword_cluster_name(self, cluster, index):
+        """Most common keyword topic among a cluster's exemplars, or a numbered placeholder"""
+        topic_counts = defaultdict(int)
+        for _, text in cluster['exemplars']:
+            for topic in self.keyword_engine.topics_for_text(text):
+                topic_counts[topic] += 1
+        if topic_counts:
+            return max(topic_counts.items(), key=lambda item: item[1])[0]
+        return f"话题{index + 1}"
+    
+    def _name_clusters(self, clusters, token_symbol):
+        """Name clusters from their exemplars with one short LLM call (keyword names as fallback)"""
+        names = [self._keyword_cluster_name(cluster, i) for i, cluster in enumerate(clusters)]
+        if not self.openai_client:
+            return names
         
-        for topic, keywords in topic_keywords.items():
-            count = 0
-            tweet_numbers = []
+        blocks = []
+        for i, cluster in enumerate(clusters):
+            exemplar_lines = "\n".join(f"   - {text[:150]}" for _, text in cluster['exemplars'])
+            blocks.append(f"簇{i+1} ({cluster['size']}条推文):\n{exemplar_lines}")
+        clusters_text = "\n".join(blocks)
+        
+        prompt = f"""
+            以下是关于{token_symbol}的推文聚类，每个簇列出了几条代表性推文。请为每个簇起一个带情感方向的话题名称（不超过8个字，简体中文），如"价格看涨"、"交易分享-看跌"、"利好消息"。
             
-            for i, tweet in enumerate(tweets_sample[:15]):
-                tweet_text = tweet.get('text', '').lower()
-                if any(keyword.lower() in tweet_text for keyword in keywords):
-                    count += 1
-                    tweet_numbers.append(str(i + 1))
+            {clusters_text}
             
-            if count > 0:
-                fallback_topics.append({
-                    'name': topic,
-                    'count': count,
-                    'tweet_numbers': ','.join(tweet_numbers[:min(count, 10)])
-                })
+            请按以下格式输出，每个簇一行：
+            簇1: 话题名称
+            簇2: 话题名称
+            """
         
-        return fallback_topics
+        try:
+            with service_slot('openai'):
+                response = self.openai_client.chat.completions.create(
+                    model=ANALYSIS_CONFIG['openai_model'],
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=20 * len(clusters) + 20,
+                    temperature=0.2
+                )
+            
+            if hasattr(response, 'usage'):
+                self.total_tokens_used += response.usage.total_tokens
+            
+            for line in response.choices[0].message.content.strip().split('\n'):
+                line = line.strip().replace('：', ':')
+                if not line.startswith('簇') or ':' not in line:
+                    continue
+                number, name = line[1:].split(':', 1)
+                name = name.strip().strip('[]"').strip()
+                if number.strip().isdigit() and name and len(name) <= 12:
+                    index = int(number.strip()) - 1
+                    if 0 <= index < len(names):
+                        names[index] = name
+        except Exception as e:
+            if not self.silent_mode:
+                print(f"OpenAI话题聚类命名错误: {e}")
+        
+        return names
+    
+    def _extract_fallback_topics_with_sentiment(self, tweets_sample):
+        """Extract topics with sentiment using keyword matching over every tweet"""
+        return self.keyword_engine.extract_topics([tweet.get('text', '') for tweet in tweets_sample],
+                                                  max_topics=MAX_BULK_TOPICS)
     
-    def get_tweet_topic_with_sentiment(self, tweet_text, combined_result=None):
+    def get_tweet_topic_with_sentiment(self, tweet_text, combined_result=None, tweet_id=None):
         """Get specific topic with sentiment from combined analysis"""
+        # Clustered tweets keep the topic of their cluster, so per-tweet topics match the bulk topics
+        if tweet_id is not None and str(tweet_id) in self.topic_assignments:
+            return self.topic_assignments[str(tweet_id)]
+        
         # First try to use combined analysis result
         if combined_result and combined_result.get('topic'):
             topic = combined_result['topic']
@@ -215,6 +528,12 @@ class TopicAnalyzer:
                 topic_keywords = topic_name.replace('-', ' ').split()
                 if any(keyword in tweet_lower for keyword in topic_keywords if len(keyword) > 2):
                     return topic['name']
+            
+            # Then by keyword vocabulary, most discussed bulk topic first
+            matched = set(self.keyword_engine.topics_for_text(tweet_text))
+            for topic in self.bulk_topics:
+                if topic['name'] in matched:
+                    return topic['name']
         
         return "未分类"
     
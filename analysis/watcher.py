@@ -0,0 +1,214 @@
+# analysis/watcher.py
+"""
+Watchlist refresher: incremental fetch, classify only unseen tweets, rolling aggregates
+"""
+
+import time
+from datetime import datetime
+
+from utils.cache_store import JsonFileStore
+from .sampling import parse_created_at
+
+SENTIMENT_KEYS = ('POSITIVE', 'NEUTRAL', 'NEGATIVE')
+
+# Seen ids outlive the window by the day-granular search overlap, so old tweets are never re-classified
+SEEN_MARGIN_SECONDS = 2 * 86400
+
+
+def _empty_aggregates():
+    return {
+        'sentiment_summary': {key: 0 for key in SENTIMENT_KEYS},
+        'total_weighted_impact': 0.0,
+        'effective_tweets': 0,
+        'price_influenced_count': 0,
+        'high_influence_count': 0,
+        'viral_count': 0,
+        'seen_tweets': 0
+    }
+
+
+class TokenWatcher:
+    """Keeps per-token sentiment aggregates over a rolling window up to date
+
+    Each refresh asks the source only for tweets not seen before, runs the
+    filter and classifier on those alone, adds them to the aggregates and
+    subtracts tweets that fell out of the window. State (seen ids, compact
+    per-tweet records, aggregates, schedule) is persisted after every
+    refresh, so a restart resumes without re-fetching or re-classifying.
+    """
+
+    def __init__(self, analyzer, source, state_path='data/cache/watch_state.json', window_days=7,
+                 initial_max_pages=6, refresh_max_pages=2, default_interval_seconds=1800):
+        self.analyzer = analyzer
+        self.source = source
+        self.window_seconds = window_days * 86400
+        self.initial_max_pages = initial_max_pages
+        self.refresh_max_pages = refresh_max_pages
+        self.default_interval_seconds = default_interval_seconds
+        self.store = JsonFileStore(state_path)
+        # Only tokens added in this process are refreshed; state of unlisted tokens is kept for later
+        self._watched = []
+
+    def add_token(self, token_symbol, interval_seconds=None):
+        """Watch a token (keeps existing state, updates the interval)"""
+        token_symbol = token_symbol.upper()
+        state = self.store.get(token_symbol) or {
+            'token': token_symbol,
+            'last_refresh_at': None,
+            'next_refresh_at': 0,
+            'refresh_count': 0,
+            'seen': {},
+            'tweets': {},
+            'aggregates': _empty_aggregates(),
+            'price_context': None,
+            'total_tokens_used': 0,
+            'last_refresh': None
+        }
+        state['interval_seconds'] = interval_seconds or self.default_interval_seconds
+        self.store.set(token_symbol, state)
+        self.store.save()
+        if token_symbol not in self._watched:
+            self._watched.append(token_symbol)
+
+    def tokens(self):
+        """Tokens on the current watchlist (added via add_token)"""
+        return list(self._watched)
+
+    def due_tokens(self, now=None):
+        now = now or time.time()
+        return sorted((token for token in self._watched if self.store.get(token)['next_refresh_at'] <= now),
+                      key=lambda token: self.store.get(token)['next_refresh_at'])
+
+    def seconds_until_next(self, now=None):
+        now = now or time.time()
+        next_times = [self.store.get(token)['next_refresh_at'] for token in self._watched]
+        return max(0.0, min(next_times) - now) if next_times else None
+
+    @staticmethod
+    def _compact(tweet_analysis, created_ts):
+        sentiment = tweet_analysis['sentiment']
+        return {
+            'created_ts': created_ts,
+            'user': tweet_analysis['user'],
+            'tweet_link': tweet_analysis['tweet_link'],
+            'text_preview': tweet_analysis['text_preview'],
+            'sentiment': sentiment['sentiment'],
+            'confidence': sentiment.get('confidence'),
+            'price_influenced': bool(sentiment.get('price_influenced', False)),
+            'influence_score': tweet_analysis['influence']['influence_score'],
+            'viral_index': tweet_analysis['viral']['viral_index'],
+            'weighted_impact': tweet_analysis['weighted_impact']['weighted_impact']
+        }
+
+    @staticmethod
+    def _apply(aggregates, record, sign):
+        """Add (sign=1) or remove (sign=-1) one tweet record from the aggregates"""
+        aggregates['sentiment_summary'][record['sentiment']] += sign
+        aggregates['total_weighted_impact'] += sign * record['weighted_impact']
+        aggregates['effective_tweets'] += sign
+        aggregates['price_influenced_count'] += sign * record['price_influenced']
+        aggregates['high_influence_count'] += sign * (record['influence_score'] >= 1.0)
+        aggregates['viral_count'] += sign * (record['viral_index'] >= 5.0)
+
+    def _expire(self, state, now):
+        cutoff = now - self.window_seconds
+        for tweet_id in [tweet_id for tweet_id, record in state['tweets'].items() if record['created_ts'] < cutoff]:
+            self._apply(state['aggregates'], state['tweets'].pop(tweet_id), -1)
+        seen_cutoff = cutoff - SEEN_MARGIN_SECONDS
+        state['seen'] = {tweet_id: seen_ts for tweet_id, seen_ts in state['seen'].items() if seen_ts >= seen_cutoff}
+
+    def _since_date(self, state, now):
+        if state['last_refresh_at'] is None:
+            since = now - self.window_seconds
+        else:
+            # The search API filters by day; seen ids drop the overlap
+            since = max(now - self.window_seconds, state['last_refresh_at'] - 86400)
+        return datetime.fromtimestamp(since).strftime('%Y-%m-%d')
+
+    def refresh(self, token_symbol, now=None):
+        """Fetch, classify and fold in the token's new tweets, returns a refresh summary"""
+        token_symbol = token_symbol.upper()
+        state = self.store.get(token_symbol)
+        if state is None:
+            raise KeyError(f"Token not on the watchlist: {token_symbol}")
+
+        # Fixture replays run on the recording's clock, otherwise old fixtures fall outside the window
+        now = now or self.source.current_time(token_symbol)
+        started = time.time()
+        analyzer = self.analyzer
+        analyzer.reset_run_state()
+
+        max_pages = self.initial_max_pages if state['last_refresh_at'] is None else self.refresh_max_pages
+        new_tweets = self.source.fetch_new_tweets(token_symbol, self._since_date(state, now), state['seen'],
+                                                  max_pages)
+        state['price_context'] = self.source.get_price_context(token_symbol)
+        analyzer.price_context = state['price_context']
+
+        parser = analyzer.tweet_parser
+        cutoff = now - self.window_seconds
+        created = {}
+        in_window = []
+        for tweet in new_tweets:
+            parsed = parser.parse_tweet_data(tweet)
+            tweet_id = str(parsed['tweet_id'])
+            state['seen'][tweet_id] = now
+            created[tweet_id] = parse_created_at(parsed.get('created_at')) or now
+            if created[tweet_id] >= cutoff:
+                in_window.append(tweet)
+
+        classified = 0
+        if in_window:
+            filtered_tweets, _ = analyzer.tweet_filter.filter_tweets_silent(in_window, parser.parse_tweet_data,
+                                                                            token_symbol)
+            for tweet in filtered_tweets:
+                try:
+                    parsed = parser.parse_tweet_data(tweet)
+                    tweet_id = str(parsed['tweet_id'])
+                    if tweet_id in state['tweets']:
+                        continue
+                    tweet_analysis = analyzer.analyze_single_tweet(parsed, len(state['tweets']) + 1)
+                except Exception:
+                    continue
+                record = self._compact(tweet_analysis, created[tweet_id])
+                state['tweets'][tweet_id] = record
+                self._apply(state['aggregates'], record, 1)
+                classified += 1
+            analyzer.tweet_filter.save_reputation()
+
+        self._expire(state, now)
+        aggregates = state['aggregates']
+        aggregates['seen_tweets'] = len(state['seen'])
+
+        tokens_used = analyzer.total_tokens_used + analyzer.tweet_filter.total_tokens_used
+        state['total_tokens_used'] += tokens_used
+        state['refresh_count'] += 1
+        state['last_refresh_at'] = now
+        state['next_refresh_at'] = now + state['interval_seconds']
+        state['last_refresh'] = {
+            'new_tweets': len(new_tweets),
+            'classified': classified,
+            'tokens_used': tokens_used,
+            'duration_seconds': round(time.time() - started, 2)
+        }
+
+        self.store.set(token_symbol, state)
+        self.store.save()
+        return dict(state['last_refresh'], token=token_symbol, aggregates=aggregates)
+
+    def get_snapshot(self, token_symbol, top_n=5):
+        """Current aggregates plus the most viral / influential tweets in the window"""
+        state = self.store.get(token_symbol.upper())
+        if state is None:
+            return None
+        records = list(state['tweets'].values())
+        return {
+            'token': state['token'],
+            'window_days': self.window_seconds / 86400,
+            'last_refresh_at': state['last_refresh_at'],
+            'refresh_count': state['refresh_count'],
+            'aggregates': state['aggregates'],
+            'price_context': state['price_context'],
+            'total_tokens_used': state['total_tokens_used'],
+            'top_viral': sorted(records, key=lambda record: record['viral_index'], reverse=True)[:top_n],
+            'top_influence': sorted(records, key=lambda record: record['influence_score'], reverse=True)[:top_n]
+        }
@@ -5,6 +5,7 @@ CoinEx API integration for fetching price data
 
 import requests
 from config import COINEX_API_URL
+from utils.concurrency import service_slot
 
 
 class CoinExAPI:
@@ -15,7 +16,8 @@ class CoinExAPI:
         """Get price context from CoinEx API"""
         try:
             url = f"{self.base_url}/{token_symbol.upper()}"
-            response = requests.get(url, timeout=10)
+            with service_slot('coinex'):
+                response = requests.get(url, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -88,7 +90,8 @@ class CoinExAPI:
         """Silent version of get_price_context"""
         try:
             url = f"{self.base_url}/{token_symbol.upper()}"
-            response = requests.get(url, timeout=10)
+            with service_slot('coinex'):
+                response = requests.get(url, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -0,0 +1,112 @@
+# api/fixtures.py
+"""
+Tweet/price sources for the watch daemon: live APIs (optionally recorded) or replayed fixtures
+"""
+
+import json
+import os
+import re
+import threading
+import time
+
+from .twitter_api import TwitterAPI
+from .coinex_api import CoinExAPI
+
+
+def fixture_path(fixtures_dir, token_symbol):
+    token = re.sub(r'[^A-Z0-9_-]', '_', token_symbol.upper())
+    return os.path.join(fixtures_dir, f"{token}.jsonl")
+
+
+class LiveTweetSource:
+    """Fetches from RapidAPI/CoinEx; with record_dir every response is appended as a fixture"""
+
+    def __init__(self, twitter_api=None, coinex_api=None, record_dir=None):
+        self.twitter_api = twitter_api or TwitterAPI()
+        self.coinex_api = coinex_api or CoinExAPI()
+        self.record_dir = record_dir
+        self._record_lock = threading.Lock()
+
+    def current_time(self, token_symbol):
+        return time.time()
+
+    def _record(self, token_symbol, record):
+        if not self.record_dir:
+            return
+        record['recorded_at'] = time.time()
+        with self._record_lock:
+            os.makedirs(self.record_dir, exist_ok=True)
+            with open(fixture_path(self.record_dir, token_symbol), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def fetch_new_tweets(self, token_symbol, since_date, seen_ids, max_pages):
+        querystring = self.twitter_api.create_smart_querystring_silent(token_symbol, additional_filters={})
+        tweets = self.twitter_api.get_new_tweets_silent(querystring, since_date, seen_ids, max_pages)
+        self._record(token_symbol, {'kind': 'tweets', 'tweets': tweets})
+        return tweets
+
+    def get_price_context(self, token_symbol):
+        price_context = self.coinex_api.get_price_context_silent(token_symbol)
+        self._record(token_symbol, {'kind': 'price', 'price_context': price_context})
+        return price_context
+
+
+class FixtureTweetSource:
+    """Replays recorded fixtures offline, one recorded tweet batch per refresh
+
+    Fixture files are JSON lines per token ({"kind": "tweets", "tweets": [...]}
+    or {"kind": "price", "price_context": {...}}), as written by
+    LiveTweetSource(record_dir=...). Once a token's batches are used up,
+    refreshes return no new tweets. current_time() is the recording time
+    of the batch being replayed, so window cutoffs match the recording.
+    """
+
+    def __init__(self, fixtures_dir):
+        self.fixtures_dir = fixtures_dir
+        self._records = {}
+        self._cursors = {}
+        self._prices = {}
+        self._clock = {}
+
+    def _load(self, token_symbol):
+        if token_symbol not in self._records:
+            records = []
+            path = fixture_path(self.fixtures_dir, token_symbol)
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    records = [json.loads(line) for line in f if line.strip()]
+            self._records[token_symbol] = records
+            self._cursors[token_symbol] = 0
+        return self._records[token_symbol]
+
+    def _advance_prices(self, token_symbol):
+        """Consume price records up to the next tweet batch"""
+        records = self._load(token_symbol)
+        cursor = self._cursors[token_symbol]
+        while cursor < len(records) and records[cursor].get('kind') == 'price':
+            self._prices[token_symbol] = records[cursor].get('price_context')
+            cursor += 1
+        self._cursors[token_symbol] = cursor
+
+    def current_time(self, token_symbol):
+        """recorded_at of the next tweet batch (the last one once exhausted), wall clock if unrecorded"""
+        self._advance_prices(token_symbol)
+        records = self._records[token_symbol]
+        cursor = self._cursors[token_symbol]
+        if cursor < len(records) and records[cursor].get('recorded_at'):
+            self._clock[token_symbol] = records[cursor]['recorded_at']
+        return self._clock.get(token_symbol) or time.time()
+
+    def fetch_new_tweets(self, token_symbol, since_date, seen_ids, max_pages):
+        self._advance_prices(token_symbol)
+        records = self._records[token_symbol]
+        cursor = self._cursors[token_symbol]
+        if cursor >= len(records):
+            return []
+        self._cursors[token_symbol] = cursor + 1
+        return [tweet for tweet in records[cursor].get('tweets', [])
+                if TwitterAPI.extract_tweet_id(tweet) not in seen_ids]
+
+    def get_price_context(self, token_symbol):
+        self._advance_prices(token_symbol)
+        return self._prices.get(token_symbol)
@@ -9,6 +9,7 @@ import time
 import re
 from datetime import datetime, timedelta
 from config import TWITTER_API_CONFIG
+from utils.concurrency import service_slot
 
 
 class TwitterAPI:
@@ -96,7 +97,8 @@ class TwitterAPI:
                 "since": (datetime.now() - timedelta(days=test_days)).strftime("%Y-%m-%d")
             }
             
-            response = requests.get(self.url, headers=self.headers, params=test_querystring, timeout=10)
+            with service_slot('rapidapi'):
+                response = requests.get(self.url, headers=self.headers, params=test_querystring, timeout=10)
             
             if response.status_code == 200:
                 response_data = response.json()
@@ -218,7 +220,8 @@ class TwitterAPI:
 
         for page in range(max_pages):
             try:
-                response = requests.get(self.url, headers=self.headers, params=current_querystring)
+                with service_slot('rapidapi'):
+                    response = requests.get(self.url, headers=self.headers, params=current_querystring)
 
                 if response.status_code != 200:
                     print(f"   ❌ API请求失败: {response.status_code}")
@@ -265,7 +268,8 @@ class TwitterAPI:
 
         for page in range(max_pages):
             try:
-                response = requests.get(self.url, headers=self.headers, params=current_querystring)
+                with service_slot('rapidapi'):
+                    response = requests.get(self.url, headers=self.headers, params=current_querystring)
 
                 if response.status_code != 200:
                     break
@@ -457,6 +461,58 @@ class TwitterAPI:
         
         return all_tweets
 
+    @staticmethod
+    def extract_tweet_id(tweet):
+        """Tweet ID of a raw tweet (same value the parser and exclusion logs use)"""
+        return tweet.get('legacy', {}).get('id_str') or tweet.get('rest_id') or tweet.get('id_str')
+
+    def get_new_tweets_silent(self, querystring_template, since_date, seen_ids, max_pages=3):
+        """Newest-first tweets since since_date that are not in seen_ids
+
+        Pages are requested from the Latest timeline and paging stops at the
+        first page containing an already seen tweet, so a refresh costs one
+        request when little has changed.
+        """
+        querystring = querystring_template.copy()
+        querystring['product'] = 'Latest'
+        querystring['since'] = since_date
+        querystring['apiKey'] = self.api_key
+
+        new_tweets = []
+        new_ids = set()
+        for page in range(max_pages):
+            try:
+                with service_slot('rapidapi'):
+                    response = requests.get(self.url, headers=self.headers, params=querystring, timeout=30)
+                if response.status_code != 200:
+                    break
+
+                response_data = response.json()
+                page_tweets = self.extract_tweets_from_response(response_data, verbose=False)
+                if not page_tweets:
+                    break
+
+                reached_seen = False
+                for tweet in page_tweets:
+                    tweet_id = self.extract_tweet_id(tweet)
+                    if tweet_id in seen_ids:
+                        reached_seen = True
+                    elif tweet_id and tweet_id not in new_ids:
+                        new_ids.add(tweet_id)
+                        new_tweets.append(tweet)
+                if reached_seen:
+                    break
+
+                cursors = self.extract_cursors_from_response(response_data)
+                if 'bottom' not in cursors:
+                    break
+                querystring['cursor'] = cursors['bottom']
+
+            except Exception:
+                break
+
+        return new_tweets
+
     def create_smart_querystring(self, token_symbol, additional_filters=None):
         """Create querystring with simplified smart search pattern detection"""
         # Find the optimal search pattern
@@ -48,6 +48,8 @@ ANALYSIS_CONFIG = {
     'max_pages_per_call': 3,
     'max_tweets_for_summary': 15,
     'max_tweets_for_topic_analysis': 20,
+    'ai_filter_batch_size': 10,  # Tweets per batched AI filter request
+    'fast_topic_mode': False,  # Keyword-only topics over all tweets, no bulk topic LLM call
     'openai_model': "gpt-4.1-nano"
 }
 
@@ -62,12 +64,132 @@ SMART_SEARCH_CONFIG = {
 # Team Filtering Configuration
 TEAM_FILTER_CONFIG = {
     'excel_file_path': 'data/project_twitter.xlsx',
+    'enable_snapshot': True,  # Binary snapshot of the Excel data, skips pandas on warm starts
+    'snapshot_path': 'data/cache/project_twitter.snapshot',
+    'auto_reload': False,  # Watch the Excel file and hot-swap team data (long-lived processes)
+    'reload_interval_seconds': 30,
     'enable_team_filtering': True,
+    'exclude_cross_project_team': False,  # Also exclude team members of other listed projects (else only flagged)
     'case_sensitive': False,
     'show_filtered_teams': True,
     'show_team_accounts_debug': False
 }
 
+# Filter stage instrumentation / ordering
+FILTER_STAGE_CONFIG = {
+    'adaptive_stage_order': False,      # Order news/team/spam stages by measured cost-per-reject
+    'min_calls_before_reorder': 50      # Calls every stage needs before reordering kicks in
+}
+
+# Author reputation store (skips AI filter calls for authors with a conclusive history)
+AUTHOR_REPUTATION_CONFIG = {
+    'enable_reputation': True,
+    'store_path': 'data/cache/author_reputation.json',
+    'min_verdicts': 3,          # Decayed verdict count required before trusting history
+    'conclusive_ratio': 0.9,    # Share of one verdict required to skip the AI filter
+    'half_life_days': 14,
+    'ttl_days': 30,
+    'influence_ttl_hours': 24
+}
+
+# Per-token bulk topic cache (reused when most of the sampled tweets are unchanged)
+TOPIC_CACHE_CONFIG = {
+    'enable_topic_cache': True,
+    'cache_path': 'data/cache/topic_cache.json',
+    'min_overlap_ratio': 0.8,   # Share of the current sample already seen in the cached run
+    'ttl_hours': 6
+}
+
+# Local streaming topic clustering (LLM only names the cluster exemplars)
+TOPIC_CLUSTER_CONFIG = {
+    'enable_clustering': False,
+    'n_features': 2 ** 14,          # Hashed TF-IDF dimensions (bounds memory per cluster)
+    'max_clusters': 8,
+    'similarity_threshold': 0.25,   # Below this cosine similarity a tweet opens a new cluster
+    'min_cluster_size': 2,
+    'exemplars_per_cluster': 3,
+    'exemplar_pool_size': 20
+}
+
+# Representative sampling for summary/topic prompts (instead of the first N tweets)
+SAMPLING_CONFIG = {
+    'enable_representative_sampling': True,
+    'time_buckets': 4,
+    'use_clusters': True,
+    'max_clusters': 6
+}
+
+# Hierarchical map-reduce summary for large corpora
+SUMMARY_CONFIG = {
+    'enable_hierarchical': True,
+    'hierarchical_min_tweets': 100,   # Smaller corpora keep the single-prompt summary
+    'chunk_hours': 6,                 # Fixed time windows keep chunks stable across refreshes
+    'max_tweets_per_chunk': 40,
+    'reduce_fanout': 8,               # Chunk summaries merged per reduce call
+    'max_workers': 4,
+    'enable_summary_cache': True,
+    'cache_path': 'data/cache/summary_cache.json',
+    'cache_ttl_hours': 24
+}
+
+# Per-token analysis result cache shared across Streamlit sessions
+RESULT_CACHE_CONFIG = {
+    'enable_result_cache': True,
+    'cache_dir': 'data/cache/results',
+    'ttl_minutes': 30,
+    'prompt_version': 1    # Bump when prompts change so cached results are not reused
+}
+
+# Warm analyzers kept for the life of the process (Streamlit / server)
+ANALYZER_POOL_CONFIG = {
+    'pool_size': 2    # Max analyses running at once; each holds one analyzer
+}
+
+# Background analysis jobs (Streamlit polls their progress)
+JOB_CONFIG = {
+    'max_workers': 2,
+    'job_ttl_minutes': 60,          # Finished jobs stay viewable this long
+    'poll_interval_seconds': 1.0
+}
+
+# Coalesce concurrent analyses of the same token (in-process, and across processes via file locks)
+SINGLEFLIGHT_CONFIG = {
+    'enable_cross_process': True,
+    'lock_dir': 'data/cache/locks',
+    'lock_timeout_seconds': 900     # Stop waiting on another process and run anyway
+}
+
+# Max concurrent calls per external service, shared by all threads in the process
+CONCURRENCY_CONFIG = {
+    'rapidapi': 4,
+    'openai': 8,
+    'coinex': 4
+}
+
+# Multi-token batch runs (main.py --tokens / --tokens-file)
+BATCH_CONFIG = {
+    'max_workers': 8,           # Tokens analyzed at once (one pooled analyzer each)
+    'output_dir': 'results/batch'
+}
+
+# Watch daemon (watch.py): rolling per-token aggregates refreshed incrementally
+WATCH_CONFIG = {
+    'watchlist': [],                # e.g. [{'token': 'BTC', 'interval_minutes': 15}]; --tokens overrides
+    'default_interval_minutes': 30,
+    'window_days': 7,               # Tweets older than this leave the aggregates
+    'initial_max_pages': 6,         # First fetch for a token (fills the window)
+    'refresh_max_pages': 2,         # Incremental fetches stop earlier at already seen tweets
+    'state_path': 'data/cache/watch_state.json',
+    'poll_seconds': 5
+}
+
+# HTTP API service (server.py)
+SERVER_CONFIG = {
+    'host': '127.0.0.1',
+    'port': 8000,
+    'max_days': 30         # Largest 'days' a request may ask for (larger values are rejected with 422)
+}
+
 # User influence tier weights
 INFLUENCE_TIERS = {
     'tier_1': {'min_followers': 100000, 'weight': 1.5},
@@ -94,6 +216,17 @@ NEWS_ACCOUNTS = {
     'cryptoquant_com', 'intotheblock', 'coinmetrics', 'cryptocompare'
 }
 
+# News/blocked account registry (large external lists, per-category exclusion reasons)
+ACCOUNT_REGISTRY_CONFIG = {
+    'include_builtin_news_accounts': True,  # Load NEWS_ACCOUNTS into the 'news' category
+    'sources': [
+        # {'path': 'data/blocklists/media.txt', 'category': 'news'},  # One handle per line
+        # {'path': 'data/blocklists/handles.csv'},  # 'username' + optional 'category' columns
+        # {'path': 'data/blocklists/bots.parquet', 'category': 'bot'},
+    ],
+    'false_positive_rate': 0.01  # Bloom filter front, exact digest lookup behind it
+}
+
 # Spam detection patterns
 SPAM_PATTERNS = {
     'giveaway_keywords': [
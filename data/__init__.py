@@ -4,5 +4,7 @@ Data handling modules for team filtering and project information
 """
 
 from .team_filter import TeamFilter
+from .author_reputation import AuthorReputationStore
+from .account_registry import AccountRegistry
 
-__all__ = ['TeamFilter']
\ No newline at end of file
+__all__ = ['TeamFilter', 'AuthorReputationStore', 'AccountRegistry']
\ No newline at end of file
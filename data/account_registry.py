@@ -0,0 +1,200 @@
+# data/account_registry.py
+"""
+Compact categorized registry of news/blocked accounts loaded from external lists
+"""
+
+import csv
+import hashlib
+import math
+import os
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Optional
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over 64-bit keys"""
+
+    def __init__(self, expected_items: int, false_positive_rate: float = 0.01):
+        expected_items = max(1, expected_items)
+        self.num_bits = max(64, int(-expected_items * math.log(false_positive_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / expected_items * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: int):
+        # Double hashing from the two 32-bit halves of the key
+        h1 = key & 0xFFFFFFFF
+        h2 = (key >> 32) | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: int):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: int) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class AccountRegistry:
+    """Username -> categories membership with a Bloom filter front
+
+    Usernames are stored as sorted 64-bit BLAKE2b digests with a parallel
+    category bitmask array, so 100k+ handles take a few MB instead of a set
+    of Python strings.
+    """
+
+    MAX_CATEGORIES = 32
+
+    def __init__(self, false_positive_rate: float = 0.01):
+        self.false_positive_rate = false_positive_rate
+        self.categories = []
+        self._category_bits = {}
+        self._pending = {}
+        self._hashes = array('Q')
+        self._masks = array('I')
+        self._bloom = BloomFilter(1, false_positive_rate)
+        self.sources = []
+
+    @staticmethod
+    def normalize_username(username) -> Optional[str]:
+        if not username or username == 'N/A':
+            return None
+        return str(username).lower().replace('@', '').strip() or None
+
+    @staticmethod
+    def _hash(username: str) -> int:
+        return int.from_bytes(hashlib.blake2b(username.encode('utf-8'), digest_size=8).digest(), 'little')
+
+    def _category_bit(self, category: str) -> int:
+        if category not in self._category_bits:
+            if len(self.categories) >= self.MAX_CATEGORIES:
+                raise ValueError(f"Account registry supports at most {self.MAX_CATEGORIES} categories")
+            self._category_bits[category] = 1 << len(self.categories)
+            self.categories.append(category)
+        return self._category_bits[category]
+
+    def add_accounts(self, usernames: Iterable[str], category: str) -> int:
+        """Stage usernames for a category, call build() afterwards"""
+        bit = self._category_bit(category)
+        added = 0
+        for username in usernames:
+            username = self.normalize_username(username)
+            if username:
+                key = self._hash(username)
+                self._pending[key] = self._pending.get(key, 0) | bit
+                added += 1
+        return added
+
+    def load_file(self, path: str, category: Optional[str] = None, username_column: str = 'username',
+                  category_column: str = 'category') -> int:
+        """Load a .txt (one handle per line), .csv or .parquet list
+
+        CSV/Parquet rows may carry their own category column; otherwise the
+        given category (or the file name) is used.
+        """
+        default_category = category or os.path.splitext(os.path.basename(path))[0]
+        extension = os.path.splitext(path)[1].lower()
+
+        if extension == '.parquet':
+            # Parquet support needs pandas + pyarrow, only imported when such a list is configured
+            import pandas as pd
+            columns = [username_column]
+            df = pd.read_parquet(path)
+            if category_column in df.columns and not category:
+                columns.append(category_column)
+            # Missing cells are NaN (truthy, str() gives 'nan'): drop rows without a handle, blank categories
+            df = df[columns].dropna(subset=[username_column]).fillna('')
+            rows = df.itertuples(index=False, name=None)
+            loaded = self._add_rows(rows, default_category)
+        elif extension == '.csv':
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                reader = csv.DictReader(f)
+                if not reader.fieldnames or username_column not in reader.fieldnames:
+                    raise ValueError(f"{path} has no '{username_column}' column")
+                use_category_column = category_column in reader.fieldnames and not category
+                rows = ((row[username_column], row[category_column]) if use_category_column
+                        else (row[username_column],) for row in reader)
+                loaded = self._add_rows(rows, default_category)
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                usernames = (line.split('#', 1)[0].strip() for line in f)
+                loaded = self.add_accounts(usernames, default_category)
+
+        self.sources.append({'path': path, 'category': category, 'loaded': loaded})
+        return loaded
+
+    def _add_rows(self, rows, default_category):
+        loaded = 0
+        for row in rows:
+            row_category = str(row[1]).strip() if len(row) > 1 and row[1] is not None else ''
+            loaded += self.add_accounts([row[0]], row_category or default_category)
+        return loaded
+
+    def build(self):
+        """Merge staged accounts into the sorted arrays and rebuild the Bloom filter"""
+        merged = dict(zip(self._hashes, self._masks))
+        for key, mask in self._pending.items():
+            merged[key] = merged.get(key, 0) | mask
+        self._pending = {}
+
+        keys = sorted(merged)
+        self._hashes = array('Q', keys)
+        self._masks = array('I', (merged[key] for key in keys))
+        self._bloom = BloomFilter(len(keys), self.false_positive_rate)
+        for key in keys:
+            self._bloom.add(key)
+        return self
+
+    def _lookup_mask(self, username) -> int:
+        username = self.normalize_username(username)
+        if not username:
+            return 0
+        key = self._hash(username)
+        if key not in self._bloom:
+            return 0
+        index = bisect_left(self._hashes, key)
+        if index < len(self._hashes) and self._hashes[index] == key:
+            return self._masks[index]
+        return 0
+
+    def get_categories(self, username) -> list:
+        """All categories the username belongs to, in registration order"""
+        mask = self._lookup_mask(username)
+        return [category for category in self.categories if mask & self._category_bits[category]]
+
+    def get_category(self, username) -> Optional[str]:
+        """First matching category (registration order) or None"""
+        mask = self._lookup_mask(username)
+        if not mask:
+            return None
+        for category in self.categories:
+            if mask & self._category_bits[category]:
+                return category
+        return None
+
+    def contains(self, username, category: Optional[str] = None) -> bool:
+        mask = self._lookup_mask(username)
+        if category is None:
+            return bool(mask)
+        return bool(mask & self._category_bits.get(category, 0))
+
+    def __contains__(self, username) -> bool:
+        return self.contains(username)
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def get_stats(self) -> dict:
+        counts = {category: 0 for category in self.categories}
+        for mask in self._masks:
+            for category in self.categories:
+                if mask & self._category_bits[category]:
+                    counts[category] += 1
+        return {
+            'total_accounts': len(self._hashes),
+            'category_counts': counts,
+            'memory_bytes': (self._hashes.itemsize * len(self._hashes) + self._masks.itemsize * len(self._masks)
+                             + len(self._bloom.bits)),
+            'sources': list(self.sources)
+        }
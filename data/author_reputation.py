@@ -0,0 +1,127 @@
+# data/author_reputation.py
+"""
+Persistent per-author reputation store used to skip repeated AI filter calls
+"""
+
+import threading
+import time
+from typing import Optional
+
+from utils.cache_store import JsonFileStore
+
+
+VERDICT_KEYS = ('spam', 'informative', 'clean')
+
+
+class AuthorReputationStore:
+    def __init__(self, store_path: str = 'data/cache/author_reputation.json', min_verdicts: int = 3,
+                 conclusive_ratio: float = 0.9, half_life_days: float = 14, ttl_days: float = 30,
+                 influence_ttl_hours: float = 24):
+        self.min_verdicts = min_verdicts
+        self.conclusive_ratio = conclusive_ratio
+        self.half_life_seconds = half_life_days * 86400
+        self.influence_ttl_seconds = influence_ttl_hours * 3600
+        self.store = JsonFileStore(store_path, ttl_seconds=ttl_days * 86400)
+        # Pooled analyzers share one store; read-modify-write updates and counters hold this lock
+        self._lock = threading.Lock()
+        # Process lifetime totals, per-run counts are kept by the callers
+        self.stats = {'verdict_hits': 0, 'verdict_misses': 0, 'influence_hits': 0, 'influence_misses': 0}
+
+    @staticmethod
+    def normalize_username(username) -> Optional[str]:
+        if not username or username == 'N/A':
+            return None
+        return username.lower().replace('@', '').strip() or None
+
+    def _decayed_counts(self, entry, now):
+        """Verdict counts with exponential decay applied since the last update"""
+        counts = entry.get('counts', {})
+        elapsed = max(0.0, now - entry.get('counts_updated_at', now))
+        factor = 0.5 ** (elapsed / self.half_life_seconds) if self.half_life_seconds else 1.0
+        return {key: counts.get(key, 0.0) * factor for key in VERDICT_KEYS}
+
+    def _count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def get_verdict(self, username) -> Optional[str]:
+        """Return 'spam', 'informative' or 'clean' if the author's history is conclusive"""
+        verdict = self._conclusive_verdict(username)
+        self._count('verdict_hits' if verdict else 'verdict_misses')
+        return verdict
+
+    def _conclusive_verdict(self, username) -> Optional[str]:
+        key = self.normalize_username(username)
+        entry = self.store.get(key) if key else None
+        if not entry or 'counts' not in entry:
+            return None
+
+        counts = self._decayed_counts(entry, time.time())
+        total = sum(counts.values())
+        # Small tolerance so verdicts recorded seconds apart still count as whole
+        if total + 1e-3 < self.min_verdicts:
+            return None
+
+        verdict, count = max(counts.items(), key=lambda item: item[1])
+        return verdict if count / total >= self.conclusive_ratio else None
+
+    def record_verdict(self, username, is_spam: bool, is_informative: bool):
+        """Accumulate one AI filter verdict for the author"""
+        key = self.normalize_username(username)
+        if not key:
+            return
+
+        verdict = 'spam' if is_spam else 'informative' if is_informative else 'clean'
+        with self._lock:
+            now = time.time()
+            entry = dict(self.store.get(key) or {})
+            counts = self._decayed_counts(entry, now)
+            counts[verdict] += 1
+
+            entry['counts'] = counts
+            entry['counts_updated_at'] = now
+            self.store.set(key, entry)
+
+    def get_influence(self, user_data) -> Optional[dict]:
+        """Return cached influence data if the author's follower/verification data is unchanged"""
+        key = self.normalize_username(user_data.get('username'))
+        entry = self.store.get(key) if key else None
+        cached = entry.get('influence') if entry else None
+        if (cached and cached['signature'] == self._influence_signature(user_data)
+                and time.time() - cached['cached_at'] <= self.influence_ttl_seconds):
+            self._count('influence_hits')
+            return dict(cached['data'])
+
+        self._count('influence_misses')
+        return None
+
+    def set_influence(self, user_data, influence_data: dict):
+        key = self.normalize_username(user_data.get('username'))
+        if not key:
+            return
+
+        influence = {
+            'signature': self._influence_signature(user_data),
+            'cached_at': time.time(),
+            'data': influence_data
+        }
+        with self._lock:
+            entry = dict(self.store.get(key) or {})
+            entry['influence'] = influence
+            self.store.set(key, entry)
+
+    @staticmethod
+    def _influence_signature(user_data):
+        return [user_data.get('followers_count', 0),
+                bool(user_data.get('verified', False)),
+                bool(user_data.get('blue_verified', False))]
+
+    def save(self):
+        self.store.save()
+
+    def get_stats(self) -> dict:
+        """Lifetime hit/miss totals for this process plus the number of known authors"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats['authors'] = len(self.store)
+        return stats
@@ -3,21 +3,64 @@
 Team filtering logic using Excel data to exclude project team accounts
 """
 
-import pandas as pd
+import hashlib
+import io
+import marshal
 import os
-from typing import Set, Optional
+import threading
+from typing import FrozenSet, List, Set, Optional
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+class TeamAccountIndex:
+    """Immutable team account data; reloads build a new index and swap it in"""
+    
+    __slots__ = ('by_ticker', 'by_username', 'total_rows', 'source_signature', 'from_snapshot')
+    
+    def __init__(self, by_ticker=None, total_rows=0, source_signature=None, from_snapshot=False):
+        self.by_ticker = {ticker: frozenset(usernames) for ticker, usernames in (by_ticker or {}).items()}
+        
+        # Reverse index: username -> tickers of every project the account is team of
+        by_username = {}
+        for ticker, usernames in self.by_ticker.items():
+            for username in usernames:
+                by_username.setdefault(username, set()).add(ticker)
+        self.by_username = {username: frozenset(tickers) for username, tickers in by_username.items()}
+        self.total_rows = total_rows
+        self.source_signature = source_signature
+        self.from_snapshot = from_snapshot
 
 
 class TeamFilter:
-    def __init__(self, excel_file_path: str = 'data/project_twitter.xlsx', silent_mode: bool = False):
+    def __init__(self, excel_file_path: str = 'data/project_twitter.xlsx', silent_mode: bool = False,
+                 snapshot_path: Optional[str] = None):
         self.excel_file_path = excel_file_path
-        self.team_accounts_db = {}  # ticker -> set of usernames
+        self.snapshot_path = snapshot_path
+        self._index = TeamAccountIndex()
         self.is_loaded = False
         self.silent_mode = silent_mode
+        self.reload_count = 0
+        self._reload_lock = threading.Lock()
+        self._reload_thread = None
+        self._stop_reload = threading.Event()
         self.load_team_data()
     
+    @property
+    def team_accounts_db(self):
+        """ticker -> frozenset of usernames (from the current index)"""
+        return self._index.by_ticker
+    
+    @property
+    def total_projects(self):
+        return self._index.total_rows
+    
+    @property
+    def loaded_from_snapshot(self):
+        return self._index.from_snapshot
+    
     def load_team_data(self):
-        """Load team account data from Excel file"""
+        """Load team account data from the binary snapshot or the Excel file"""
         try:
             # Check if file exists
             if not os.path.exists(self.excel_file_path):
@@ -26,55 +69,20 @@ class TeamFilter:
                     print("   将跳过团队账户过滤")
                 return
             
-            # Load Excel file
-            df = pd.read_excel(self.excel_file_path)
-            
-            # Validate required columns
-            required_columns = ['ticker', 'tw_usernames']
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            if missing_columns:
-                if not self.silent_mode:
-                    print(f"⚠️ Excel文件缺少必需列: {missing_columns}")
+            index = self._build_index()
+            if index is None:
                 return
+            self._index = index
             
-            # Process data
-            loaded_count = 0
-            for _, row in df.iterrows():
-                ticker = str(row['ticker']).upper().strip()
-                usernames_str = str(row['tw_usernames']).strip()
-                
-                # Skip empty or NaN usernames
-                if pd.isna(row['tw_usernames']) or usernames_str == 'nan' or usernames_str == '':
-                    continue
-                
-                # Handle multiple usernames (if separated by comma, semicolon, etc.)
-                usernames = set()
-                
-                # Split by common separators and clean
-                for separator in [',', ';', '|', '\n']:
-                    if separator in usernames_str:
-                        usernames_str = usernames_str.replace(separator, ',')
-                
-                # Extract usernames
-                for username in usernames_str.split(','):
-                    username = username.strip().lower()
-                    if username and username != 'nan':
-                        # Remove @ symbol if present
-                        username = username.lstrip('@')
-                        usernames.add(username)
-                
-                if usernames:
-                    self.team_accounts_db[ticker] = usernames
-                    loaded_count += 1
-            
+            loaded_count = len(self.team_accounts_db)
             self.is_loaded = True
             
             # 🆕 Only show loading info if not in silent mode
             if not self.silent_mode:
                 print(f"✅ 成功加载团队账户数据:")
-                print(f"   📊 总项目数: {len(df)} 个")
+                print(f"   📊 总项目数: {self.total_projects} 个")
                 print(f"   👥 有效团队账户: {loaded_count} 个项目")
-                print(f"   📄 数据文件: {self.excel_file_path}")
+                print(f"   📄 数据文件: {self.excel_file_path}" + (" (快照)" if self.loaded_from_snapshot else ""))
                 
                 # Show some examples
                 if loaded_count > 0:
@@ -89,6 +97,191 @@ class TeamFilter:
                 print(f"❌ 加载团队账户数据时出错: {e}")
                 print("   将跳过团队账户过滤")
     
+    def _build_index(self) -> Optional[TeamAccountIndex]:
+        """Build a fresh index from the snapshot or the Excel file (None if the file is invalid)"""
+        # Taken before parsing so an edit made mid-parse triggers another reload
+        signature = self._source_signature()
+        
+        snapshot = self._load_snapshot()
+        if snapshot:
+            return TeamAccountIndex(snapshot['team_accounts'], snapshot['total_rows'], signature, from_snapshot=True)
+        
+        # Parse and hash the same bytes, so the snapshot never pairs one file version's hash with another's data
+        signature, content, content_hash = self._read_source()
+        parsed = self._parse_excel(content)
+        if parsed is None:
+            return None
+        
+        index = TeamAccountIndex(parsed[0], parsed[1], signature)
+        self._write_snapshot(index, content_hash)
+        return index
+    
+    def reload_if_changed(self) -> bool:
+        """Rebuild and swap in a new index if the Excel file changed, returns True on swap"""
+        with self._reload_lock:
+            if not os.path.exists(self.excel_file_path):
+                return False
+            if self.is_loaded and self._source_signature() == self._index.source_signature:
+                return False
+            
+            index = self._build_index()
+            if index is None:
+                return False
+            
+            # Single attribute rebind: readers see either the old or the new index, never a mix
+            self._index = index
+            self.is_loaded = True
+            self.reload_count += 1
+            if not self.silent_mode:
+                print(f"🔄 团队账户数据已重新加载: {len(index.by_ticker)} 个项目")
+            return True
+    
+    def start_auto_reload(self, interval_seconds: float = 30):
+        """Watch the Excel file in a background thread and hot-swap the index on change"""
+        if self._reload_thread and self._reload_thread.is_alive():
+            return
+        
+        self._stop_reload.clear()
+        
+        def watch():
+            while not self._stop_reload.wait(interval_seconds):
+                try:
+                    self.reload_if_changed()
+                except Exception as e:
+                    # Keep serving the previous index, retry on the next tick
+                    if not self.silent_mode:
+                        print(f"⚠️ 团队账户数据重新加载失败: {e}")
+        
+        self._reload_thread = threading.Thread(target=watch, name='team-filter-reload', daemon=True)
+        self._reload_thread.start()
+    
+    def stop_auto_reload(self):
+        self._stop_reload.set()
+        if self._reload_thread:
+            self._reload_thread.join(timeout=5)
+            self._reload_thread = None
+    
+    def _parse_excel(self, content):
+        """Parse the Excel file content into (ticker -> usernames, total rows), None if invalid"""
+        # pandas/openpyxl are only needed when the snapshot is missing or stale
+        import pandas as pd
+        
+        df = pd.read_excel(io.BytesIO(content))
+        
+        # Validate required columns
+        required_columns = ['ticker', 'tw_usernames']
+        missing_columns = [col for col in required_columns if col not in df.columns]
+        if missing_columns:
+            if not self.silent_mode:
+                print(f"⚠️ Excel文件缺少必需列: {missing_columns}")
+            return None
+        
+        # Process data
+        team_accounts_db = {}
+        for ticker, raw_usernames in zip(df['ticker'], df['tw_usernames']):
+            ticker = str(ticker).upper().strip()
+            usernames_str = str(raw_usernames).strip()
+            
+            # Skip empty or NaN usernames
+            if pd.isna(raw_usernames) or usernames_str == 'nan' or usernames_str == '':
+                continue
+            
+            # Handle multiple usernames (if separated by comma, semicolon, etc.)
+            usernames = set()
+            
+            # Split by common separators and clean
+            for separator in [',', ';', '|', '\n']:
+                if separator in usernames_str:
+                    usernames_str = usernames_str.replace(separator, ',')
+            
+            # Extract usernames
+            for username in usernames_str.split(','):
+                username = username.strip().lower()
+                if username and username != 'nan':
+                    # Remove @ symbol if present
+                    username = username.lstrip('@')
+                    usernames.add(username)
+            
+            if usernames:
+                team_accounts_db[ticker] = usernames
+        
+        return team_accounts_db, len(df)
+    
+    def _source_signature(self):
+        stat = os.stat(self.excel_file_path)
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _read_source(self):
+        """(signature, content, sha256) read from one open handle of the Excel file"""
+        with open(self.excel_file_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            content = f.read()
+        return (stat.st_mtime_ns, stat.st_size), content, hashlib.sha256(content).hexdigest()
+    
+    def _source_hash(self):
+        digest = hashlib.sha256()
+        with open(self.excel_file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def _load_snapshot(self):
+        """Return the snapshot dict if it matches the current Excel file, else None"""
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return None
+        
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                snapshot = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        
+        if not isinstance(snapshot, dict) or snapshot.get('format') != SNAPSHOT_FORMAT_VERSION:
+            return None
+        if snapshot.get('source_path') != os.path.abspath(self.excel_file_path):
+            return None
+        
+        mtime_ns, size = self._source_signature()
+        if (snapshot.get('mtime_ns'), snapshot.get('size')) == (mtime_ns, size):
+            return snapshot
+        
+        # mtime changed (copy, checkout, touch): fall back to the content hash
+        if snapshot.get('size') == size and snapshot.get('sha256') == self._source_hash():
+            snapshot['mtime_ns'] = mtime_ns
+            self._dump_snapshot(snapshot)
+            return snapshot
+        
+        return None
+    
+    def _write_snapshot(self, index, content_hash):
+        if not self.snapshot_path:
+            return
+        
+        mtime_ns, size = index.source_signature
+        self._dump_snapshot({
+            'format': SNAPSHOT_FORMAT_VERSION,
+            'source_path': os.path.abspath(self.excel_file_path),
+            'mtime_ns': mtime_ns,
+            'size': size,
+            'sha256': content_hash,
+            'total_rows': index.total_rows,
+            'team_accounts': {ticker: sorted(usernames) for ticker, usernames in index.by_ticker.items()}
+        })
+    
+    def _dump_snapshot(self, snapshot):
+        """Atomically write the snapshot (failures only cost the next cold start)"""
+        try:
+            directory = os.path.dirname(self.snapshot_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.snapshot_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                marshal.dump(snapshot, f)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            if not self.silent_mode:
+                print(f"⚠️ 无法写入团队账户快照: {e}")
+    
     def is_team_account(self, username: str, token_symbol: str) -> bool:
         """Check if username belongs to the project team"""
         if not self.is_loaded:
@@ -102,17 +295,40 @@ class TeamFilter:
         token_symbol = token_symbol.upper().strip()
         
         # Check if we have team data for this token
-        team_usernames = self.team_accounts_db.get(token_symbol, set())
+        team_usernames = self.team_accounts_db.get(token_symbol, frozenset())
         
         return username in team_usernames
     
+    def get_tickers_for_username(self, username: str) -> FrozenSet[str]:
+        """All tickers whose team lists this username"""
+        if not self.is_loaded or not username or username == 'N/A':
+            return frozenset()
+        
+        username = username.lower().replace('@', '').strip()
+        return self._index.by_username.get(username, frozenset())
+    
+    def is_team_of_any(self, username: str) -> bool:
+        """Check if username belongs to the team of any listed project"""
+        return bool(self.get_tickers_for_username(username))
+    
+    def get_tickers_for_usernames(self, usernames) -> List[FrozenSet[str]]:
+        """Batch version of get_tickers_for_username, one index snapshot for the whole batch"""
+        if not self.is_loaded:
+            return [frozenset()] * len(usernames)
+        
+        by_username = self._index.by_username
+        empty = frozenset()
+        return [by_username.get(username.lower().replace('@', '').strip(), empty)
+                if username and username != 'N/A' else empty
+                for username in usernames]
+    
     def get_team_usernames(self, token_symbol: str) -> Set[str]:
         """Get all team usernames for a specific token"""
         if not self.is_loaded:
             return set()
         
         token_symbol = token_symbol.upper().strip()
-        return self.team_accounts_db.get(token_symbol, set())
+        return self.team_accounts_db.get(token_symbol, frozenset())
     
     def get_filtering_stats(self) -> dict:
         """Get statistics about loaded team data"""
@@ -124,13 +340,16 @@ class TeamFilter:
                 'total_team_accounts': 0
             }
         
-        total_accounts = sum(len(usernames) for usernames in self.team_accounts_db.values())
+        index = self._index
+        total_accounts = sum(len(usernames) for usernames in index.by_ticker.values())
         
         return {
             'is_loaded': True,
-            'total_projects': len(self.team_accounts_db),
-            'projects_with_accounts': len(self.team_accounts_db),
+            'total_projects': len(index.by_ticker),
+            'projects_with_accounts': len(index.by_ticker),
             'total_team_accounts': total_accounts,
+            'unique_team_accounts': len(index.by_username),
+            'multi_project_accounts': sum(1 for tickers in index.by_username.values() if len(tickers) > 1),
             'file_path': self.excel_file_path
         }
     
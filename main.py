@@ -3,18 +3,41 @@
 Enhanced main execution script with user input and simplified output
 """
 
+import argparse
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from api.twitter_api import TwitterAPI
 from analysis.sentiment import CryptoSentimentAnalyzer
-from config import ANALYSIS_CONFIG, OPENAI_API_KEY, SMART_SEARCH_CONFIG
-from utils.helpers import calculate_percentage
+from analysis.pool import AnalyzerPool
+from config import ANALYSIS_CONFIG, OPENAI_API_KEY, SMART_SEARCH_CONFIG, BATCH_CONFIG
+from utils.exporters import EXPORTERS, export_result, write_json
+from utils.helpers import calculate_percentage, parse_token_list
+from utils.result_cache import default_result_cache
 
 
-def get_token_input():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="加密货币推文情感分析")
+    parser.add_argument('token', nargs='?', help="要分析的代币符号 (test 运行多代币快速测试)")
+    parser.add_argument('--export', metavar='PATH',
+                        help="导出结构化结果 (格式由扩展名决定: .json, .jsonl, .parquet)")
+    parser.add_argument('--tokens', help="批量分析: 逗号分隔的代币列表, 如 BTC,ETH,SOL")
+    parser.add_argument('--tokens-file', help="批量分析: 每行一个代币符号的文件 (# 开头为注释)")
+    parser.add_argument('--output-dir', default=BATCH_CONFIG['output_dir'], help="批量结果输出目录")
+    parser.add_argument('--format', choices=sorted(EXPORTERS), default='json', help="批量结果格式")
+    parser.add_argument('--workers', type=int, default=BATCH_CONFIG['max_workers'], help="同时分析的代币数")
+    parser.add_argument('--days', type=int, default=ANALYSIS_CONFIG['target_days'], help="分析天数")
+    parser.add_argument('--no-cache', action='store_true', help="批量分析时忽略结果缓存")
+    return parser.parse_args(argv)
+
+
+def get_token_input(args):
     """Get token symbol from user input (simplified)"""
     # Check if token provided as command line argument
-    if len(sys.argv) > 1:
-        token_symbol = sys.argv[1].upper().strip()
+    if args.token:
+        token_symbol = args.token.upper().strip()
         return token_symbol
     
     # Interactive input if no argument provided
@@ -32,13 +55,13 @@ def get_token_input():
             print(f"❌ 输入错误: {e}")
 
 
-def main():
+def main(args):
     try:
         # 🆕 Get token symbol from user (no verbose startup messages)
-        token_symbol = get_token_input()
+        token_symbol = get_token_input(args)
         
         # Configuration
-        target_days = ANALYSIS_CONFIG['target_days']
+        target_days = args.days
         max_pages_per_call = ANALYSIS_CONFIG['max_pages_per_call']
         
         # Initialize Twitter API and analyzer (silent mode)
@@ -64,7 +87,9 @@ def main():
             
             if analysis_result:
                 # Analysis successful - output is handled in the analyzer
-                pass
+                if args.export:
+                    export_result(analysis_result, args.export)
+                    print(f"💾 分析结果已导出: {args.export}")
             else:
                 # 🆕 Handle case where filtering removes all tweets
                 print(f'🔍 "{token_symbol}" 近{target_days}天推文情感分析')
@@ -82,52 +107,112 @@ def main():
         print(f"错误类型: {type(e).__name__}")
 
 
-def quick_test():
-    """Quick test function for multiple tokens"""
-    tokens = ["BTC", "ETH", "SOL", "PUNDIAI"]
-    
-    for token in tokens:
-        print(f"\n{'='*60}")
-        print(f"🧪 测试分析: {token}")
-        print('='*60)
-        
+def run_batch(tokens, target_days, max_pages_per_call, output_dir=None, workers=8, fmt='json', use_cache=True):
+    """Analyze many tokens concurrently, returns the run summary
+
+    Workers share one AnalyzerPool (team data, reputation store, API client),
+    and the per-service caps in CONCURRENCY_CONFIG bound RapidAPI / OpenAI /
+    CoinEx calls however many tokens run at once. With output_dir set, each
+    result is exported to <output_dir>/<TOKEN>.<fmt> next to run_summary.json.
+    """
+    workers = max(1, min(workers, len(tokens)))
+    pool = AnalyzerPool(openai_api_key=OPENAI_API_KEY, size=workers, silent_mode=True,
+                        result_cache=default_result_cache())
+    started_at = datetime.now()
+    batch_start = time.time()
+
+    def analyze(token):
+        entry = {'token': token, 'status': None, 'source': None, 'total_tweets': 0, 'effective_tweets': 0,
+                 'sentiment_summary': None, 'total_tokens_used': 0, 'output': None, 'error': None}
+        token_start = time.time()
         try:
-            twitter_api = TwitterAPI()
-            analyzer = CryptoSentimentAnalyzer(openai_api_key=OPENAI_API_KEY)
-            
-            # Create querystring
-            base_querystring = twitter_api.create_smart_querystring_silent(token)
-            
-            # Get tweets
-            tweets = twitter_api.get_tweets_multi_timeframe_silent(
-                base_querystring, 
-                total_days=3,  # Shorter for testing
-                max_pages_per_call=2
-            )
-            
-            if tweets:
-                # Run analysis
-                result = analyzer.comprehensive_analysis_silent(tweets, token, 3)
-                if result:
-                    print(f"✅ {token} 分析成功")
-                else:
-                    print(f"❌ {token} 分析失败")
+            analysis_result, run_info = pool.analyze_token(token, target_days=target_days,
+                                                           max_pages_per_call=max_pages_per_call,
+                                                           use_cache=use_cache)
+            entry['source'] = run_info.get('source')
+            entry['total_tweets'] = run_info.get('total_tweets', 0)
+            if analysis_result:
+                entry['status'] = 'ok'
+                entry['effective_tweets'] = analysis_result.get('effective_tweets', 0)
+                entry['sentiment_summary'] = analysis_result.get('sentiment_summary')
+                entry['total_tokens_used'] = analysis_result.get('total_tokens_used', 0)
+                if output_dir:
+                    entry['output'] = export_result(analysis_result, os.path.join(output_dir, f"{token}.{fmt}"), fmt)
             else:
-                print(f"❌ {token} 无推文")
-                
+                entry['status'] = 'no_tweets'
         except Exception as e:
-            print(f"❌ {token} 测试失败: {e}")
+            entry['status'] = 'error'
+            entry['error'] = f"{type(e).__name__}: {e}"
+        entry['duration_seconds'] = round(time.time() - token_start, 2)
+        return entry
+
+    results = {}
+    print(f"🚀 批量分析 {len(tokens)} 个代币 (并发 {workers}, 近{target_days}天)")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(analyze, token): token for token in tokens}
+        for done, future in enumerate(as_completed(futures), start=1):
+            entry = future.result()
+            results[entry['token']] = entry
+            if entry['status'] == 'ok':
+                cached = " [缓存]" if entry['source'] == 'cache' else ""
+                print(f"✅ [{done}/{len(tokens)}] {entry['token']}: 有效推文 {entry['effective_tweets']}"
+                      f"/{entry['total_tweets']}, 用时 {entry['duration_seconds']}s{cached}")
+            elif entry['status'] == 'no_tweets':
+                print(f"⚪ [{done}/{len(tokens)}] {entry['token']}: 过滤后无可分析推文")
+            else:
+                print(f"❌ [{done}/{len(tokens)}] {entry['token']}: {entry['error']}")
+
+    ordered = [results[token] for token in tokens]
+    summary = {
+        'started_at': started_at.isoformat(),
+        'finished_at': datetime.now().isoformat(),
+        'duration_seconds': round(time.time() - batch_start, 2),
+        'target_days': target_days,
+        'tokens': len(tokens),
+        'succeeded': sum(1 for entry in ordered if entry['status'] == 'ok'),
+        'no_tweets': sum(1 for entry in ordered if entry['status'] == 'no_tweets'),
+        'failed': sum(1 for entry in ordered if entry['status'] == 'error'),
+        'from_cache': sum(1 for entry in ordered if entry['source'] == 'cache'),
+        'total_tokens_used': sum(entry['total_tokens_used'] or 0 for entry in ordered),
+        'pool_stats': pool.get_stats(),
+        'results': ordered
+    }
+
+    if output_dir:
+        summary_path = write_json(summary, os.path.join(output_dir, 'run_summary.json'))
+        print(f"💾 批量结果已保存: {summary_path}")
+    print(f"📊 完成 {summary['succeeded']}/{len(tokens)}, 无推文 {summary['no_tweets']}, "
+          f"失败 {summary['failed']}, 总用时 {summary['duration_seconds']}s")
+    return summary
+
+
+def quick_test():
+    """Quick test function for multiple tokens"""
+    run_batch(["BTC", "ETH", "SOL", "PUNDIAI"], target_days=3, max_pages_per_call=2, workers=4, use_cache=False)
 
 
 if __name__ == "__main__":
+    args = parse_args()
+    
+    if args.tokens or args.tokens_file:
+        tokens = parse_token_list(args.tokens, args.tokens_file)
+        if not tokens:
+            print("❌ 未找到要分析的代币")
+            sys.exit(1)
+        summary = run_batch(tokens, args.days, ANALYSIS_CONFIG['max_pages_per_call'], output_dir=args.output_dir,
+                            workers=args.workers, fmt=args.format, use_cache=not args.no_cache)
+        sys.exit(1 if summary['failed'] else 0)
     # Check if running in test mode
-    if len(sys.argv) > 1 and sys.argv[1].lower() == "test":
+    elif args.token and args.token.lower() == "test":
         quick_test()
     else:
-        main()
+        main(args)
     
     # Usage examples:
     # python3 main.py              # Interactive mode
     # python3 main.py BTC          # Direct analysis of BTC
     # python3 main.py PUNDIAI      # Direct analysis of PUNDIAI  
-    # python3 main.py test         # Test multiple tokens
\ No newline at end of file
+    # python3 main.py test         # Test multiple tokens
+    # python3 main.py BTC --export results/btc.json    # Also export structured results (.json/.jsonl/.parquet)
+    # python3 main.py --tokens BTC,ETH,SOL             # Batch analysis, results in results/batch/
+    # python3 main.py --tokens-file tokens.txt --workers 16 --output-dir results/nightly
@@ -0,0 +1,158 @@
+# server.py
+"""
+HTTP API service mode: JSON analysis results from warm, shared analyzers
+"""
+
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException, Query, Response
+from pydantic import BaseModel, Field
+
+from analysis.pool import AnalyzerPool
+from config import ANALYSIS_CONFIG, OPENAI_API_KEY, ANALYZER_POOL_CONFIG, JOB_CONFIG, SERVER_CONFIG
+from utils.exporters import build_export, to_json_safe
+from utils.jobs import JobManager, JOB_DONE
+from utils.result_cache import default_result_cache
+
+TOKEN_PATTERN = re.compile(r'^[A-Z0-9]{2,10}$')
+
+# Built once at startup and shared by every request
+services = {}
+
+
+@asynccontextmanager
+async def lifespan(app):
+    services['result_cache'] = default_result_cache()
+    services['pool'] = AnalyzerPool(openai_api_key=OPENAI_API_KEY, size=ANALYZER_POOL_CONFIG['pool_size'],
+                                    silent_mode=True, result_cache=services['result_cache'])
+    # One worker per pooled analyzer, extra jobs queue instead of blocking requests
+    services['jobs'] = JobManager(max_workers=ANALYZER_POOL_CONFIG['pool_size'],
+                                  ttl_seconds=JOB_CONFIG['job_ttl_minutes'] * 60)
+    yield
+    services['jobs'].shutdown(wait=False)
+
+
+app = FastAPI(title="Crypto Sentiment Analyzer API", lifespan=lifespan)
+
+
+class AnalyzeRequest(BaseModel):
+    token: str
+    days: Optional[int] = Field(None, ge=1, le=SERVER_CONFIG['max_days'])
+    force_refresh: bool = False
+
+
+def normalize_token(token_symbol):
+    token_symbol = token_symbol.strip().upper()
+    if not TOKEN_PATTERN.match(token_symbol):
+        raise HTTPException(status_code=400, detail="Invalid token symbol (2-10 letters or digits)")
+    return token_symbol
+
+
+def result_document(analysis_result, run_info):
+    """Export document for a result, None when nothing was left to analyze"""
+    return {
+        'run_info': to_json_safe(run_info),
+        'result': build_export(analysis_result) if analysis_result else None
+    }
+
+
+def analysis_job(token_symbol, target_days, use_cache, progress=None):
+    analysis_result, run_info = services['pool'].analyze_token(
+        token_symbol, target_days=target_days, use_cache=use_cache, progress_callback=progress
+    )
+    # Converted once here instead of on every status poll
+    return result_document(analysis_result, run_info)
+
+
+def cached_response(token_symbol, target_days):
+    result_cache = services['result_cache']
+    entry = result_cache.get(token_symbol, target_days) if result_cache is not None else None
+    if not entry:
+        return None
+    document = result_document(entry['value']['analysis_result'], entry['value']['run_info'])
+    return dict(document, status=JOB_DONE, source='cache', cached_at=entry['updated_at'],
+                age_seconds=round(time.time() - entry['updated_at'], 1))
+
+
+@app.post('/analyze', status_code=202)
+def analyze(request: AnalyzeRequest, response: Response):
+    """Cached result (200) or a background job to poll (202)"""
+    token_symbol = normalize_token(request.token)
+    target_days = request.days or ANALYSIS_CONFIG['target_days']
+
+    if not request.force_refresh:
+        cached = cached_response(token_symbol, target_days)
+        if cached:
+            response.status_code = 200
+            return cached
+
+    jobs = services['jobs']
+    job_id = jobs.submit((token_symbol, target_days), analysis_job, token_symbol, target_days,
+                         not request.force_refresh)
+    job = jobs.get(job_id)
+    return {'job_id': job_id, 'status': job['status'], 'token': token_symbol, 'days': target_days,
+            'status_url': f"/jobs/{job_id}"}
+
+
+@app.get('/jobs/{job_id}')
+def job_status(job_id: str):
+    job = services['jobs'].get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+
+    token_symbol, target_days = job['key']
+    partial = job['partial']
+    body = {
+        'job_id': job_id,
+        'token': token_symbol,
+        'days': target_days,
+        'status': job['status'],
+        'stage': job['stage'],
+        'created_at': job['created_at'],
+        'updated_at': job['updated_at'],
+        'progress': to_json_safe({
+            'done': partial.get('done', 0),
+            'total': partial.get('total', 0),
+            'total_tweets': partial.get('total_tweets'),
+            'effective_tweets': partial.get('effective_tweets'),
+            'sentiment_summary': partial.get('sentiment_summary'),
+            'price_context': partial.get('price_context'),
+            'viral_tweet_ids': [str(tweet.get('tweet_id')) for tweet in partial.get('viral_tweets', [])]
+        })
+    }
+    if job['error']:
+        body['error'] = job['error'].splitlines()[0]
+    if job['status'] == JOB_DONE:
+        body.update(job['result'])
+    return body
+
+
+@app.get('/results/{token}')
+def cached_result(token: str, days: Optional[int] = Query(None, ge=1, le=SERVER_CONFIG['max_days'])):
+    """Most recent cached result, never starts an analysis"""
+    token_symbol = normalize_token(token)
+    cached = cached_response(token_symbol, days or ANALYSIS_CONFIG['target_days'])
+    if cached is None:
+        raise HTTPException(status_code=404, detail="No fresh cached result, POST /analyze to start one")
+    return cached
+
+
+@app.get('/health')
+def health():
+    return {'status': 'ok', 'pool': services['pool'].get_stats(), 'jobs': len(services['jobs'].list_jobs())}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # Single process keeps the warm pool shared; more workers still coalesce via SINGLEFLIGHT_CONFIG file locks
+    uvicorn.run(app, host=SERVER_CONFIG['host'], port=SERVER_CONFIG['port'])
+
+    # Usage examples:
+    # python3 server.py
+    # curl -X POST localhost:8000/analyze -H 'Content-Type: application/json' -d '{"token": "BTC"}'
+    # curl localhost:8000/jobs/<job_id>
+    # curl localhost:8000/results/BTC
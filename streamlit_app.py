@@ -1,14 +1,16 @@
 import streamlit as st
 import sys
-import io
 import pandas as pd
-from contextlib import redirect_stdout, redirect_stderr
+from contextlib import nullcontext
+import time
 import traceback
 
 # Import your existing modules
-from api.twitter_api import TwitterAPI
-from analysis.sentiment import CryptoSentimentAnalyzer
-from config import ANALYSIS_CONFIG, OPENAI_API_KEY
+from analysis.pool import AnalyzerPool
+from config import ANALYSIS_CONFIG, OPENAI_API_KEY, RESULT_CACHE_CONFIG, ANALYZER_POOL_CONFIG, JOB_CONFIG
+from utils.result_cache import default_result_cache
+from utils.jobs import JobManager, JOB_DONE, JOB_ERROR
+from utils.output_capture import capture_output, install_thread_local_output
 
 # Page configuration
 st.set_page_config(
@@ -301,105 +303,75 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def capture_analysis_output(token_symbol):
-    """Capture the output from the analysis function"""
-    # Create string buffers to capture output
-    stdout_buffer = io.StringIO()
-    stderr_buffer = io.StringIO()
+# Results are shared across sessions; the version changes whenever analysis-relevant settings do
+RESULT_CACHE = default_result_cache()
+
+# Jobs run on worker threads, so debug output is captured per thread instead of by swapping sys.stdout
+install_thread_local_output()
+
+@st.cache_resource
+def get_analyzer_pool():
+    """Process-wide analyzers, team data and API client shared by every session"""
+    return AnalyzerPool(openai_api_key=OPENAI_API_KEY, size=ANALYZER_POOL_CONFIG['pool_size'], silent_mode=True,
+                        result_cache=RESULT_CACHE)
+
+@st.cache_resource
+def get_job_manager():
+    """Background analysis jobs, shared by every session so a browser refresh does not lose them"""
+    return JobManager(max_workers=JOB_CONFIG['max_workers'], ttl_seconds=JOB_CONFIG['job_ttl_minutes'] * 60)
+
+def get_cached_analysis(token_symbol):
+    """Fresh cached (analysis_result, run_info, cached_at) or None"""
+    if not RESULT_CACHE:
+        return None
+    entry = RESULT_CACHE.get(token_symbol, ANALYSIS_CONFIG['target_days'])
+    if not entry:
+        return None
+    return entry['value']['analysis_result'], entry['value']['run_info'], entry['updated_at']
+
+def analysis_job(token_symbol, debug_output=False, progress=None):
+    """Background job body (the pool stores the result in the result cache)"""
+    analysis_result, run_info, output_text = run_analysis(token_symbol, debug_output=debug_output,
+                                                          progress_callback=progress)
+    return {'analysis_result': analysis_result, 'run_info': run_info, 'output_text': output_text}
+
+def run_analysis(token_symbol, debug_output=False, progress_callback=None):
+    """Run the analysis pipeline, returns (analysis_result, run_info, output_text)
+    
+    The page renders from analysis_result; the printed report is only
+    produced (and captured) when debug_output is requested.
+    """
+    target_days = ANALYSIS_CONFIG['target_days']
+    max_pages_per_call = ANALYSIS_CONFIG['max_pages_per_call']
+    run_info = {'token': token_symbol, 'target_days': target_days, 'total_tweets': 0, 'error': None}
     
     try:
-        with redirect_stdout(stdout_buffer), redirect_stderr(stderr_buffer):
-            # Configuration
-            target_days = ANALYSIS_CONFIG['target_days']
-            max_pages_per_call = ANALYSIS_CONFIG['max_pages_per_call']
-            
-            # Initialize components
-            twitter_api = TwitterAPI()
-            analyzer = CryptoSentimentAnalyzer(openai_api_key=OPENAI_API_KEY, silent_mode=True)
-            
-            # Create smart querystring
-            base_querystring = twitter_api.create_smart_querystring_silent(
-                token_symbol,
-                additional_filters={}
+        # Warm pooled components; identical concurrent requests (other sessions or
+        # processes) share one run. The caller already checked the result cache.
+        with capture_output() if debug_output else nullcontext() as output_buffer:
+            analysis_result, run_info = get_analyzer_pool().analyze_token(
+                token_symbol, target_days=target_days, max_pages_per_call=max_pages_per_call,
+                use_cache=False, print_report=debug_output, progress_callback=progress_callback
             )
-            
-            # Get tweets
-            all_tweets = twitter_api.get_tweets_multi_timeframe_silent(
-                base_querystring, 
-                total_days=target_days, 
-                max_pages_per_call=max_pages_per_call
-            )
-            
-            if all_tweets:
-                # Run analysis
-                analysis_result = analyzer.comprehensive_analysis_silent(
-                    all_tweets, token_symbol, target_days
-                )
-                
-                if not analysis_result:
-                    # Handle case where filtering removes all tweets
-                    print(f'🔍 "{token_symbol}" 近{target_days}天推文情感分析')
-                    print(f"原获取推文数量: {len(all_tweets)}; 过滤后有效推文: 0")
-                    print("❌ 过滤后无可分析推文，請檢查其他社群資訊")
-                    return None, stdout_buffer.getvalue()
-                
-                return analysis_result, stdout_buffer.getvalue()
-            else:
-                # Handle case where no tweets found
-                print(f'🔍 "{token_symbol}" 近{target_days}天推文情感分析')
-                print(f"原获取推文数量: 0; 过滤后有效推文: 0")
-                print("❌ 过滤后无可分析推文，請檢查其他社群資訊")
-                return None, stdout_buffer.getvalue()
+        return analysis_result, run_info, output_buffer.getvalue() if output_buffer is not None else ""
                 
     except Exception as e:
-        error_msg = f"💥 分析过程中出现错误: {str(e)}\n{traceback.format_exc()}"
-        return None, error_msg
+        run_info['error'] = str(e)
+        return None, run_info, f"💥 分析过程中出现错误: {str(e)}\n{traceback.format_exc()}"
 
-def parse_and_display_price_data(output_text):
-    """Parse price data from raw output and display in a nice format - multi-line indented format"""
-    lines = output_text.split('\n')
-    
-    # Look for price data in multi-line format
-    price_data = {}
-    price_section_started = False
-    
-    for line in lines:
-        if '💰 站内数据总览:' in line:
-            price_section_started = True
-            continue
-        elif price_section_started and line.strip().startswith('💵 当前价格:'):
-            # Extract current price from "   💵 当前价格: $190.104194"
-            current_price = line.split('💵 当前价格:')[1].strip()
-            price_data['current_price'] = current_price
-        elif price_section_started and ('📈 24H变化:' in line or '📉 24H变化:' in line):
-            # Extract 24h change from "   📈 24H变化: -4.79%"
-            if '📈 24H变化:' in line:
-                change_24h = line.split('📈 24H变化:')[1].strip()
-                price_data['change_24h'] = change_24h
-                price_data['change_icon'] = '📈'
-            elif '📉 24H变化:' in line:
-                change_24h = line.split('📉 24H变化:')[1].strip()
-                price_data['change_24h'] = change_24h
-                price_data['change_icon'] = '📉'
-        elif price_section_started and line.strip().startswith('💧 24H交易量:'):
-            # Extract volume from "   💧 24H交易量: $515,254"
-            volume_24h = line.split('💧 24H交易量:')[1].strip()
-            price_data['volume_24h'] = volume_24h
-        elif price_section_started and line.strip() and not line.strip().startswith('   '):
-            # End of price section
-            break
-    
-    if not price_data:
+def build_price_html(price_context):
+    """Price overview card from result['price_aware_stats']['price_context']"""
+    if not price_context:
         return None
     
-    # Get values with defaults
-    current_price = price_data.get('current_price', 'N/A')
-    change_24h = price_data.get('change_24h', 'N/A')
-    volume_24h = price_data.get('volume_24h', 'N/A')
-    change_icon = price_data.get('change_icon', '📉')
+    change_rate = price_context.get('change_rate', 0)
+    current_price = f"${price_context['price_usd']:.6f}"
+    change_24h = f"{change_rate:+.2%}"
+    volume_24h = f"${price_context.get('volume_usd', 0):,.0f}"
+    change_icon = '📉' if change_rate < 0 else '📈'
     
     # Determine change class
-    change_class = "price-negative" if change_24h.startswith('-') else "price-positive"
+    change_class = "price-negative" if change_rate < 0 else "price-positive"
     
     # Create the HTML display
     price_html = f"""
@@ -424,50 +396,20 @@ def parse_and_display_price_data(output_text):
     
     return price_html
 
-def create_vertical_sentiment_bars_from_output(output_text):
+def build_sentiment_bars_html(sentiment_summary):
     """Create vertical sentiment bars with proper proportions"""
-    lines = output_text.split('\n')
-    
-    sentiment_data = {}
-    sentiment_section_started = False
-    
-    for line in lines:
-        if '🎭 情绪分布:' in line:
-            sentiment_section_started = True
-            continue
-        elif sentiment_section_started and line.strip().startswith('✅ 正面:'):
-            # Extract from "   ✅ 正面: 24 条 (63.2%)"
-            pos_text = line.split('✅ 正面:')[1].strip()
-            pos_count = int(pos_text.split('条')[0].strip())
-            pos_pct_text = pos_text.split('(')[1].split(')')[0]
-            # Extract percentage value
-            pos_pct_value = float(pos_pct_text.replace('%', ''))
-            sentiment_data['POSITIVE'] = {'count': pos_count, 'pct': pos_pct_text, 'pct_value': pos_pct_value}
-        elif sentiment_section_started and line.strip().startswith('❌ 负面:'):
-            # Extract from "   ❌ 负面: 7 条 (18.4%)"
-            neg_text = line.split('❌ 负面:')[1].strip()
-            neg_count = int(neg_text.split('条')[0].strip())
-            neg_pct_text = neg_text.split('(')[1].split(')')[0]
-            neg_pct_value = float(neg_pct_text.replace('%', ''))
-            sentiment_data['NEGATIVE'] = {'count': neg_count, 'pct': neg_pct_text, 'pct_value': neg_pct_value}
-        elif sentiment_section_started and line.strip().startswith('⚪ 中性:'):
-            # Extract from "   ⚪ 中性: 7 条 (18.4%)"
-            neu_text = line.split('⚪ 中性:')[1].strip()
-            neu_count = int(neu_text.split('条')[0].strip())
-            neu_pct_text = neu_text.split('(')[1].split(')')[0]
-            neu_pct_value = float(neu_pct_text.replace('%', ''))
-            sentiment_data['NEUTRAL'] = {'count': neu_count, 'pct': neu_pct_text, 'pct_value': neu_pct_value}
-        elif sentiment_section_started and line.strip() and not line.strip().startswith('   '):
-            # End of sentiment section
-            break
-    
-    if not sentiment_data:
+    total = sum(sentiment_summary.values())
+    if total == 0:
         return ""
     
-    # Get data with defaults
-    pos_data = sentiment_data.get('POSITIVE', {'count': 0, 'pct': '0%', 'pct_value': 0})
-    neg_data = sentiment_data.get('NEGATIVE', {'count': 0, 'pct': '0%', 'pct_value': 0})
-    neu_data = sentiment_data.get('NEUTRAL', {'count': 0, 'pct': '0%', 'pct_value': 0})
+    def bar_data(key):
+        count = sentiment_summary.get(key, 0)
+        pct_value = count / total * 100
+        return {'count': count, 'pct': f"{pct_value:.1f}%", 'pct_value': pct_value}
+    
+    pos_data = bar_data('POSITIVE')
+    neg_data = bar_data('NEGATIVE')
+    neu_data = bar_data('NEUTRAL')
     
     # Use actual percentage values for width calculation
     pos_width = pos_data['pct_value']
@@ -513,191 +455,188 @@ def create_vertical_sentiment_bars_from_output(output_text):
     
     return bars_html
 
-def parse_table_from_output(output_text, table_title):
-    """🆕 Parse table data directly from raw output text"""
-    lines = output_text.split('\n')
-    table_data = []
-    in_table = False
-    headers = []
-    
-    for i, line in enumerate(lines):
-        # Find the table start
-        if table_title in line:
-            in_table = True
-            # Look for header line (next few lines)
-            for j in range(i+1, min(i+5, len(lines))):
-                if '|' in lines[j] and '用户名' in lines[j]:
-                    header_line = lines[j].strip()
-                    headers = [h.strip() for h in header_line.split('|')]
-                    break
-            continue
-        
-        # Process table rows
-        if in_table and line.strip():
-            # Stop when we hit next section
-            if line.startswith('👑') or line.startswith('🔍') or line.startswith('💰') or line.startswith('==='):
-                break
-            
-            # Skip separator lines
-            if '---' in line or '===' in line:
-                continue
-            
-            # Process data rows
-            if '|' in line and '@' in line and 'https://' in line:
-                row_data = [cell.strip() for cell in line.split('|')]
-                if len(row_data) >= 7:  # Ensure we have enough columns
-                    table_data.append(row_data)
-    
-    return headers, table_data
+def build_viral_table(viral_tweets):
+    """Viral tweets table (same columns and ordering as the printed report)"""
+    rows = []
+    for tweet in sorted(viral_tweets, key=lambda x: x['viral']['viral_index'], reverse=True)[:6]:
+        engagement = tweet['engagement']
+        rows.append([
+            f"@{tweet['user']}",
+            f"{tweet['viral']['viral_index']:.1f}",
+            f"{engagement['likes']:,}",
+            f"{engagement['retweets']:,}",
+            f"{engagement['replies']:,}",
+            tweet['sentiment']['sentiment'],
+            tweet.get('topic') or '未分类',
+            tweet.get('tweet_link', '')
+        ])
+    return pd.DataFrame(rows, columns=['用户名', '传播力', '点赞', '转推', '回复', '情绪', '话题', '推文链接'])
 
-def display_analysis_results(analysis_result, output_text):
-    """Display the analysis results in a structured format with enhanced price data"""
-    if not analysis_result:
-        st.error("分析失败或没有有效数据")
-        if output_text:
-            st.text(output_text)
+def build_influence_table(high_influence_tweets):
+    """High influence tweets table (same columns and ordering as the printed report)"""
+    rows = []
+    for tweet in sorted(high_influence_tweets, key=lambda x: x['influence']['influence_score'], reverse=True)[:8]:
+        followers_tier = tweet['influence']['followers_tier']
+        followers = followers_tier.split(': ')[1] if ': ' in followers_tier else followers_tier
+        rows.append([
+            f"@{tweet['user']}",
+            f"{tweet['influence']['influence_score']:.1f}",
+            followers,
+            tweet['sentiment']['sentiment'],
+            f"{tweet['viral']['viral_index']:.1f}",
+            tweet.get('topic') or '未分类',
+            tweet.get('tweet_link', '')
+        ])
+    return pd.DataFrame(rows, columns=['用户名', '影响力', '粉丝数', '情绪', '传播力', '话题', '推文链接'])
+
+def display_analysis_results(analysis_result, run_info):
+    """Display the analysis results directly from the result dict"""
+    token_symbol = run_info['token']
+    target_days = run_info['target_days']
+    
+    if run_info.get('error'):
+        st.error(f"分析过程中出现错误: {run_info['error']}")
         return
     
-    # Parse the output text to extract key information
-    lines = output_text.split('\n')
+    st.markdown(f'## 🔍 "{token_symbol}" 近{target_days}天推文情感分析')
     
-    # Extract basic info
-    header_line = next((line for line in lines if '近7天推文情感分析' in line), '')
-    tweet_count_line = next((line for line in lines if '原获取推文数量' in line), '')
+    if not analysis_result:
+        st.info(f"原获取推文数量: {run_info['total_tweets']}; 过滤后有效推文: 0")
+        st.error("❌ 过滤后无可分析推文，请检查其他社群资讯")
+        return
     
-    if header_line and tweet_count_line:
-        st.markdown(f"## {header_line}")
-        st.info(tweet_count_line)
+    st.info(f"原获取推文数量: {analysis_result.get('total_tweets', run_info['total_tweets'])}; "
+            f"过滤后有效推文: {analysis_result.get('effective_tweets', len(analysis_result['tweet_analyses']))}")
     
-    # 🆕 Display enhanced price data (fixed for multi-line indented format)
-    price_html = parse_and_display_price_data(output_text)
+    # Price data
+    price_stats = analysis_result.get('price_aware_stats', {})
+    price_html = build_price_html(price_stats.get('price_context') if price_stats.get('price_data_available') else None)
     if price_html:
         st.markdown(price_html, unsafe_allow_html=True)
     else:
-        st.warning("⚠️ 未找到价格数据格式")
+        st.warning("⚠️ 价格数据: 未获取到有效数据")
     
-    # 🆕 Display sentiment distribution using vertical bars
+    # Sentiment distribution
     st.markdown("### 🎭 情绪分布")
-    
-    # Use the new vertical bars function
-    vertical_bars_html = create_vertical_sentiment_bars_from_output(output_text)
+    vertical_bars_html = build_sentiment_bars_html(analysis_result['sentiment_summary'])
     if vertical_bars_html:
         st.markdown(vertical_bars_html, unsafe_allow_html=True)
     else:
-        st.warning("⚠️ 未找到情感分析数据格式")
-        st.text("期望格式:")
-        st.text("🎭 情绪分布:")
-        st.text("   ✅ 正面: X 条 (Y%)")
-        st.text("   ❌ 负面: X 条 (Y%)")
-        st.text("   ⚪ 中性: X 条 (Y%)")
-    
-    # Display AI summary
-    ai_summary_started = False
-    ai_summary_lines = []
-    for line in lines:
-        if '🤖 AI 智能分析摘要:' in line:
-            ai_summary_started = True
-            continue
-        elif ai_summary_started and '======' in line:
-            continue
-        elif ai_summary_started and line.strip() and not line.startswith('📈'):
-            ai_summary_lines.append(line.strip())
-        elif ai_summary_started and line.startswith('📈'):
-            break
-    
-    if ai_summary_lines:
+        st.warning("⚠️ 暂无情感分析数据")
+    
+    # AI summary
+    ai_summary = analysis_result.get('ai_summary')
+    if ai_summary:
         st.markdown("### 🤖 AI 智能分析摘要")
         with st.expander("查看详细分析", expanded=True):
-            for line in ai_summary_lines:
-                # Check if line starts with a number (numbered list item)
-                if line.strip() and line.strip()[0].isdigit() and '. ' in line[:5]:
-                    st.markdown(f"**{line.strip()}**")
+            for line in ai_summary.split('\n'):
+                line = line.strip()
+                if not line:
+                    continue
+                # Numbered list items in bold
+                if line[0].isdigit() and '. ' in line[:5]:
+                    st.markdown(f"**{line}**")
                 else:
-                    st.markdown(line.strip())
-    
-    # Display topic analysis
-    topics_started = False
-    topic_lines = []
-    for line in lines:
-        if '📈 热门话题榜:' in line:
-            topics_started = True
-            continue
-        elif topics_started and '🔥' in line:
-            break
-        elif topics_started and line.strip():
-            topic_lines.append(line.strip())
-    
-    if topic_lines:
+                    st.markdown(line)
+    
+    # Topic analysis
+    bulk_topics = analysis_result.get('bulk_topics', [])
+    if bulk_topics:
         st.markdown("### 📈 热门话题榜")
-        for line in topic_lines:
-            if 'AI智能话题分析:' in line:
-                continue
-            elif line and any(char.isdigit() for char in line[:5]):
-                st.text(line)
+        for i, topic in enumerate(bulk_topics[:6]):
+            bar = '█' * min(int(topic['count']/2), 8) + '▁' * max(0, 8 - int(topic['count']/2))
+            st.text(f"{i+1:2d}. {topic['name']:<15} {bar} ({topic['count']}条)")
+    
+    link_column = {
+        "推文链接": st.column_config.LinkColumn(
+            "推文链接",
+            help="点击查看原推文",
+            display_text="查看推文"
+        )
+    }
     
-    # Parse and display viral tweets directly from raw output
     st.markdown("### 🔥 病毒式传播推文")
-    viral_headers, viral_data = parse_table_from_output(output_text, "🔥 病毒式传播推文")
-    
-    if viral_data:
-        # Convert to DataFrame
-        df_viral = pd.DataFrame(viral_data, columns=viral_headers if viral_headers else 
-                               ['用户名', '传播力', '点赞', '转推', '回复', '情绪', '话题', '推文链接'])
-        
-        # Display with clickable links using st.dataframe with column configuration
-        st.dataframe(
-            df_viral,
-            use_container_width=True,
-            column_config={
-                "推文链接": st.column_config.LinkColumn(
-                    "推文链接",
-                    help="点击查看原推文",
-                    display_text="查看推文"
-                )
-            }
-        )
+    if analysis_result.get('viral_tweets'):
+        st.dataframe(build_viral_table(analysis_result['viral_tweets']),
+                     use_container_width=True, column_config=link_column)
     else:
         st.info("暂无符合条件的病毒式传播推文")
     
-    # Parse and display high influence tweets directly from raw output
     st.markdown("### 👑 高影响力用户动态")
-    influence_headers, influence_data = parse_table_from_output(output_text, "👑 高影响力用户动态")
-    
-    if influence_data:
-        # Convert to DataFrame
-        df_influence = pd.DataFrame(influence_data, columns=influence_headers if influence_headers else 
-                                  ['用户名', '影响力', '粉丝数', '情绪', '传播力', '话题', '推文链接'])
-        
-        # Display with clickable links using st.dataframe with column configuration
-        st.dataframe(
-            df_influence,
-            use_container_width=True,
-            column_config={
-                "推文链接": st.column_config.LinkColumn(
-                    "推文链接", 
-                    help="点击查看原推文",
-                    display_text="查看推文"
-                )
-            }
-        )
+    if analysis_result.get('high_influence_tweets'):
+        st.dataframe(build_influence_table(analysis_result['high_influence_tweets']),
+                     use_container_width=True, column_config=link_column)
     else:
         st.info("暂无符合条件的高影响力用户推文")
 
-def extract_tweet_link_from_output(output_text, username):
-    """Extract tweet link for a specific user from the raw output"""
-    lines = output_text.split('\n')
-    
-    # Look for lines containing the username and extract the link
-    for i, line in enumerate(lines):
-        if f"@{username}" in line and "https://x.com" in line:
-            # Extract the link from the line
-            parts = line.split('|')
-            for part in parts:
-                part = part.strip()
-                if part.startswith('https://x.com'):
-                    return part
-    
-    return "N/A"
+PROGRESS_STAGE_LABELS = {
+    'started': "🚀 任务已开始...",
+    'fetching': "📡 正在获取推文数据...",
+    'fetched': "🧹 正在过滤推文...",
+    'filtered': "🤖 正在进行AI情绪分析...",
+    'classifying': "🤖 正在进行AI情绪分析...",
+    'topics': "📝 正在生成AI摘要...",
+    'summary': "📊 正在汇总结果..."
+}
+
+def display_partial_results(job):
+    """Progress and the aggregates available so far for a running job"""
+    partial = job['partial']
+    token_symbol, _ = job['key']
+    st.markdown(f'## ⏳ "{token_symbol}" 分析进行中')
+    
+    done, total = partial.get('done', 0), partial.get('total', 0)
+    st.progress(done / total if total else 0.0, text=PROGRESS_STAGE_LABELS.get(job['stage'], "⏳ 排队中..."))
+    
+    if 'total_tweets' in partial:
+        counts = f"原获取推文数量: {partial['total_tweets']}"
+        if 'effective_tweets' in partial:
+            counts += f"; 过滤后有效推文: {partial['effective_tweets']}"
+        if total:
+            counts += f"; 已分析: {done}/{total}"
+        st.info(counts)
+    
+    price_html = build_price_html(partial.get('price_context'))
+    if price_html:
+        st.markdown(price_html, unsafe_allow_html=True)
+    
+    if partial.get('sentiment_summary'):
+        st.markdown("### 🎭 情绪分布 (实时)")
+        bars_html = build_sentiment_bars_html(partial['sentiment_summary'])
+        if bars_html:
+            st.markdown(bars_html, unsafe_allow_html=True)
+    
+    if partial.get('viral_tweets'):
+        st.markdown("### 🔥 病毒式传播推文 (实时)")
+        st.dataframe(build_viral_table(partial['viral_tweets']), use_container_width=True)
+
+def watch_job(job_id, debug_output=False):
+    """Render a background job; reruns the page until the job finishes"""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        st.warning("⚠️ 分析任务不存在或已过期，请重新开始分析")
+        del st.query_params['job']
+        return
+    
+    if job['status'] == JOB_ERROR:
+        st.error(f"分析任务失败: {job['error'].splitlines()[0] if job['error'] else '未知错误'}")
+        with st.expander("🔍 查看错误详情"):
+            st.text(job['error'])
+        return
+    
+    if job['status'] != JOB_DONE:
+        display_partial_results(job)
+        time.sleep(JOB_CONFIG['poll_interval_seconds'])
+        st.rerun()
+    
+    st.markdown("---")
+    result = job['result']
+    display_analysis_results(result['analysis_result'], result['run_info'])
+    
+    # Raw report only when requested (or when something went wrong)
+    if debug_output or result['run_info'].get('error'):
+        with st.expander("🔍 查看原始分析输出"):
+            st.text(result['output_text'] or "未生成文本报告 (提交任务时未开启调试输出)")
 
 def main():
     # Header
@@ -720,6 +659,11 @@ def main():
         st.info("分析时间范围: 近7天")
         st.info("数据来源: Twitter API")
         st.info("AI模型: GPT-4o-mini")
+        
+        debug_output = st.checkbox("🔍 显示原始分析输出 (调试)", value=False,
+                                   help="额外生成文本报告，仅用于调试")
+        force_refresh = st.checkbox("🔄 强制刷新 (忽略缓存)", value=False,
+                                    help=f"默认复用{RESULT_CACHE_CONFIG['ttl_minutes']}分钟内的分析结果")
     
     # Main input section
     col1, col2 = st.columns([2, 1])
@@ -741,27 +685,29 @@ def main():
             st.error("请输入有效的代币符号 (2-10个字符)")
             return
         
-        # Show progress
-        with st.spinner(f'正在分析 {token_symbol} 的推文情感...'):
-            progress_text = st.empty()
-            progress_text.text("📡 正在获取推文数据...")
-            
-            # Run analysis
-            analysis_result, output_text = capture_analysis_output(token_symbol)
-            
-            progress_text.text("🤖 正在进行AI分析...")
-            
-        # Display results
-        st.markdown("---")
-        display_analysis_results(analysis_result, output_text)
-        
-        # Show raw output in expandable section for debugging
-        with st.expander("🔍 查看原始分析输出"):
-            st.text(output_text)
+        # Debug output needs a real run to capture the printed report
+        cached = None if force_refresh or debug_output else get_cached_analysis(token_symbol)
+        if cached:
+            if 'job' in st.query_params:
+                del st.query_params['job']
+            analysis_result, run_info, cached_at = cached
+            st.markdown("---")
+            minutes_ago = int((time.time() - cached_at) / 60)
+            st.caption(f"♻️ 显示 {minutes_ago} 分钟前的缓存结果，勾选侧栏“强制刷新”可重新分析")
+            display_analysis_results(analysis_result, run_info)
+        else:
+            # Runs in the background; the job id in the URL lets a refreshed page keep watching it
+            job_id = get_job_manager().submit((token_symbol, debug_output), analysis_job,
+                                              token_symbol, debug_output=debug_output)
+            st.query_params['job'] = job_id
+            watch_job(job_id, debug_output)
     
     elif analyze_button and not token_symbol:
         st.error("请输入代币符号")
     
+    elif 'job' in st.query_params:
+        watch_job(st.query_params['job'], debug_output)
+    
     # Footer
     st.markdown("---")
     st.markdown(
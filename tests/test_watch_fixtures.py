@@ -0,0 +1,89 @@
+# tests/test_watch_fixtures.py
+"""
+Offline replay of recorded watch fixtures (no network, no OpenAI)
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from analysis.sentiment import CryptoSentimentAnalyzer
+from analysis.watcher import TokenWatcher
+from api.fixtures import FixtureTweetSource, fixture_path
+
+FIXTURES_DIR = os.path.join(ROOT, 'tests', 'fixtures')
+
+
+def recorded_times(token_symbol):
+    with open(fixture_path(FIXTURES_DIR, token_symbol), 'r', encoding='utf-8') as f:
+        return [record['recorded_at'] for record in map(json.loads, f) if record['kind'] == 'tweets']
+
+
+class WatchFixtureReplayTest(unittest.TestCase):
+    def setUp(self):
+        # Analyzer caches (author reputation etc.) are written relative to the working directory
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp_dir.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp_dir.cleanup()
+
+    def make_watcher(self):
+        analyzer = CryptoSentimentAnalyzer(openai_api_key=None, silent_mode=True)
+        return TokenWatcher(analyzer, FixtureTweetSource(FIXTURES_DIR),
+                            state_path=os.path.join(self.tmp_dir.name, 'watch_state.json'), window_days=7)
+
+    def test_source_clock_follows_recording(self):
+        source = FixtureTweetSource(FIXTURES_DIR)
+        first, second = recorded_times('BTC')
+        self.assertEqual(source.current_time('BTC'), first)
+        source.fetch_new_tweets('BTC', None, {}, 1)
+        self.assertEqual(source.current_time('BTC'), second)
+        source.fetch_new_tweets('BTC', None, {}, 1)
+        self.assertEqual(source.current_time('BTC'), second)
+
+    def test_only_current_watchlist_is_refreshed(self):
+        previous = self.make_watcher()
+        previous.add_token('BTC', 60)
+        previous.add_token('ETH', 60)
+
+        # A restart with ETH dropped from the watchlist keeps its state but never refreshes it
+        watcher = self.make_watcher()
+        watcher.add_token('BTC', 60)
+        self.assertEqual(watcher.tokens(), ['BTC'])
+        self.assertEqual(watcher.due_tokens(), ['BTC'])
+        self.assertIsNotNone(watcher.get_snapshot('ETH'))
+
+    def test_replay_classifies_recorded_tweets(self):
+        watcher = self.make_watcher()
+        watcher.add_token('BTC', 60)
+
+        first = watcher.refresh('BTC')
+        self.assertEqual(first['new_tweets'], 4)
+        self.assertEqual(first['classified'], 4)
+
+        # The second batch repeats one tweet, only the unseen ones are classified
+        second = watcher.refresh('BTC')
+        self.assertEqual(second['new_tweets'], 2)
+        self.assertEqual(second['classified'], 2)
+        self.assertEqual(second['aggregates']['effective_tweets'], 6)
+
+        exhausted = watcher.refresh('BTC')
+        self.assertEqual(exhausted['new_tweets'], 0)
+        self.assertEqual(exhausted['aggregates']['effective_tweets'], 6)
+
+        snapshot = watcher.get_snapshot('BTC')
+        self.assertEqual(snapshot['last_refresh_at'], recorded_times('BTC')[-1])
+        self.assertEqual(snapshot['price_context']['price_usd'], 61020.0)
+        self.assertEqual(sum(snapshot['aggregates']['sentiment_summary'].values()), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
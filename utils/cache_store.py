@@ -0,0 +1,145 @@
+# utils/cache_store.py
+"""
+Small JSON-file backed key/value store with TTL for persistent caches
+"""
+
+import json
+import os
+import threading
+import time
+
+from .singleflight import FileLock
+
+_MISSING = object()
+
+# Saves from other processes hold the lock only for a read-merge-write
+SAVE_LOCK_TIMEOUT_SECONDS = 10
+
+
+class JsonFileStore:
+    """Key/value records persisted as one JSON file
+
+    save() re-reads the file under a lock and merges per key, so several
+    processes (or long-lived instances) sharing a file only overwrite the
+    keys they actually set or deleted.
+    """
+
+    def __init__(self, file_path, ttl_seconds=None):
+        self.file_path = file_path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.RLock()
+        self._data = {}
+        self._dirty = False
+        self._changed = set()
+        self._deleted = set()
+        self.load()
+
+    def _is_expired(self, record, now=None):
+        if not self.ttl_seconds:
+            return False
+        now = now if now is not None else time.time()
+        return now - record.get('updated_at', 0) > self.ttl_seconds
+
+    def _read_file(self):
+        """Unexpired records currently on disk"""
+        if not self.file_path or not os.path.exists(self.file_path):
+            return {}
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # A corrupt cache file is treated as empty and rewritten on the next save
+            return {}
+        if not isinstance(data, dict):
+            return {}
+
+        now = time.time()
+        return {key: record for key, record in data.items()
+                if isinstance(record, dict) and 'value' in record and not self._is_expired(record, now)}
+
+    def load(self):
+        """Load entries from disk, dropping expired ones"""
+        with self._lock:
+            self._data = self._read_file()
+            self._changed.clear()
+            self._deleted.clear()
+
+    def get(self, key, default=None):
+        with self._lock:
+            record = self._data.get(key)
+            if record is None:
+                return default
+            if self._is_expired(record):
+                del self._data[key]
+                self._dirty = True
+                return default
+            return record['value']
+
+    def get_record(self, key):
+        """Return {'value', 'updated_at'} for key or None"""
+        with self._lock:
+            if self.get(key, _MISSING) is _MISSING:
+                return None
+            return dict(self._data[key])
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = {'value': value, 'updated_at': time.time()}
+            self._changed.add(key)
+            self._deleted.discard(key)
+            self._dirty = True
+
+    def delete(self, key):
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self._changed.discard(key)
+                self._deleted.add(key)
+                self._dirty = True
+
+    def keys(self):
+        with self._lock:
+            return list(self._data.keys())
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def prune(self):
+        """Drop expired entries, returns the number removed"""
+        with self._lock:
+            now = time.time()
+            expired = [key for key, record in self._data.items() if self._is_expired(record, now)]
+            for key in expired:
+                del self._data[key]
+            if expired:
+                self._dirty = True
+            return len(expired)
+
+    def save(self):
+        """Merge local changes into the file on disk and write it atomically, if anything changed"""
+        with self._lock:
+            if not self._dirty or not self.file_path:
+                return
+            directory = os.path.dirname(self.file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            with FileLock(f"{self.file_path}.lock", timeout_seconds=SAVE_LOCK_TIMEOUT_SECONDS):
+                # Entries written by other processes since our load are kept; ours win unless theirs are newer
+                merged = self._read_file()
+                for key in self._deleted:
+                    merged.pop(key, None)
+                for key in self._changed:
+                    record = self._data.get(key)
+                    if record is not None and record['updated_at'] >= merged.get(key, {}).get('updated_at', 0):
+                        merged[key] = record
+
+                tmp_path = f"{self.file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(merged, f, ensure_ascii=False)
+                os.replace(tmp_path, self.file_path)
+
+            self._data = merged
+            self._changed.clear()
+            self._deleted.clear()
+            self._dirty = False
@@ -0,0 +1,27 @@
+# utils/concurrency.py
+"""
+Process-wide concurrency caps for external services (RapidAPI, OpenAI, CoinEx)
+"""
+
+import threading
+
+from config import CONCURRENCY_CONFIG
+
+_semaphores = {}
+_semaphores_lock = threading.Lock()
+
+
+def service_slot(service):
+    """Semaphore bounding concurrent calls to a service, use as `with service_slot('openai'):`
+
+    Shared by every analyzer and worker thread in the process, so batch
+    runs stay under the provider limits however many tokens run at once.
+    """
+    semaphore = _semaphores.get(service)
+    if semaphore is None:
+        with _semaphores_lock:
+            semaphore = _semaphores.get(service)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(CONCURRENCY_CONFIG[service])
+                _semaphores[service] = semaphore
+    return semaphore
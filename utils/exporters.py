@@ -0,0 +1,182 @@
+# utils/exporters.py
+"""
+Structured export of comprehensive analysis results (JSON / JSONL / Parquet)
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+
+EXPORT_SCHEMA_VERSION = 1
+
+# Fixed per-tweet columns so JSONL/Parquet consumers get the same schema every run
+TWEET_COLUMNS = [
+    'token', 'tweet_num', 'tweet_id', 'tweet_link', 'created_at', 'user', 'text_preview',
+    'sentiment', 'sentiment_score', 'confidence', 'price_influenced', 'topic',
+    'influence_score', 'followers_tier', 'viral_index', 'weighted_impact',
+    'likes', 'retweets', 'replies', 'quotes', 'bookmarks', 'views'
+]
+
+
+def to_json_safe(value):
+    """Convert numpy scalars, sets, datetimes and non-string keys to plain JSON types"""
+    if isinstance(value, dict):
+        return {str(key): to_json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = sorted(value) if isinstance(value, (set, frozenset)) else value
+        return [to_json_safe(item) for item in items]
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, 'item') and callable(value.item):
+        # numpy scalar
+        return value.item()
+    if hasattr(value, 'tolist') and callable(value.tolist):
+        # numpy array
+        return to_json_safe(value.tolist())
+    return value
+
+
+def _as_int(value):
+    """Metric counts come as ints or strings like '1,234' / 'N/A'"""
+    if isinstance(value, str):
+        try:
+            return int(value.replace(',', ''))
+        except ValueError:
+            return 0
+    return int(value or 0)
+
+
+def tweet_rows(result):
+    """Flatten result['tweet_analyses'] into one record per tweet with TWEET_COLUMNS"""
+    token = result.get('token')
+    rows = []
+    for tweet in result.get('tweet_analyses', []):
+        sentiment = tweet.get('sentiment') or {}
+        influence = tweet.get('influence') or {}
+        viral = tweet.get('viral') or {}
+        impact = tweet.get('weighted_impact') or {}
+        engagement = tweet.get('engagement') or {}
+        rows.append({
+            'token': token,
+            'tweet_num': tweet.get('tweet_num'),
+            'tweet_id': str(tweet.get('tweet_id')),
+            'tweet_link': tweet.get('tweet_link'),
+            'created_at': tweet.get('created_at'),
+            'user': tweet.get('user'),
+            'text_preview': tweet.get('text_preview'),
+            'sentiment': sentiment.get('sentiment'),
+            'sentiment_score': sentiment.get('sentiment_score'),
+            'confidence': sentiment.get('confidence'),
+            'price_influenced': bool(sentiment.get('price_influenced', False)),
+            'topic': tweet.get('topic'),
+            'influence_score': influence.get('influence_score'),
+            'followers_tier': influence.get('followers_tier'),
+            'viral_index': viral.get('viral_index'),
+            'weighted_impact': impact.get('weighted_impact'),
+            'likes': _as_int(engagement.get('likes', 0)),
+            'retweets': _as_int(engagement.get('retweets', 0)),
+            'replies': _as_int(engagement.get('replies', 0)),
+            'quotes': _as_int(engagement.get('quotes', 0)),
+            'bookmarks': _as_int(engagement.get('bookmarks', 0)),
+            'views': _as_int(engagement.get('views', 0))
+        })
+    return to_json_safe(rows)
+
+
+def build_export(result):
+    """Schema-stable document for a comprehensive_analysis_silent result"""
+    price_stats = result.get('price_aware_stats', {})
+    tweets = tweet_rows(result)
+
+    document = {
+        'schema_version': EXPORT_SCHEMA_VERSION,
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'token': result.get('token'),
+        'target_days': result.get('target_days'),
+        'total_tweets': result.get('total_tweets'),
+        'effective_tweets': result.get('effective_tweets'),
+        'sentiment_summary': result.get('sentiment_summary', {}),
+        'total_weighted_impact': result.get('total_weighted_impact', 0),
+        'price': {
+            'available': bool(price_stats.get('price_data_available')),
+            'context': price_stats.get('price_context'),
+            'price_influenced_count': price_stats.get('price_influenced_count', 0),
+            'price_influence_rate': price_stats.get('price_influence_rate', 0)
+        },
+        'ai_summary': result.get('ai_summary'),
+        'topics': [{'name': topic.get('name'), 'count': topic.get('count', 0),
+                    'tweet_numbers': topic.get('tweet_numbers', '')}
+                   for topic in result.get('bulk_topics', [])],
+        'topic_sentiment_analysis': result.get('topic_sentiment_analysis', {}),
+        'high_influence_tweet_ids': [str(tweet.get('tweet_id')) for tweet in result.get('high_influence_tweets', [])],
+        'viral_tweet_ids': [str(tweet.get('tweet_id')) for tweet in result.get('viral_tweets', [])],
+        'filtering_stats': result.get('filtering_stats', {}),
+        'blocked_category_counts': result.get('blocked_category_counts', {}),
+        'team_filter_stats': result.get('team_filter_stats', {}),
+        'exclusions': [{'tweet_num': entry.get('tweet_num'), 'user': entry.get('user'),
+                        'reason': entry.get('reason'), 'detailed_reason': entry.get('detailed_reason')}
+                       for entry in result.get('exclusion_reasons', [])],
+        'total_tokens_used': result.get('total_tokens_used', 0),
+        'tweets': tweets
+    }
+    return to_json_safe(document)
+
+
+def _atomic_write(path, write_func, mode='w'):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    kwargs = {'encoding': 'utf-8'} if 'b' not in mode else {}
+    with open(tmp_path, mode, **kwargs) as f:
+        write_func(f)
+    os.replace(tmp_path, path)
+
+
+def write_json(document, path):
+    """Atomically write an already JSON-safe document (e.g. a batch run summary)"""
+    document = to_json_safe(document)
+    _atomic_write(path, lambda f: json.dump(document, f, ensure_ascii=False, indent=2))
+    return path
+
+
+def export_json(result, path):
+    return write_json(build_export(result), path)
+
+
+def export_jsonl(result, path):
+    """One JSON object per tweet"""
+    rows = tweet_rows(result)
+
+    def write(f):
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+    _atomic_write(path, write)
+    return path
+
+
+def export_parquet(result, path):
+    """Columnar per-tweet table (needs pandas + pyarrow)"""
+    # Only imported when Parquet export is requested
+    import pandas as pd
+
+    df = pd.DataFrame(tweet_rows(result), columns=TWEET_COLUMNS)
+    _atomic_write(path, lambda f: df.to_parquet(f, index=False), mode='wb')
+    return path
+
+
+EXPORTERS = {
+    'json': export_json,
+    'jsonl': export_jsonl,
+    'parquet': export_parquet
+}
+
+
+def export_result(result, path, fmt=None):
+    """Export a result dict, format taken from fmt or the file extension"""
+    fmt = (fmt or os.path.splitext(path)[1].lstrip('.') or 'json').lower()
+    if fmt not in EXPORTERS:
+        raise ValueError(f"Unsupported export format: {fmt} (use {', '.join(EXPORTERS)})")
+    return EXPORTERS[fmt](result, path)
@@ -78,7 +78,8 @@ class ReportFormatter:
         print(f"\n🤖 AI 智能分析摘要:")
         print("   " + "="*50)
         try:
-            ai_summary = generate_summary_func(tweets_for_summary, token)
+            # Summary may already have been generated alongside classification
+            ai_summary = result['ai_summary'] if result.get('ai_summary') else generate_summary_func(tweets_for_summary, token)
             summary_lines = ai_summary.split('\n')
             for line in summary_lines:
                 if line.strip():
@@ -188,6 +189,7 @@ class ReportFormatter:
         # Enhanced grouping with team accounts (logic preserved)
         filter_groups = {
             '新闻账户': [],
+            '屏蔽账户': [],
             '团队账户': [],
             '基础垃圾': [],
             'AI垃圾': [],
@@ -197,6 +199,8 @@ class ReportFormatter:
         for reason in exclusion_reasons:
             if "News account" in reason['reason']:
                 filter_groups['新闻账户'].append(reason)
+            elif "Blocked account" in reason['reason']:
+                filter_groups['屏蔽账户'].append(reason)
             elif "Team account" in reason['reason']:
                 filter_groups['团队账户'].append(reason)
             elif "Basic spam" in reason['reason']:
@@ -315,6 +319,8 @@ class ReportFormatter:
         print(f"🔍 数据质量统计:")
         print(f"   📥 原始推文: {tweet_count + filtering_stats.get('total_filtered', 0)} 条")
         print(f"   🗞️  新闻过滤: {filtering_stats.get('news_accounts', 0)} 条")
+        if filtering_stats.get('blocked_accounts', 0):
+            print(f"   ⛔ 屏蔽账户: {filtering_stats['blocked_accounts']} 条")
         
         # Show team filtering if enabled
         if team_filter_stats.get('enabled', False):
@@ -386,7 +392,8 @@ class ReportFormatter:
         print(f"\n🤖 AI 智能分析摘要:")
         print("   " + "="*50)
         try:
-            ai_summary = generate_summary_func(tweets_for_summary, token)
+            # Summary may already have been generated alongside classification
+            ai_summary = result['ai_summary'] if result.get('ai_summary') else generate_summary_func(tweets_for_summary, token)
             summary_lines = ai_summary.split('\n')
             for line in summary_lines:
                 if line.strip():
@@ -123,4 +123,25 @@ def deduplicate_tweets_by_id(tweets):
             # If we can't extract ID, include the tweet anyway
             unique_tweets.append(tweet)
     
-    return unique_tweets
\ No newline at end of file
+    return unique_tweets
+
+
+def parse_token_list(tokens_arg=None, tokens_file=None):
+    """Token symbols from a comma list and/or a file (one or more per line, # comments), uppercased and de-duplicated"""
+    tokens = []
+    if tokens_arg:
+        tokens.extend(tokens_arg.split(','))
+    if tokens_file:
+        with open(tokens_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if line:
+                    tokens.extend(line.replace(',', ' ').split())
+
+    seen, unique = set(), []
+    for token in tokens:
+        token = token.strip().upper()
+        if token and token not in seen:
+            seen.add(token)
+            unique.append(token)
+    return unique
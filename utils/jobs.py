@@ -0,0 +1,122 @@
+# utils/jobs.py
+"""
+Background analysis jobs with pollable progress, independent of any UI session
+"""
+
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_ERROR = 'error'
+
+
+class JobManager:
+    """Runs jobs on a bounded thread pool and keeps their state for polling
+
+    A job function is called as func(*args, progress=callback, **kwargs);
+    each callback(stage, data) merges data into the job's partial results,
+    so pollers can render aggregates before the job finishes. Jobs outlive
+    the request or browser session that submitted them, and a running job
+    for the same key is reused instead of starting another one.
+    """
+
+    def __init__(self, max_workers=2, ttl_seconds=3600):
+        self.ttl_seconds = ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analysis-job')
+        self._jobs = {}
+        self._active_by_key = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key, func, *args, **kwargs):
+        """Start a job (or join the active one for key), returns the job id"""
+        with self._lock:
+            self._prune_locked()
+            active_id = self._active_by_key.get(key)
+            if active_id is not None:
+                return active_id
+
+            job_id = uuid.uuid4().hex[:12]
+            now = time.time()
+            self._jobs[job_id] = {
+                'job_id': job_id,
+                'key': key,
+                'status': JOB_QUEUED,
+                'stage': None,
+                'partial': {},
+                'result': None,
+                'error': None,
+                'created_at': now,
+                'updated_at': now,
+                'finished_at': None
+            }
+            self._active_by_key[key] = job_id
+
+        self._executor.submit(self._run, job_id, func, args, kwargs)
+        return job_id
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.update(fields)
+            job['updated_at'] = time.time()
+
+    def _progress_callback(self, job_id):
+        def progress(stage, data=None):
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    return
+                job['stage'] = stage
+                job['partial'].update(data or {})
+                job['updated_at'] = time.time()
+        return progress
+
+    def _run(self, job_id, func, args, kwargs):
+        self._update(job_id, status=JOB_RUNNING, stage='started')
+        try:
+            result = func(*args, progress=self._progress_callback(job_id), **kwargs)
+            self._update(job_id, status=JOB_DONE, stage='done', result=result, finished_at=time.time())
+        except Exception as e:
+            self._update(job_id, status=JOB_ERROR, error=f"{e}\n{traceback.format_exc()}", finished_at=time.time())
+        finally:
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job and self._active_by_key.get(job['key']) == job_id:
+                    del self._active_by_key[job['key']]
+
+    def get(self, job_id):
+        """Snapshot of a job's state, None for unknown or expired ids"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = dict(job)
+            snapshot['partial'] = dict(job['partial'])
+            return snapshot
+
+    def find_active(self, key):
+        """Id of the queued/running job for key, if any"""
+        with self._lock:
+            return self._active_by_key.get(key)
+
+    def list_jobs(self):
+        with self._lock:
+            return [{field: job[field] for field in ('job_id', 'key', 'status', 'stage', 'created_at', 'updated_at')}
+                    for job in self._jobs.values()]
+
+    def _prune_locked(self):
+        cutoff = time.time() - self.ttl_seconds
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job['finished_at'] is not None and job['finished_at'] < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def shutdown(self, wait=False):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,57 @@
+# utils/output_capture.py
+"""
+Per-thread capture of printed output without swapping the process-wide streams
+"""
+
+import io
+import sys
+import threading
+from contextlib import contextmanager
+
+_install_lock = threading.Lock()
+
+
+class ThreadLocalStream:
+    """Stream proxy: writes go to the current thread's capture buffer, otherwise to the wrapped stream"""
+
+    def __init__(self, original):
+        self.original = original
+        self._local = threading.local()
+
+    def _target(self):
+        buffer = getattr(self._local, 'buffer', None)
+        return buffer if buffer is not None else self.original
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self.original, name)
+
+
+def install_thread_local_output():
+    """Wrap sys.stdout/sys.stderr in ThreadLocalStream proxies (idempotent)"""
+    with _install_lock:
+        for name in ('stdout', 'stderr'):
+            stream = getattr(sys, name)
+            if not isinstance(stream, ThreadLocalStream):
+                setattr(sys, name, ThreadLocalStream(stream))
+
+
+@contextmanager
+def capture_output():
+    """Collect stdout/stderr written by this thread into a StringIO; other threads are unaffected"""
+    install_thread_local_output()
+    buffer = io.StringIO()
+    proxies = [stream for stream in (sys.stdout, sys.stderr) if isinstance(stream, ThreadLocalStream)]
+    previous = [getattr(proxy._local, 'buffer', None) for proxy in proxies]
+    for proxy in proxies:
+        proxy._local.buffer = buffer
+    try:
+        yield buffer
+    finally:
+        for proxy, prior in zip(proxies, previous):
+            proxy._local.buffer = prior
@@ -0,0 +1,90 @@
+# utils/result_cache.py
+"""
+Disk cache of per-token analysis results shared across sessions and processes
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from .exporters import to_json_safe
+
+
+def config_version(*configs, prompt_version=1):
+    """Short fingerprint of the settings that change analysis output"""
+    payload = json.dumps([to_json_safe(config) for config in configs] + [prompt_version],
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
+
+
+class ResultCache:
+    """One JSON file per (token, target_days, version) with a TTL on file age"""
+
+    def __init__(self, cache_dir='data/cache/results', ttl_seconds=1800, version=''):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.version = version
+
+    def _path(self, token_symbol, target_days):
+        token = re.sub(r'[^A-Z0-9_-]', '_', token_symbol.upper())
+        return os.path.join(self.cache_dir, f"{token}_{target_days}d_{self.version}.json")
+
+    def get(self, token_symbol, target_days):
+        """Cached entry {'value', 'updated_at'} if present and fresh, else None"""
+        path = self._path(token_symbol, target_days)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, token_symbol, target_days, value):
+        """Atomically store a value (converted to plain JSON types)"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(token_symbol, target_days)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'value': to_json_safe(value), 'updated_at': time.time()}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def invalidate(self, token_symbol, target_days):
+        try:
+            os.remove(self._path(token_symbol, target_days))
+        except OSError:
+            pass
+
+    def prune(self):
+        """Delete expired result files, returns the number removed"""
+        removed = 0
+        if not os.path.isdir(self.cache_dir):
+            return removed
+        now = time.time()
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if name.endswith('.json') and now - os.path.getmtime(path) > self.ttl_seconds:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+
+def default_result_cache():
+    """ResultCache from RESULT_CACHE_CONFIG (None when disabled), versioned by the analysis settings"""
+    from config import (RESULT_CACHE_CONFIG, ANALYSIS_CONFIG, SPAM_PATTERNS, TEAM_FILTER_CONFIG,
+                        SUMMARY_CONFIG, SAMPLING_CONFIG, TOPIC_CLUSTER_CONFIG)
+
+    if not RESULT_CACHE_CONFIG['enable_result_cache']:
+        return None
+    return ResultCache(
+        RESULT_CACHE_CONFIG['cache_dir'],
+        ttl_seconds=RESULT_CACHE_CONFIG['ttl_minutes'] * 60,
+        version=config_version(ANALYSIS_CONFIG, SPAM_PATTERNS, TEAM_FILTER_CONFIG, SUMMARY_CONFIG, SAMPLING_CONFIG,
+                               TOPIC_CLUSTER_CONFIG, prompt_version=RESULT_CACHE_CONFIG['prompt_version'])
+    )
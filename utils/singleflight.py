@@ -0,0 +1,145 @@
+# utils/singleflight.py
+"""
+Request coalescing: concurrent identical calls share one in-flight computation
+"""
+
+import hashlib
+import os
+import threading
+import time
+
+# File locks for cross-process coalescing (POSIX only)
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+
+class _Call:
+    __slots__ = ('done', 'value', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.waiters = 0
+
+
+class FileLock:
+    """Exclusive advisory lock on a file, released automatically if the holder dies"""
+
+    def __init__(self, path, timeout_seconds=None, poll_seconds=0.2):
+        self.path = path
+        self.timeout_seconds = timeout_seconds
+        self.poll_seconds = poll_seconds
+        self._file = None
+
+    def acquire(self):
+        """Block until locked, returns False on timeout (or when locking is unsupported)"""
+        if not FCNTL_AVAILABLE:
+            return False
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, 'a')
+        deadline = None if self.timeout_seconds is None else time.time() + self.timeout_seconds
+        while True:
+            try:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except OSError:
+                if deadline is not None and time.time() >= deadline:
+                    self._file.close()
+                    self._file = None
+                    return False
+                time.sleep(self.poll_seconds)
+
+    def release(self):
+        if self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.release()
+
+
+class SingleFlight:
+    """Runs func once per key at a time; concurrent callers wait and share the outcome
+
+    Within a process, followers block on the leader's call and get its
+    value (or its exception). With lock_dir set, leaders in different
+    processes also serialize on a per-key file lock; after taking it the
+    leader calls recheck() so a result another process just produced
+    (e.g. in a shared disk cache) is reused instead of recomputed.
+    """
+
+    def __init__(self, lock_dir=None, lock_timeout_seconds=900):
+        self.lock_dir = lock_dir
+        self.lock_timeout_seconds = lock_timeout_seconds
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.stats = {'leaders': 0, 'shared': 0, 'cross_process_reused': 0}
+
+    def _lock_path(self, key):
+        digest = hashlib.sha1(str(key).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.lock_dir, f"{digest}.lock")
+
+    def do(self, key, func, *args, recheck=None, **kwargs):
+        """Returns (value, shared) where shared is True if another caller computed it"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.stats['shared'] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.stats['leaders'] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value, shared = self._run_leader(key, func, args, kwargs, recheck)
+            return call.value, shared
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _run_leader(self, key, func, args, kwargs, recheck):
+        if not self.lock_dir:
+            return func(*args, **kwargs), False
+
+        file_lock = FileLock(self._lock_path(key), timeout_seconds=self.lock_timeout_seconds)
+        # On timeout (or without fcntl) compute anyway rather than fail the request
+        locked = file_lock.acquire()
+        try:
+            if recheck is not None:
+                value = recheck()
+                if value is not None:
+                    with self._lock:
+                        self.stats['cross_process_reused'] += 1
+                    return value, True
+            return func(*args, **kwargs), False
+        finally:
+            if locked:
+                file_lock.release()
+
+    def in_flight(self, key):
+        with self._lock:
+            return key in self._calls
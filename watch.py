@@ -0,0 +1,120 @@
+# watch.py
+"""
+Watch/daemon mode: keep a watchlist of tokens refreshed incrementally
+"""
+
+import argparse
+import signal
+import sys
+import threading
+
+from analysis.sentiment import CryptoSentimentAnalyzer
+from analysis.watcher import TokenWatcher
+from api.fixtures import LiveTweetSource, FixtureTweetSource
+from config import OPENAI_API_KEY, WATCH_CONFIG
+from utils.helpers import parse_token_list
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="持续监控代币推文情绪 (增量刷新)")
+    parser.add_argument('--tokens', help="逗号分隔的代币列表 (默认使用 WATCH_CONFIG['watchlist'])")
+    parser.add_argument('--tokens-file', help="每行一个代币符号的文件")
+    parser.add_argument('--interval', type=float, help="刷新间隔 (分钟), 覆盖配置")
+    parser.add_argument('--state', default=WATCH_CONFIG['state_path'], help="状态文件路径")
+    parser.add_argument('--fixtures', metavar='DIR', help="离线模式: 回放录制的数据, 不访问任何外部 API")
+    parser.add_argument('--record', metavar='DIR', help="将获取的推文和价格录制为离线数据")
+    parser.add_argument('--cycles', type=int, default=0,
+                        help="刷新轮数后退出, 每轮立即刷新所有代币 (0 = 按间隔持续运行)")
+    return parser.parse_args(argv)
+
+
+def load_watchlist(args):
+    """[(token, interval_seconds)] from the command line or WATCH_CONFIG"""
+    default_minutes = args.interval or WATCH_CONFIG['default_interval_minutes']
+    tokens = parse_token_list(args.tokens, args.tokens_file)
+    if tokens:
+        return [(token, default_minutes * 60) for token in tokens]
+    return [(entry['token'].upper(), (args.interval or entry.get('interval_minutes', default_minutes)) * 60)
+            for entry in WATCH_CONFIG['watchlist']]
+
+
+def print_refresh(summary):
+    aggregates = summary['aggregates']
+    sentiment = aggregates['sentiment_summary']
+    print(f"🔄 {summary['token']}: 新推文 {summary['new_tweets']}, 新分析 {summary['classified']}, "
+          f"窗口内有效 {aggregates['effective_tweets']} "
+          f"(正面 {sentiment['POSITIVE']} / 中性 {sentiment['NEUTRAL']} / 负面 {sentiment['NEGATIVE']}), "
+          f"用时 {summary['duration_seconds']}s")
+
+
+def run(watcher, cycles=0, poll_seconds=5, stop_event=None):
+    """Refresh due tokens until stopped (or for a fixed number of immediate cycles)"""
+    stop_event = stop_event or threading.Event()
+    cycle = 0
+    while not stop_event.is_set():
+        tokens = watcher.tokens() if cycles else watcher.due_tokens()
+        for token in tokens:
+            if stop_event.is_set():
+                break
+            try:
+                print_refresh(watcher.refresh(token))
+            except Exception as e:
+                print(f"❌ {token} 刷新失败: {e}")
+
+        if cycles:
+            cycle += 1
+            if cycle >= cycles:
+                break
+            continue
+
+        wait = watcher.seconds_until_next()
+        stop_event.wait(min(poll_seconds, wait) if wait is not None else poll_seconds)
+
+
+def main():
+    args = parse_args()
+    watchlist = load_watchlist(args)
+    if not watchlist:
+        print("❌ 监控列表为空, 请使用 --tokens 或配置 WATCH_CONFIG['watchlist']")
+        sys.exit(1)
+
+    if args.fixtures:
+        # Fully offline: recorded tweets/prices and no OpenAI client (neutral fallback classification)
+        source = FixtureTweetSource(args.fixtures)
+        analyzer = CryptoSentimentAnalyzer(openai_api_key=None, silent_mode=True)
+    else:
+        source = LiveTweetSource(record_dir=args.record)
+        analyzer = CryptoSentimentAnalyzer(openai_api_key=OPENAI_API_KEY, silent_mode=True)
+
+    watcher = TokenWatcher(
+        analyzer, source,
+        state_path=args.state,
+        window_days=WATCH_CONFIG['window_days'],
+        initial_max_pages=WATCH_CONFIG['initial_max_pages'],
+        refresh_max_pages=WATCH_CONFIG['refresh_max_pages'],
+        default_interval_seconds=WATCH_CONFIG['default_interval_minutes'] * 60
+    )
+    for token, interval_seconds in watchlist:
+        watcher.add_token(token, interval_seconds)
+
+    stop_event = threading.Event()
+
+    def handle_stop(signum, frame):
+        print("\n👋 正在停止监控 (状态已保存)...")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, handle_stop)
+    signal.signal(signal.SIGTERM, handle_stop)
+
+    mode = f"离线回放 {args.fixtures}" if args.fixtures else ("录制到 " + args.record if args.record else "在线")
+    print(f"👀 监控 {len(watchlist)} 个代币 ({mode}): {', '.join(token for token, _ in watchlist)}")
+    run(watcher, cycles=args.cycles, poll_seconds=WATCH_CONFIG['poll_seconds'], stop_event=stop_event)
+
+
+if __name__ == "__main__":
+    main()
+
+    # Usage examples:
+    # python3 watch.py --tokens BTC,ETH --interval 15         # Refresh every 15 minutes
+    # python3 watch.py --tokens BTC --record fixtures/         # Live, also record responses as fixtures
+    # python3 watch.py --tokens BTC --fixtures fixtures/ --cycles 3 --state /tmp/watch_state.json   # Offline replay